@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:12:37 2026
+
+@author: biol0117
+"""
+
+# Checks that reading a frame (one recorded day) of a compacted LocalData file only decompresses the file from the
+# restore point before the frame, rather than the whole file, and compares the time taken to read the first and last
+# frames with the time taken to parse the whole file.
+#
+# Usage: python benchmarks/bench_frames.py [--patches N] [--days N] [--interval N]
+
+import argparse
+import tempfile
+import shutil
+import time
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import outputdata
+import compaction
+from bench_parser import writeFiles
+
+def timeCall(func):
+    """ Returns the result of a call and the time it took (in seconds). """
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and time frame reads of compacted output files.")
+    parser.add_argument("--patches", type=int, default=2000, help="number of recorded patches (default: 2000)")
+    parser.add_argument("--days", type=int, default=2000, help="number of simulated days (default: 2000)")
+    parser.add_argument("--interval", type=int, default=10, help="local data recording interval in days (default: 10)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as dirPath:
+        localFile = writeFiles(dirPath, args.patches, args.days, args.interval)["LocalData"]
+        plainIndex = outputdata.FrameIndex(localFile, args.patches)
+        expected = [plainIndex.readFrame(t) for t in (0, plainIndex.numFrames() - 1)]
+        print("{:<8}{:>10}{:>16}{:>16}{:>16}{:>18}".format("setting", "MB", "whole file (s)", "first frame (s)",
+                                                          "last frame (s)", "decompressed (MB)"))
+        for setting in compaction.codecs:
+            outputDir = os.path.join(dirPath, setting)
+            os.makedirs(outputDir)
+            shutil.copy(localFile, outputDir)
+            compaction.compactDir(outputDir, setting)
+            filePath = os.path.join(outputDir, os.path.basename(localFile))
+            index = outputdata.FrameIndex(filePath, args.patches)
+            last = index.numFrames() - 1
+            whole, wholeTime = timeCall(lambda: outputdata.parseFile(filePath))
+            first, firstTime = timeCall(lambda: index.readFrame(0))
+            final, lastTime = timeCall(lambda: index.readFrame(last))
+            if not (np.array_equal(first, expected[0]) and np.array_equal(final, expected[1]) and len(whole) == plainIndex.numFrames() * args.patches):
+                sys.stderr.write("Frames read from the {} file differ from the uncompressed file\n".format(setting))
+                return 1
+            frameBytes = int(index.offsets[last + 1] - index.offsets[last])
+            with compaction.openAt(compaction.sourcePath(filePath), int(index.offsets[last]), index.restorePoints) as f:
+                f.read(frameBytes)
+                numDecompressed = f.numDecompressed
+            print("{:<8}{:>10.1f}{:>16.3f}{:>16.3f}{:>16.3f}{:>18.1f}".format(setting, os.path.getsize(compaction.sourcePath(filePath)) / 1024**2,
+                                                                            wholeTime, firstTime, lastTime, numDecompressed / 1024**2))
+            # at most the member data before the frame, the frame, and the rest of the member it ends in
+            if numDecompressed > 2 * compaction.memberBytes + frameBytes:
+                sys.stderr.write("Reading the last frame of the {} file decompressed {} bytes\n".format(setting, numDecompressed))
+                return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
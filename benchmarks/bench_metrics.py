@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:41:09 2026
+
+@author: biol0117
+"""
+
+# Compares the speed of the metrics kernels with the per-patch and per-day Python loops previously used by
+# plotcanvas.py, on random genotype counts of a given number of patches and recorded days.
+# The local data is processed a block of days at a time, so the default size (10^5 patches x 10^3 days) fits in memory.
+# The loops are only timed on the first --loop-days days and scaled up to the whole run.
+#
+# Usage: python benchmarks/bench_metrics.py [--patches N] [--days N] [--loop-days N]
+
+import argparse
+import time
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import metrics
+
+def randomGenotypes(rng, shape):
+    """ Returns random genotype counts of shape (..., 6), with some empty and some wild-only patches. """
+    genotypes = rng.integers(0, 50, size=shape + (6,))
+    genotypes[rng.random(shape) < 0.2] = 0
+    genotypes[rng.random(shape) < 0.2, 1:] = 0
+    return genotypes
+
+def loopDriveFrequency(localDataDay):
+    """ Drive allele frequency of each patch, computed patch by patch as LocalPlotCanvas.plot did. """
+    WW, WD, DD, WR, RR, DR = [localDataDay[:, i] for i in range(0, 6)]
+    driveFreq = np.zeros(len(localDataDay))
+    for pat in range(0, len(localDataDay)):
+        tot = WW[pat] + WD[pat] + DD[pat] + WR[pat] + RR[pat] + DR[pat]
+        if tot == 0:
+            driveFreq[pat] = -2
+        elif tot == WW[pat]:
+            driveFreq[pat] = -0.5
+        else:
+            driveFreq[pat] = (WD[pat] + (2*DD[pat]) + DR[pat]) / (2*tot)
+    return driveFreq
+
+def loopAlleleFrequency(totals, line):
+    """ Frequency of one allele on each day, computed day by day as TotalsAllelePlotCanvas.plot did. """
+    WW, WD, DD, WR, RR, DR = [totals[:, i] for i in range(0, 6)]
+    y = []
+    for i in range(0, len(WW)):
+        bottom = WW[i] + WD[i] + DD[i] + WR[i] + RR[i] + DR[i]
+        if line == 0:
+            top = WW[i] + WD[i] + WR[i]
+        elif line == 1:
+            top = WD[i] + DD[i] + DR[i]
+        else:
+            top = WR[i] + RR[i] + DR[i]
+        y.append(0 if bottom == 0 else top / bottom)
+    return np.array(y)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the metrics kernels against the previous Python loops.")
+    parser.add_argument("--patches", type=int, default=10**5, help="number of recorded patches (default: 100000)")
+    parser.add_argument("--days", type=int, default=10**3, help="number of recorded days (default: 1000)")
+    parser.add_argument("--loop-days", type=int, default=3, help="number of days the loops are timed on (default: 3)")
+    parser.add_argument("--block", type=int, default=50, help="days per block of local data (default: 50)")
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(1)
+    loopDays = max(1, min(args.loop_days, args.days))
+
+    # local data: drive frequency of every patch on every recorded day
+    kernelTime = 0
+    loopTime = 0
+    for first in range(0, args.days, args.block):
+        local = randomGenotypes(rng, (min(args.block, args.days - first), args.patches))
+        start = time.perf_counter()
+        driveFreq = metrics.driveFrequency(local)
+        metrics.binIndices(driveFreq)
+        kernelTime += time.perf_counter() - start
+        if first == 0:
+            for day in range(0, min(loopDays, len(local))):
+                start = time.perf_counter()
+                expected = loopDriveFrequency(local[day])
+                loopTime += time.perf_counter() - start
+                if not np.allclose(driveFreq[day], expected):
+                    sys.stderr.write("Drive frequencies differ from the per-patch loop\n")
+                    return 1
+    loopTime *= args.days / loopDays
+
+    # totals: allele frequencies on every day (one row per day, with as many days as local data values)
+    totals = randomGenotypes(rng, (args.days,)) * args.patches
+    start = time.perf_counter()
+    freqs = metrics.alleleFrequencies(totals)
+    totalsKernelTime = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = np.column_stack([loopAlleleFrequency(totals, line) for line in range(0, 3)])
+    totalsLoopTime = time.perf_counter() - start
+    if not np.allclose(freqs, expected):
+        sys.stderr.write("Allele frequencies differ from the per-day loop\n")
+        return 1
+
+    print("{:<34}{:>14}{:>14}{:>10}".format("measure", "loop (s)", "kernel (s)", "speed-up"))
+    print("{:<34}{:>14.2f}{:>14.3f}{:>9.0f}x".format("local drive freq ({} x {})".format(args.patches, args.days),
+                                                    loopTime, kernelTime, loopTime / kernelTime))
+    print("{:<34}{:>14.4f}{:>14.4f}{:>9.0f}x".format("totals allele freqs ({} days)".format(args.days),
+                                                    totalsLoopTime, totalsKernelTime, totalsLoopTime / totalsKernelTime))
+    print("(local loop time scaled up from {} days)".format(loopDays))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
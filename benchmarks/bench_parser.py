@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:48:30 2026
+
+@author: biol0117
+"""
+
+# Compares the speed of outputparser.parseFile with the np.loadtxt calls previously used by plotcanvas.py,
+# on synthetic Totals, LocalData and CoordinateList files of a given size.
+#
+# Usage: python benchmarks/bench_parser.py [--patches N] [--days N] [--repeat N]
+
+import argparse
+import tempfile
+import time
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import outputparser
+
+def writeFiles(dirPath, numPat, numDays, recInterval):
+    """ Writes synthetic output files in the model's layout and returns their filepaths. """
+    rng = np.random.default_rng(1)
+    totalsFile = os.path.join(dirPath, "Totals1run1.txt")
+    localFile = os.path.join(dirPath, "LocalData1run1.txt")
+    coordsFile = os.path.join(dirPath, "CoordinateList1run1.txt")
+    days = np.arange(0, numDays + 1)
+    totals = np.column_stack([days, rng.integers(0, 10**6, size=(len(days), 6))])
+    np.savetxt(totalsFile, totals, fmt="%d", delimiter="\t", header="Male totals\nDay\tWW\tWD\tDD\tWR\tRR\tDR", comments="")
+    recDays = np.arange(0, numDays + 1, recInterval)
+    local = np.column_stack([np.repeat(recDays, numPat), np.tile(np.arange(numPat), len(recDays)),
+                             rng.integers(0, 1000, size=(len(recDays) * numPat, 6))])
+    np.savetxt(localFile, local, fmt="%d", delimiter="\t", header="Local data\nDay\tPatch\tWW\tWD\tDD\tWR\tRR\tDR", comments="")
+    coords = np.column_stack([np.arange(numPat), rng.random(numPat) * 1000, rng.random(numPat) * 1000])
+    np.savetxt(coordsFile, coords, fmt=["%d", "%.6f", "%.6f"], delimiter="\t", header="Coordinates\nPatch\tx\ty", comments="")
+    return {"Totals": totalsFile, "LocalData": localFile, "CoordinateList": coordsFile}
+
+def bestTime(func, repeat):
+    """ Returns the fastest of repeated calls of a function (in seconds). """
+    times = []
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the output file parser against np.loadtxt.")
+    parser.add_argument("--patches", type=int, default=2000, help="number of recorded patches (default: 2000)")
+    parser.add_argument("--days", type=int, default=1000, help="number of simulated days (default: 1000)")
+    parser.add_argument("--interval", type=int, default=10, help="local data recording interval in days (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed repeats, the fastest is reported (default: 3)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as dirPath:
+        files = writeFiles(dirPath, args.patches, args.days, args.interval)
+        print("{:<16}{:>10}{:>14}{:>14}{:>10}".format("file", "MB", "loadtxt (s)", "parser (s)", "speed-up"))
+        for name, filePath in files.items():
+            expected = np.loadtxt(filePath, skiprows=2, ndmin=2)
+            if not np.array_equal(outputparser.parseFile(filePath), expected):
+                sys.stderr.write("Parsed values of {} differ from np.loadtxt\n".format(name))
+                return 1
+            loadtxtTime = bestTime(lambda: np.loadtxt(filePath, skiprows=2, ndmin=2), args.repeat)
+            parserTime = bestTime(lambda: outputparser.parseFile(filePath), args.repeat)
+            print("{:<16}{:>10.1f}{:>14.3f}{:>14.3f}{:>9.1f}x".format(name, os.path.getsize(filePath) / 1024**2,
+                                                                   loadtxtTime, parserTime, loadtxtTime / parserTime))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
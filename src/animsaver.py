@@ -6,24 +6,114 @@ Created on Thu Jan 30 15:19:39 2025
 """
 
 from PyQt5.QtCore import QObject, pyqtSignal
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import threading
+import os
+import numpy as np
+import plotcanvas
+import outputdata
+import metrics
+from gifwriter import GifWriter
 
 class AnimSaver(QObject):
-    """ Saves an animation as a file."""
+    """
+    Saves the local drive frequency animation as a GIF file in a separate thread. The frames are drawn one at a time
+    on a single off-screen canvas and appended to the file as they are drawn, so memory use doesn't grow with the
+    number of frames.
+    """
+    progress = pyqtSignal(int) # number of frames saved
     finished = pyqtSignal()
-    def __init__(self, fname, anim):
+    error = pyqtSignal(str)
+    def __init__(self, fname, coordsFile, localFile, recStart, numFrames, interval, figSize, dpi, classes=None):
         """
         Parameters
         ----------
         fname : str
             Filepath for the output animation file.
-        anim : matplotlib.animation.FuncAnimation
-            Animation object to save to file.
-        
+        coordsFile : Path
+            CoordinateList file of the run.
+        localFile : Path
+            LocalData file of the run.
+        recStart : int
+            Start time for recording local data.
+        numFrames : int
+            Maximum number of frames (runs stopped early have fewer recorded days).
+        interval : int
+            Frame interval (ms).
+        figSize : (float, float)
+            Figure width and height (inches), e.g. those of the plot on screen.
+        dpi : float
+            Figure dpi (resolution in dots-per-inch).
+        classes : numpy.ndarray, optional
+            Colour classes of the patches on each recorded day if already computed (see outputdata.classCube).
+            The default is None (read from the local data file).
         """
         super().__init__()
         self.filename = fname
-        self.anim = anim
-    
+        self.coordsFile = coordsFile
+        self.localFile = localFile
+        self.recStart = recStart
+        self.numFrames = numFrames
+        self.interval = interval
+        self.figSize = figSize
+        self.dpi = dpi
+        self.classes = classes
+        self.cancelEvent = threading.Event()
+
+    def cancel(self):
+        """ Stops saving, removing the partly written file. """
+        self.cancelEvent.set()
+
+    def isCancelled(self):
+        return self.cancelEvent.is_set()
+
     def run(self):
-        self.anim.save(filename=self.filename, writer="pillow")
+        try:
+            self.save()
+        except (OSError, ValueError, MemoryError) as e:
+            self.error.emit(str(e))
+        if self.isCancelled() and os.path.exists(self.filename):
+            os.remove(self.filename)
         self.finished.emit()
+
+    def save(self):
+        """ Draws and writes the frames. """
+        ind, x, y = outputdata.loadArray(self.coordsFile)[:, 0:3].T
+        numRecPats = len(x)
+        frames = outputdata.frameIndex(self.localFile, numRecPats)
+        numFrames = min(self.numFrames, frames.numFrames())
+        if numFrames == 0:
+            raise ValueError("No local data recorded (run stopped early).")
+        recIntervalLocal = int(frames.frameStart(1)) - int(frames.frameStart(0)) if frames.numFrames() > 1 else 0
+
+        # same figure as the animation on the local plot, drawn once
+        fig = Figure(figsize=self.figSize, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        axes = fig.add_subplot(111)
+        cmap, cnorm, colorbar = plotcanvas.addDriveFreqColorbar(fig, axes)
+        annotation = plotcanvas.addAnnotation(fig)
+        axes.set_position(plotcanvas.animAxesPosition)
+        colorbar.ax.set_position(plotcanvas.animColorbarPosition)
+        scat = axes.scatter(x, y, c=np.full(numRecPats, float(metrics.noPopulation)), cmap=cmap, norm=cnorm, marker='.')
+        axes.set_xlabel("x")
+        axes.set_ylabel("y")
+        plotcanvas.setScatterLimits(axes, x, y)
+        axes.minorticks_on()
+
+        frameIter = outputdata.iterFrames(self.localFile, numRecPats) if self.classes is None else None
+        writer = GifWriter(self.filename, self.interval)
+        try:
+            for t in range(0, numFrames):
+                if self.isCancelled():
+                    return
+                if frameIter == None:
+                    scat.set_array(np.take(metrics.driveFreqBounds, self.classes[t]))
+                else:
+                    scat.set_array(metrics.driveFrequency(next(frameIter)[:, 2:8]))
+                annotation.set_text("t = {}".format((t * recIntervalLocal) + self.recStart))
+                canvas.draw()
+                writer.addFrame(canvas.buffer_rgba())
+                self.progress.emit(t + 1)
+        finally:
+            writer.close()
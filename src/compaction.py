@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:14:52 2026
+
+@author: biol0117
+"""
+
+# Compression of the output files of finished simulations, and transparent opening of output files
+# whether they have been compressed or not. Only uses the standard library (gzip and lzma).
+
+import shutil
+import gzip
+import lzma
+import zlib
+import os
+
+# compression settings: "fast" (gzip, quick to compress and read) or "small" (xz, smallest files)
+codecs = {"fast": (".gz", gzip, {"compresslevel": 6}), "small": (".xz", lzma, {"preset": 6})}
+compressedExts = [ext for ext, codec, options in codecs.values()]
+# decompressor of a single gzip member or xz stream, by extension
+decompressors = {".gz": lambda: zlib.decompressobj(wbits=31), ".xz": lambda: lzma.LZMADecompressor(lzma.FORMAT_XZ)}
+# uncompressed size of each independently compressed part (member) of a compressed file, i.e. the most that has
+# to be decompressed before reaching any position of the file once its restore points are known (see MemberReader)
+memberBytes = 4 * 1024 * 1024
+
+def isCompressed(filePath):
+    """ Returns whether a filepath is of a compressed output file. """
+    return os.path.splitext(str(filePath))[1] in compressedExts
+
+def sourcePath(filePath):
+    """
+    Returns the filepath of an output file as it is on disk: the file itself if it exists, otherwise its compressed
+    version if there is one (or the uncompressed file if the compressed one's path is given but it doesn't exist).
+    """
+    filePath = str(filePath)
+    if os.path.exists(filePath):
+        return filePath
+    basePath = os.path.splitext(filePath)[0] if isCompressed(filePath) else filePath
+    for ext in [""] + compressedExts:
+        if os.path.exists(basePath + ext):
+            return basePath + ext
+    return filePath
+
+def openOutput(filePath, mode="rb"):
+    """
+    Opens an output file for reading, decompressing it while it is read if it has been compressed.
+
+    Parameters
+    ----------
+    filePath : string
+        Filepath of the output file, with or without its compression extension.
+    mode : string, optional
+        "rb" (bytes) or "r" (text). The default is "rb".
+
+    Returns
+    -------
+    File object.
+    """
+    path = sourcePath(filePath)
+    for ext, codec, options in codecs.values():
+        if path.endswith(ext):
+            return codec.open(path, mode if mode == "rb" else "rt")
+    return open(path, mode)
+
+def compressFile(filePath, setting="fast"):
+    """
+    Replaces an output file with its compressed version (streamed, so any file size can be compressed). The file is
+    compressed in parts of memberBytes, so that it can later be read from any of its parts (see MemberReader).
+
+    Returns
+    -------
+    string
+        Filepath of the compressed file.
+    """
+    ext, codec, options = codecs[setting]
+    destPath = str(filePath) + ext
+    tmpPath = destPath + ".tmp{}".format(os.getpid())
+    with open(filePath, "rb") as src, open(tmpPath, "wb") as dest:
+        # written as concatenated gzip members (or xz streams), still a single valid file for gzip or xz, 
+        # that can each be decompressed on their own
+        for block in iter(lambda: src.read(memberBytes), b""):
+            dest.write(codec.compress(block, **options))
+    shutil.copystat(filePath, tmpPath)
+    os.replace(tmpPath, destPath)
+    os.remove(filePath)
+    return destPath
+
+def compactDir(outputDir, setting="fast"):
+    """
+    Compresses the text output files of a finished simulation. The binary copies made for plotting (see outputdata)
+    are removed too, as they are as large as the text files; plots then read the compressed files directly.
+
+    Parameters
+    ----------
+    outputDir : Path
+        output_files directory of the simulation.
+    setting : string, optional
+        Compression setting, "fast" or "small" (see codecs). The default is "fast".
+
+    Returns
+    -------
+    (int, int)
+        Total size of the output files (in bytes) before and after compaction.
+    """
+    before = 0
+    after = 0
+    for name in sorted(os.listdir(outputDir)):
+        filePath = os.path.join(outputDir, name)
+        if not os.path.isfile(filePath):
+            continue
+        size = os.path.getsize(filePath)
+        before += size
+        if name.endswith(".txt"):
+            filePath = compressFile(filePath, setting)
+            size = os.path.getsize(filePath)
+        after += size
+    shutil.rmtree(os.path.join(outputDir, ".npy_cache"), ignore_errors=True)
+    return before, after
+
+
+class MemberReader():
+    """
+    Reads a compressed output file from one of its restore points, i.e. the start of one of its gzip members or xz
+    streams (see compressFile), so that a position in the file can be reached without decompressing all that comes before
+    it. Records the restore points it passes, so that they can be found while the file is first read through.
+    """
+    def __init__(self, filePath, start=(0, 0), readBytes=65536):
+        """
+        Parameters
+        ----------
+        filePath : string
+            Filepath of the compressed file.
+        start : (int, int), optional
+            Restore point to start reading from: (compressed offset, uncompressed offset) of the start of a member.
+            The default is (0, 0) (start of the file).
+        readBytes : int, optional
+            Size of the compressed blocks read. The default is 65536.
+        """
+        self.newDecompressor = decompressors[os.path.splitext(filePath)[1]]
+        self.decompressor = self.newDecompressor()
+        self.readBytes = readBytes
+        self.file = open(filePath, "rb")
+        self.file.seek(start[0])
+        self.rawPos = start[0] # compressed offset of the next bytes to decompress
+        self.pending = b"" # compressed bytes of the next member, read with the end of the previous one
+        self.outPos = start[1] # uncompressed offset after the data decompressed so far
+        self.buffer = b"" # decompressed data not read yet
+        self.restorePoints = [tuple(start)]
+        self.numDecompressed = 0 # bytes decompressed so far
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def fill(self, size):
+        """ Decompresses until size bytes are buffered or the end of the file is reached. """
+        while len(self.buffer) < size:
+            raw = self.pending if len(self.pending) != 0 else self.file.read(self.readBytes)
+            self.pending = b""
+            if len(raw) == 0:
+                return
+            data = self.decompressor.decompress(raw)
+            self.buffer += data
+            self.outPos += len(data)
+            self.numDecompressed += len(data)
+            if self.decompressor.eof: # end of a member, the rest of raw belongs to the next one
+                self.pending = self.decompressor.unused_data
+                self.decompressor = self.newDecompressor()
+                self.rawPos += len(raw) - len(self.pending)
+                if len(self.pending) != 0 or len(self.file.peek(1)) != 0:
+                    self.restorePoints.append((self.rawPos, self.outPos))
+            else:
+                self.rawPos += len(raw)
+
+    def read(self, size=-1):
+        """ Returns the next size bytes of decompressed data (fewer at the end of the file, all of it if size is -1). """
+        if size < 0:
+            size = float("inf")
+        self.fill(size)
+        data = self.buffer[:size] if size != float("inf") else self.buffer
+        self.buffer = self.buffer[len(data):]
+        return data
+
+    def skip(self, size):
+        """ Skips the next size bytes of decompressed data, holding at most one block of it in memory. """
+        while size > 0:
+            data = self.read(min(size, self.readBytes * 16))
+            if len(data) == 0:
+                return
+            size -= len(data)
+
+    def readline(self):
+        """ Returns the next line of decompressed data (including its newline). """
+        while b"\n" not in self.buffer:
+            size = len(self.buffer)
+            self.fill(size + 1)
+            if len(self.buffer) == size:
+                break
+        end = self.buffer.find(b"\n") + 1
+        return self.read(end if end > 0 else len(self.buffer))
+
+
+def openAt(filePath, offset, restorePoints=((0, 0),)):
+    """
+    Opens a compressed output file at an uncompressed offset, decompressing from the last restore point before it.
+
+    Parameters
+    ----------
+    filePath : string
+        Filepath of the compressed file.
+    offset : int
+        Uncompressed offset to start reading from.
+    restorePoints : array_like, optional
+        (compressed offset, uncompressed offset) of the members of the file, in order (see MemberReader). 
+        The default is the start of the file only.
+
+    Returns
+    -------
+    MemberReader
+    """
+    start = restorePoints[0]
+    for point in restorePoints:
+        if point[1] > offset:
+            break
+        start = point
+    reader = MemberReader(filePath, (int(start[0]), int(start[1])))
+    reader.skip(offset - int(start[1]))
+    return reader
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:06:14 2026
+
+@author: biol0117
+"""
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+import threading
+import outputdata
+
+
+class CubeSignals(QObject):
+    """ Signals of a CubeBuilder (a QRunnable can't emit signals itself). """
+    progress = pyqtSignal(int) # percentage of the recorded days done
+    finished = pyqtSignal(object) # (days, classes) (see outputdata.classCube)
+    error = pyqtSignal(str)
+
+
+class CubeBuilder(QRunnable):
+    """
+    Computes the drive allele frequency classes of every patch on every recorded day of a run (see outputdata.classCube)
+    on a thread pool, so that the local plot's animation and slider only have to render them.
+    """
+    def __init__(self, coordsFile, localFile):
+        """
+        Parameters
+        ----------
+        coordsFile : Path
+            CoordinateList file of the run.
+        localFile : Path
+            LocalData file of the run.
+        """
+        super().__init__()
+        self.setAutoDelete(False) # the widget keeps the builder to cancel it
+        self.signals = CubeSignals()
+        self.coordsFile = coordsFile
+        self.localFile = localFile
+        self.percent = -1
+        self.cancelEvent = threading.Event()
+
+    def cancel(self):
+        """ Stops building the classes (e.g. when another run is selected). Nothing is emitted after cancelling. """
+        self.cancelEvent.set()
+
+    def isCancelled(self):
+        return self.cancelEvent.is_set()
+
+    def reportProgress(self, done, numFrames):
+        percent = int(100 * done / numFrames)
+        if percent != self.percent: # at most 100 updates, however many recorded days
+            self.percent = percent
+            self.signals.progress.emit(percent)
+
+    def run(self):
+        try:
+            numRecPats = len(outputdata.loadArray(self.coordsFile))
+            result = outputdata.classCube(self.localFile, numRecPats, self.reportProgress, self.isCancelled)
+        except (OSError, ValueError, MemoryError) as e:
+            if not self.isCancelled():
+                self.signals.error.emit(str(e))
+            return
+        if result != None and not self.isCancelled():
+            self.signals.finished.emit(result)
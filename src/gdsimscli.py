@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:40:05 2026
+
+@author: biol0117
+"""
+
+# Command-line runner for headless machines. Only imports numpy, the standard library and the Qt-free
+# GDSiMS modules, so it does not need PyQt5, matplotlib or a display.
+
+import argparse
+import threading
+import csv
+import sys
+import re
+from pathlib import Path
+import params
+import modelrunner
+import telemetry
+import stopconditions
+import outcomes
+import throughput
+import compaction
+import outputdata
+from resultcache import ResultCache
+
+basedir = Path(__file__).resolve().parents[0]
+
+def parseCpuList(text):
+    """ Parses a CPU core list such as "0-3,6" (argparse type). """
+    cpus = []
+    try:
+        for part in text.split(","):
+            if "-" in part:
+                first, last = part.split("-")
+                cpus.extend(range(int(first), int(last) + 1))
+            else:
+                cpus.append(int(part))
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid CPU list: {}".format(text))
+    return cpus
+
+def parseArgs(argv=None):
+    """ Parses the command-line arguments. """
+    parser = argparse.ArgumentParser(prog="gdsimscli", description="Run a GDSiMS simulation without the GUI.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--preset", type=int, choices=range(1, len(params.paramSets()) + 1),
+                        help="pre-defined parameter set number (as in the GUI drop-down)")
+    source.add_argument("--params", type=Path, help="model program parameter file (params.txt format)")
+    source.add_argument("--resume", type=Path, metavar="SIMDIR", help="simulation directory of an interrupted simulation to finish (only its missing runs are run)")
+    parser.add_argument("-o", "--output", default="", help="parent directory for the simulation directory (default: GUI base directory)")
+    parser.add_argument("-n", "--name", default="", help="simulation directory name (default: date-time stamp)")
+    parser.add_argument("--runs", type=int, help="number of replicates (overrides the parameter set)")
+    parser.add_argument("--workers", type=int, default=1, help="number of replicates to run at the same time (default: 1)")
+    parser.add_argument("--nice", type=int, choices=range(0, 20), metavar="0-19", help="niceness increment of the model processes (higher is lower priority)")
+    parser.add_argument("--cpus", type=parseCpuList, help="CPU cores to run the model processes on, e.g. 0-3,6 (Linux only); "
+                        "with at least as many cores as workers, each replicate is pinned to its own core")
+    parser.add_argument("--timeout", type=float, help="wall-clock time limit of each model process, in seconds (killed after it)")
+    parser.add_argument("--stop-elimination", action="store_true", help="end a run early once the population has been eliminated")
+    parser.add_argument("--stop-fixation", action="store_true", help="end a run early once the drive allele has reached fixation")
+    parser.add_argument("--stop-freq", type=float, help="end a run early once the drive allele frequency stays at or above this value")
+    parser.add_argument("--stop-days", type=int, default=1, help="number of days --stop-freq must hold for (default: 1)")
+    parser.add_argument("--until-precise", type=float, metavar="WIDTH", help="run replicates in batches until the 95%% confidence interval "
+                        "of the outcome is at most this wide (the number of runs is then the maximum)")
+    parser.add_argument("--outcome", choices=list(outcomes.outcomeNames.keys()), default="elimination", 
+                        help="outcome for --until-precise: probability of elimination or mean final drive allele frequency (default: elimination)")
+    parser.add_argument("--batch", type=int, default=10, help="number of replicates per batch for --until-precise (default: 10)")
+    parser.add_argument("--disp-type", choices=["Radial", "Distance kernel"], help="dispersal type")
+    parser.add_argument("--boundary-type", choices=["Toroid", "Edge"], help="boundary type")
+    parser.add_argument("--rainfall", type=Path, help="rainfall file")
+    parser.add_argument("--coords", type=Path, help="patch coordinates file")
+    parser.add_argument("--rel-times", type=Path, help="release times file")
+    parser.add_argument("--local-summary", action="store_true", help="write a day-by-day summary of each run's local data to local_summary.csv "
+                        "(read one recorded day at a time, so any output size fits in memory)")
+    parser.add_argument("--compress", choices=list(compaction.codecs.keys()), help="compress the output files once the simulation has finished: "
+                        "fast (gzip) or small (xz); plots read compressed files directly")
+    parser.add_argument("--no-cache", action="store_true", help="always run the model, even if an identical simulation is in the result cache")
+    parser.add_argument("--cache-dir", type=Path, default=basedir / "result_cache", help="result cache directory")
+    parser.add_argument("--exe", type=Path, default=modelrunner.defaultModelPath(basedir), help="model program executable")
+    return parser.parse_args(argv)
+
+def createParamSet(args):
+    """
+    Creates the parameter set for the simulation from the command-line arguments.
+
+    Returns
+    -------
+    InputParams
+    """
+    if args.preset is not None:
+        paramSet = params.paramSets()[args.preset - 1]
+    else:
+        paramSet = params.readProgramParamsFile(args.params)
+    if args.runs is not None:
+        paramSet.numRuns = args.runs
+    if args.disp_type is not None:
+        paramSet.dispType = args.disp_type
+    if args.boundary_type is not None:
+        paramSet.boundaryType = args.boundary_type
+    if args.rainfall is not None:
+        paramSet.rainfallFile = str(args.rainfall.resolve())
+    if args.coords is not None:
+        paramSet.coordsFile = str(args.coords.resolve())
+    if args.rel_times is not None:
+        paramSet.relTimesFile = str(args.rel_times.resolve())
+    return paramSet
+
+def reportProgress(progress, maxProgress, totals=None, speed=None):
+    """ 
+    Writes the simulation progress (with the speed and time left, and the resource usage if sampled) 
+    to the terminal (on a single updating line if interactive). 
+    """
+    msg = "Progress: {}/{} days ({:.0f}%)".format(progress, maxProgress, 100 * progress / maxProgress)
+    if speed:
+        msg += " | " + speed
+    if totals != None:
+        msg += " | " + telemetry.formatStats(totals)
+    if sys.stdout.isatty():
+        sys.stdout.write("\r" + msg)
+    else:
+        sys.stdout.write(msg + "\n")
+    sys.stdout.flush()
+
+def runSim(runner, result):
+    """ Runs the simulation, storing its error messages in result["errs"] (thread target). """
+    try:
+        result["errs"] = runner.run()
+    except OSError as err: # e.g. model program not found
+        result["errs"] = str(err)
+
+def writeMetrics(sampler, outputPath):
+    """ Writes the resource usage of the model subprocesses to process_metrics.csv in the simulation directory. """
+    if sampler != None and sampler.stats:
+        sampler.writeMetrics(outputPath / "process_metrics.csv")
+
+def writeLocalSummary(outputPath, setLabel):
+    """ Writes a day-by-day summary of each run's LocalData file (see outputdata.summariseLocal) to local_summary.csv in the simulation directory. """
+    outputDir = outputPath / "output_files"
+    localFiles = {int(re.search(r"run(\d+)", f.name)[1]) : f for f in outputDir.glob("LocalData{}run*.txt".format(setLabel))}
+    with open(outputPath / "local_summary.csv", "w", newline="") as csvfile:
+        fw = csv.writer(csvfile, delimiter=",", quoting=csv.QUOTE_MINIMAL)
+        fw.writerow(["run", "day", "patches_with_population", "total_individuals", "drive_allele_freq"])
+        for run in sorted(localFiles):
+            coordsFile = outputDir / "CoordinateList{}run{}.txt".format(setLabel, run)
+            if not coordsFile.exists():
+                continue
+            numRecPats = outputdata.countRows(coordsFile)[0]
+            for day, patches, total, freq in outputdata.summariseLocal(localFiles[run], numRecPats):
+                fw.writerow([run, int(day), int(patches), int(total), round(freq, 6)])
+
+def loadCheckpoint(outputPath):
+    """
+    Reads the checkpoint of an interrupted simulation.
+
+    Returns
+    -------
+    Checkpoint
+        None if it could not be read (error message already written).
+    """
+    try:
+        checkpoint = modelrunner.Checkpoint.load(outputPath)
+    except (OSError, ValueError, KeyError) as err:
+        sys.stderr.write("The checkpoint of {} could not be read: {}\n".format(outputPath, err))
+        return None
+    if checkpoint == None:
+        sys.stderr.write("No checkpoint file found in {}\n".format(outputPath))
+    return checkpoint
+
+def main(argv=None):
+    args = parseArgs(argv)
+    if not args.exe.is_file():
+        sys.stderr.write("Model program {} not found. Only the Windows and macOS builds are bundled: build the model program for "
+                         "this platform (as model/gdsimsapp) or give its path with --exe.\n".format(args.exe))
+        return 1
+    runs = None
+    if args.resume is not None:
+        checkpoint = loadCheckpoint(args.resume)
+        if checkpoint == None:
+            return 1
+        paramSet = checkpoint.paramSet
+        outputPath = args.resume
+        simName = outputPath.name
+        runs = checkpoint.missingRuns()
+        if len(runs) == 0:
+            print("All runs of simulation {} are already complete.".format(simName))
+            return 0
+    else:
+        paramSet = createParamSet(args)
+        outputPath, simName, errMsgs = modelrunner.makeOutputDir(args.output, args.name, basedir)
+        if len(errMsgs) != 0:
+            sys.stderr.write("\n".join(errMsgs) + "\n")
+            return 1
+        params.createProgramParamsFile(outputPath, paramSet)
+        params.createUserParamsFile(outputPath, paramSet, params.paramsInfo())
+    resultCache = None if args.no_cache else ResultCache(args.cache_dir)
+    if resultCache != None:
+        cacheKey = resultCache.key(paramSet, args.exe)
+        if runs == None and resultCache.restore(cacheKey, outputPath):
+            print("An identical simulation was found in the result cache. Its output files have been copied to {}".format(outputPath))
+            if args.local_summary:
+                writeLocalSummary(outputPath, paramSet.setLabel)
+            return 0
+    if runs == None:
+        print("Running simulation {} in {}".format(simName, outputPath))
+    else:
+        print("Resuming simulation {} in {} ({} of {} runs left)".format(simName, outputPath, len(runs), paramSet.numRuns))
+
+    stopConditions = stopconditions.StopConditions(args.stop_elimination, args.stop_fixation, args.stop_freq, args.stop_days)
+    seqStopping = None
+    if args.until_precise is not None:
+        seqStopping = outcomes.SequentialStopping(args.outcome, args.until_precise, args.batch)
+    runner = modelrunner.createRunner(args.exe, outputPath, paramSet, args.workers, runs, args.nice, args.cpus, args.timeout, 
+                                      stopConditions, seqStopping)
+    counter = runner.progressCounter(paramSet.maxT)
+    maxProgress = len(runner.runs) * (paramSet.maxT + 1)
+    sampler = telemetry.ProcessSampler(runner) if telemetry.isSupported() else None
+    meter = throughput.ThroughputMeter(paramSet.maxT, len(runner.runs))
+    result = {}
+    simThread = threading.Thread(target=runSim, args=(runner, result), daemon=True)
+    simThread.start()
+
+    interval = 1 if sys.stdout.isatty() else 10 # seconds between progress reports
+    tick = 0
+    try:
+        while simThread.is_alive():
+            simThread.join(1) # resource usage is sampled every second
+            totals = sampler.sample() if sampler != None else None
+            progress = counter.count()
+            speed = throughput.formatThroughput(meter.update(counter.runDays, counter.skippedDays))
+            tick += 1
+            if tick % interval == 0 or not simThread.is_alive():
+                reportProgress(progress, maxProgress, totals, speed)
+        if sys.stdout.isatty():
+            sys.stdout.write("\n")
+    except KeyboardInterrupt:
+        runner.abort()
+        simThread.join()
+        sys.stderr.write("\nSimulation aborted.\n")
+        writeMetrics(sampler, outputPath)
+        meter.writeLog(outputPath / "timing_log.json", runner.runs, args.exe, "stopped")
+        return 130
+
+    writeMetrics(sampler, outputPath)
+    counter.count()
+    meter.update(counter.runDays, counter.skippedDays)
+    meter.writeLog(outputPath / "timing_log.json", runner.runs, args.exe, "complete" if counter.isComplete() else "stopped")
+    if result.get("errs"):
+        sys.stderr.write("\nError:\n" + result["errs"] + "\n")
+        return 1
+    if resultCache != None:
+        resultCache.store(cacheKey, outputPath)
+    print("Simulation completed successfully!")
+    for run, earlierRun in runner.duplicateRuns():
+        sys.stderr.write("Warning: run {} has the same output as run {} (the model program may have given them the same random seed)\n".format(run, earlierRun))
+    stops = stopconditions.readStops(runner.stopsFile)
+    for run in sorted(stops):
+        print("Run {} stopped early on day {} ({})".format(run, stops[run][0], stops[run][1]))
+    summary = outcomes.summaryText(outputPath)
+    if summary != None:
+        print(summary)
+    if args.local_summary:
+        writeLocalSummary(outputPath, paramSet.setLabel)
+        print("Local data summary written to {}".format(outputPath / "local_summary.csv"))
+    if args.compress is not None:
+        before, after = compaction.compactDir(outputPath / "output_files", args.compress)
+        print("Output files compressed from {:.1f} MB to {:.1f} MB.".format(before / 1024**2, after / 1024**2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
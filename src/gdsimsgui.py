@@ -13,15 +13,12 @@ from PyQt5.QtCore import Qt, QTimer
 import webbrowser
 import winwidget
 import advwin
+import modelrunner
 
 # global filepaths
-basefile = Path(__file__)
+basefile = Path(__file__).resolve() # absolute, so it doesn't depend on the working directory
 basedir = basefile.parents[0]
-appname = Path(basedir / "model" / "gdsimsapp_win.exe")
-if sys.platform == "win32":
-	appname = Path(basedir / "model" / "gdsimsapp_win.exe")
-elif sys.platform == "darwin":
-	appname = Path(basedir / "model" / "gdsimsapp_mac")
+appname = modelrunner.defaultModelPath(basedir)
 
 class ErrorCatcher:
     """Redirects stderr to capture error messages and display in a message box."""
@@ -129,6 +126,7 @@ class MainWindow(QMainWindow):
                 self.advWindow = None
             if simRunning:
                 self.centralWidget.simRunSpace.abortSim()
+                self.centralWidget.simRunSpace.abortAllJobs()
             event.accept()
         else: # otherwise widget won't close
             event.ignore()  
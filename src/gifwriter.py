@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:31:48 2026
+
+@author: biol0117
+"""
+
+# Writes an animated GIF a frame at a time, so that only one frame is ever held in memory (PIL's Image.save
+# and matplotlib's PillowWriter keep every frame until the end). All the frames use the palette of the first frame,
+# which suits animations whose colours are all on screen from the start (e.g. with a colorbar). Has no Qt dependency.
+
+from PIL import Image, GifImagePlugin
+import numpy as np
+
+class GifWriter():
+    """ Animated GIF file that frames are appended to. """
+    def __init__(self, filePath, duration, loop=1):
+        """
+        Parameters
+        ----------
+        filePath : string
+            Filepath of the GIF file.
+        duration : int
+            Display time of each frame (ms).
+        loop : int, optional
+            Number of times the animation repeats after the first time (0 for forever). The default is 1.
+        """
+        self.filePath = filePath
+        self.duration = duration
+        self.loop = loop
+        self.file = open(filePath, "wb")
+        self.palette = None # first frame, quantised, whose palette later frames are mapped to
+        self.numFrames = 0
+
+    def addFrame(self, rgba):
+        """
+        Appends a frame.
+
+        Parameters
+        ----------
+        rgba : numpy.ndarray
+            Frame pixels, of shape (height, width, 4) (e.g. an Agg canvas' buffer_rgba), or (height, width, 3).
+        """
+        image = Image.fromarray(np.ascontiguousarray(np.asarray(rgba)[:, :, 0:3]))
+        if self.palette == None:
+            frame = image.quantize(colors=256)
+            header, usedColours = GifImagePlugin.getheader(frame, info={"loop": self.loop})
+            for chunk in header:
+                self.file.write(chunk)
+            self.palette = frame
+        else:
+            frame = image.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        for chunk in GifImagePlugin.getdata(frame, duration=self.duration):
+            self.file.write(chunk)
+        self.numFrames += 1
+
+    def close(self):
+        """ Ends the GIF file. """
+        if not self.file.closed:
+            self.file.write(b";") # GIF trailer
+            self.file.close()
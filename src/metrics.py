@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:24:37 2026
+
+@author: biol0117
+"""
+
+# Population genetics measures of the model's genotype counts, as NumPy kernels over whole arrays.
+# Genotype arrays have the six genotype counts (WW, WD, DD, WR, RR, DR) along their last axis and any leading
+# shape, e.g. (6,) for one row, (numDays, 6) for a Totals file or (numFrames, numPat, 6) for a LocalData file.
+# Has no Qt dependency.
+
+import numpy as np
+
+# the measures are dot products of the genotype axis with these weights, which NumPy does in one pass
+genotypeNames = ["WW", "WD", "DD", "WR", "RR", "DR"] # order of the genotype columns of the output files
+transmissionWeights = np.array([1, 1, 0, 1, 0, 0]) # genotypes capable of malaria transmission (WW, WD, WR)
+driveCopies = np.array([0, 1, 2, 0, 0, 1]) # number of drive alleles of each genotype
+# genotypes carrying each allele (columns: wild, drive, r2 resistance)
+carrierWeights = np.array([[1, 0, 0], [1, 1, 0], [0, 1, 0], [1, 0, 1], [0, 0, 1], [0, 1, 1]])
+
+# drive allele frequency classes of patches that have no population, or only wild-type (WW) individuals
+noPopulation = -2
+wildOnly = -0.5
+# bin edges of the drive allele frequency colour map (no population, wild only, then frequency bins of 0.1)
+driveFreqBounds = [-2, -1, 0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+def genotypeTotals(genotypes):
+    """ Returns the total number of individuals (sum of all genotypes), with the leading shape of genotypes. """
+    genotypes = np.asarray(genotypes)
+    return genotypes @ np.ones(6, dtype=genotypes.dtype)
+
+def transmissionTotals(genotypes):
+    """ Returns the number of individuals capable of malaria transmission (WW + WD + WR). """
+    genotypes = np.asarray(genotypes)
+    return genotypes @ transmissionWeights.astype(genotypes.dtype)
+
+def alleleFrequencies(genotypes):
+    """
+    Frequencies of the wild, drive and r2 resistance alleles, as plotted on the Totals allele plot: the fraction
+    of the individuals that carry the allele.
+
+    Parameters
+    ----------
+    genotypes : numpy.ndarray
+        Genotype counts, of shape (..., 6).
+
+    Returns
+    -------
+    numpy.ndarray
+        Wild, drive and resistance frequencies, of shape (..., 3). Frequencies are 0 where there is no population.
+    """
+    genotypes = np.asarray(genotypes)
+    total = genotypeTotals(genotypes)[..., np.newaxis]
+    carriers = genotypes @ carrierWeights.astype(genotypes.dtype)
+    return np.divide(carriers, total, out=np.zeros(carriers.shape), where=(total != 0))
+
+def driveFrequency(genotypes):
+    """
+    Drive allele frequency, (WD + 2DD + DR) / (2 * total), classing the patches without drive alleles to show.
+
+    Parameters
+    ----------
+    genotypes : numpy.ndarray
+        Genotype counts, of shape (..., 6).
+
+    Returns
+    -------
+    numpy.ndarray
+        Drive allele frequencies, with the leading shape of genotypes. noPopulation where there are no individuals
+        and wildOnly where all the individuals are WW.
+    """
+    genotypes = np.asarray(genotypes)
+    total = genotypeTotals(genotypes)
+    drive = genotypes @ driveCopies.astype(genotypes.dtype)
+    freq = np.divide(drive, 2*total, out=np.full(total.shape, float(noPopulation)), where=(total != 0))
+    freq[(total != 0) & (total == genotypes[..., 0])] = wildOnly
+    return freq
+
+def binIndices(values, bounds=driveFreqBounds):
+    """
+    Returns the colour bin of each value, as matplotlib.colors.BoundaryNorm(bounds, len(bounds) - 1) would
+    (bin i holds bounds[i] <= value < bounds[i+1]), with values outside the bounds put in the first or last bin.
+    The smallest integer dtype that holds the bins is used, so bins of many frames stay compact.
+    """
+    bins = np.searchsorted(bounds, values, side="right") - 1
+    bins = np.clip(bins, 0, len(bounds) - 2)
+    return bins.astype(np.min_scalar_type(len(bounds) - 2))
@@ -0,0 +1,925 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:18 2026
+
+@author: biol0117
+"""
+
+# Model program runners without any Qt dependency, shared by the GUI (sim.py) and the command-line runner (gdsimscli.py).
+
+from pathlib import Path
+from datetime import datetime
+import subprocess
+import concurrent.futures
+import copy
+import json
+import threading
+import logging
+import logging.handlers
+import hashlib
+import shutil
+import sys
+import os
+import re
+import params
+import stopconditions
+import outcomes
+import compaction
+from tailreader import FileTail
+
+def defaultModelPath(basedir):
+    """
+    Returns the path of the model program for the current platform. Only the Windows and macOS builds are bundled;
+    on other platforms (e.g. Linux batch nodes) a "gdsimsapp" build is expected in the model directory.
+
+    Parameters
+    ----------
+    basedir : Path
+        Base directory of the GUI files (containing the model directory).
+    """
+    if sys.platform == "win32":
+        return Path(basedir / "model" / "gdsimsapp_win.exe")
+    if sys.platform == "darwin":
+        return Path(basedir / "model" / "gdsimsapp_mac")
+    return Path(basedir / "model" / "gdsimsapp")
+
+def makeOutputDir(dirPath, simName, basedir):
+    """
+    Creates a new directory for the simulation files in the selected directory path.
+    If a simulation name is specified (not blank), the directory will have this name.
+    Otherwise, a date-time stamp will be given.
+    If the parent directory path is not given (blank), the parent directory will be taken as the base directory.
+
+    Parameters
+    ----------
+    dirPath : string
+        Absolute filepath for the parent directory of the simulation files.
+    simName : string
+        Name for the new subdirectory.
+    basedir : Path
+        Default parent directory.
+
+    Returns
+    -------
+    outputPath : Path
+        Path of the new simulation directory.
+    simName : string
+        Name of the new simulation directory.
+    errMsgs : list:string
+        Error messages (empty if the directory is valid).
+
+    """
+    outputPath = Path()
+    errMsgs = []
+    if Path(dirPath).is_dir() or dirPath == "":
+        if dirPath == "":
+            dirPath = basedir
+
+        if simName != "":
+            outputPath = Path(dirPath) / Path(simName)
+        else:
+            dt = datetime.now()
+            simName = str(dt.year) + "_" + str(dt.month) + "_" + "{:02d}".format(dt.day)
+            simName +=  "_" + "{:02d}".format(dt.hour) + "{:02d}".format(dt.minute) + "{:02d}".format(dt.second)
+            outputPath = Path(dirPath) / simName
+
+        # check if the directory has already been used for simulations
+        if not Path(outputPath / "params.txt").exists():
+            if not outputPath.exists():
+                os.makedirs(outputPath)
+        else:
+            errMsgs.append("The selected simulation directory has already been used to run a simulation. Please select a different one.")
+
+    else:
+        errMsgs.append("The output directory path does not exist.")
+
+    return outputPath, simName, errMsgs
+
+
+stopsFileName = stopconditions.stopsFileName # early-stopped runs of a simulation, see stopconditions
+
+def truncatePartialLine(filePath, blockSize=65536):
+    """
+    Removes an incomplete last line from an output file, e.g. one the model was writing when it was stopped early,
+    so that the file only has whole rows.
+    """
+    with open(filePath, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(pos - blockSize, 0)
+            f.seek(start)
+            block = f.read(pos - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                if start + newline + 1 < end:
+                    f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+class Checkpoint():
+    """ 
+    Records the set-up of a simulation and its completed runs in the simulation directory,
+    so that an interrupted simulation can be resumed by only running its missing replicates.
+    A run counts as completed when its Totals file has all maxT days written, or when it was stopped early.
+    Completed runs are remembered, and the Totals files of the other runs are only read from where the last check
+    stopped, so that saving the checkpoint after each replicate doesn't re-read the whole output.
+    """
+    fileName = "checkpoint.json"
+    
+    def __init__(self, outputPath, paramSet, completed=None):
+        """
+        Parameters
+        ----------
+        outputPath : Path
+            Simulation directory (containing the params.txt file).
+        paramSet : InputParams
+            Parameter set of the simulation.
+        completed : list:int, optional
+            Runs already known to be completed. The default is None (found from the output files).
+        """
+        self.outputPath = Path(outputPath)
+        self.paramSet = paramSet
+        self.completed = set(completed) if completed != None else set()
+        self.lineCounters = {} # LineCounter of the Totals file of each run not yet completed
+        
+    @classmethod
+    def load(cls, outputPath):
+        """
+        Reads the checkpoint of a simulation directory.
+
+        Returns
+        -------
+        Checkpoint
+            None if the directory has no checkpoint.
+        """
+        checkpointFile = Path(outputPath) / cls.fileName
+        if not checkpointFile.exists():
+            return None
+        with open(checkpointFile, "r") as f:
+            info = json.load(f)
+        paramSet = params.readProgramParamsFile(Path(outputPath) / "params.txt", info["dispType"], info["boundaryType"], 
+                                                info["rainfallFile"], info["coordsFile"], info["relTimesFile"])
+        return cls(outputPath, paramSet, info.get("completedRuns"))
+    
+    def totalsFile(self, run):
+        return self.outputPath / "output_files" / "Totals{}run{}.txt".format(self.paramSet.setLabel, run)
+
+    def addCompleted(self, run):
+        """ Records a run as completed (e.g. a replicate merged after its model process finished). """
+        self.completed.add(run)
+        self.lineCounters.pop(run, None)
+
+    def isRunComplete(self, run):
+        """ Returns whether the Totals file of a run has all of its maxT days written (plus the initialisation day). """
+        totalsFile = self.totalsFile(run)
+        if compaction.isCompressed(compaction.sourcePath(totalsFile)): # only finished simulations are compacted
+            return True
+        numLines = self.lineCounters.setdefault(run, LineCounter()).count(totalsFile)
+        return numLines != None and (numLines - 3) >= self.paramSet.maxT # two header lines and the initialisation day
+    
+    def completedRuns(self):
+        """ Returns the runs whose Totals files are complete, or that were stopped early. """
+        stops = stopconditions.readStops(self.outputPath / stopsFileName)
+        for run in range(1, self.paramSet.numRuns + 1):
+            if run not in self.completed and (run in stops or self.isRunComplete(run)):
+                self.addCompleted(run)
+        return [run for run in range(1, self.paramSet.numRuns + 1) if run in self.completed]
+    
+    def missingRuns(self):
+        """ Returns the runs that still need to be run. """
+        completed = self.completedRuns()
+        return [run for run in range(1, self.paramSet.numRuns + 1) if run not in completed]
+    
+    def save(self):
+        """ Writes the checkpoint file with the runs completed so far. """
+        info = {"dispType": self.paramSet.dispType,
+                "boundaryType": self.paramSet.boundaryType,
+                "rainfallFile": self.paramSet.rainfallFile,
+                "coordsFile": self.paramSet.coordsFile,
+                "relTimesFile": self.paramSet.relTimesFile,
+                "numRuns": self.paramSet.numRuns,
+                "maxT": self.paramSet.maxT,
+                "setLabel": self.paramSet.setLabel,
+                "completedRuns": self.completedRuns()}
+        tmpFile = self.outputPath / (self.fileName + ".tmp")
+        with open(tmpFile, "w") as f:
+            json.dump(info, f, indent=1)
+        os.replace(tmpFile, self.outputPath / self.fileName)
+
+
+class LineCounter():
+    """ 
+    Counts the complete lines of a file the model is appending to, reading only the bytes written since the last count
+    (see tailreader.FileTail).
+    """
+    def __init__(self):
+        self.tail = FileTail()
+
+    def count(self, path):
+        """
+        Parameters
+        ----------
+        path : string
+            Filepath of the file.
+
+        Returns
+        -------
+        int
+            Number of complete lines in the file, or None if it doesn't exist.
+        """
+        data, restarted = self.tail.read(path)
+        if data == None:
+            return None
+        return self.tail.numLines
+
+
+class ProgressCounter():
+    """ 
+    Counts the simulated days written to the Totals files of a simulation's runs. 
+    Each count only reads the data appended since the previous one.
+    """
+    def __init__(self, files, maxT, runs=None, stopsFile=None):
+        """
+        Parameters
+        ----------
+        files : list
+            Totals filepath to track for each run. An entry can also be a list of alternative
+            filepaths for the same run (e.g. a replicate's working file and its merged file).
+        maxT : int
+            Maximum simulated time (in days).
+        runs : list:int, optional
+            Run index of each entry of files. The default is None (1 to the number of files).
+        stopsFile : Path, optional
+            Early stops file of the simulation; runs stopped early count as complete. The default is None.
+        """
+        self.files = files
+        self.maxT = maxT
+        self.runs = runs if runs != None else list(range(1, len(files) + 1))
+        self.stopsFile = stopsFile
+        self.complete = [False] * len(files)
+        self.lineCounters = [LineCounter() for f in files]
+        self.runDays = [0] * len(files) # days written by each run at the last count (including initialisation day)
+        self.skippedDays = [0] * len(files) # days counted as done but not simulated, by runs stopped early
+
+    def isComplete(self):
+        """ Returns whether all the runs have been completed. """
+        return all(self.complete)
+
+    def count(self):
+        """
+        Returns
+        -------
+        progress : int
+            Number of days written across all runs (including each run's initialisation day).
+        """
+        progress = 0
+        stops = {}
+        if self.stopsFile != None and os.path.exists(self.stopsFile):
+            stops = stopconditions.readStops(self.stopsFile)
+        for i in range(0, len(self.files)):
+            if self.runs[i] in stops and self.skippedDays[i] == 0:
+                self.skippedDays[i] = max(self.maxT - stops[self.runs[i]][0], 0) # days after the stop day
+                self.complete[i] = True
+            if self.complete[i]:
+                self.runDays[i] = self.maxT + 1
+                progress += self.maxT + 1
+                continue
+            paths = self.files[i] if isinstance(self.files[i], (list, tuple)) else [self.files[i]]
+            if any(compaction.isCompressed(compaction.sourcePath(path)) for path in paths): # compacted after the run finished
+                self.complete[i] = True
+                self.runDays[i] = self.maxT + 1
+                progress += self.maxT + 1
+                continue
+            for path in paths:
+                numLines = self.lineCounters[i].count(path)
+                if numLines != None:
+                    numDays = max(numLines - 2, 0) # subtract two header lines
+                    self.runDays[i] = min(numDays, self.maxT + 1) # including initialisation day
+                    progress += self.runDays[i]
+                    if (numDays - 1) >= self.maxT: # without initialisation day
+                        self.complete[i] = True
+                    break
+        return progress
+
+
+class ModelRunner():
+    """ Runs the model program once for all the simulation replicates. """
+    def __init__(self, exeFilepath, outputPath, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile, numRuns=1, setLabel=1):
+        """
+        Parameters
+        ----------
+        exeFilepath : Path
+            Filepath of the model program.
+        outputPath : Path
+            Output directory path (containing the params.txt file).
+        dispType : string
+            Dispersal type for simulation. Options: "Distance kernel", "Radial".
+        boundaryType : string
+            Boundary type for simulation. Options: "Toroid", "Edge".
+        rainfallFile : string
+            Absolute filepath of the rainfall file. Can be None.
+        coordsFile : string
+            Absolute filepath of the coordinates file. Can be None.
+        relTimesFile : string
+            Absolute filepath of the release times file. Can be None.
+        numRuns : int, optional
+            Number of simulation replicates in params.txt. The default is 1.
+        setLabel : int, optional
+            'Set of repetitions' index label for output files. The default is 1.
+        """
+        # absolute paths, as the model subprocess runs in the output directory rather than the current working directory
+        self.exeFilepath = Path(os.path.abspath(exeFilepath))
+        self.outputPath = Path(os.path.abspath(outputPath))
+        self.rainfallFile = rainfallFile
+        self.coordsFile = coordsFile
+        self.relTimesFile = relTimesFile
+        self.dispType = dispType
+        self.boundaryType = boundaryType
+        self.runs = list(range(1, numRuns + 1))
+        self.setLabel = setLabel
+
+        self.process = None
+        self.aborted = False
+        self.checkpoint = None # Checkpoint to keep up to date with the completed runs
+        self.logMaxBytes = 10 * 1024 * 1024 # model stdout log size before it is rotated
+        self.logBackupCount = 3
+        self.niceness = None
+        self.cpuAffinity = None
+        self.timeout = None
+        self.stopConditions = None # StopConditions to end replicates early (per-replicate runners only)
+        self.stopsFile = self.outputPath / stopsFileName
+
+    def setScheduling(self, niceness=None, cpuAffinity=None, timeout=None):
+        """
+        Sets how the model subprocesses are scheduled.
+
+        Parameters
+        ----------
+        niceness : int, optional
+            Niceness increment (0-19, higher is lower priority) of the subprocesses. On Windows, any positive
+            value gives them a below-normal priority class (idle class from 15). The default is None (unchanged).
+        cpuAffinity : list:int, optional
+            CPU cores the subprocesses may run on (Linux only). The default is None (any core).
+        timeout : float, optional
+            Wall-clock time limit (in seconds) of each subprocess, after which it is killed. The default is None (no limit).
+        """
+        self.niceness = niceness
+        self.cpuAffinity = cpuAffinity
+        self.timeout = timeout
+
+    def progressFiles(self):
+        """
+        Returns
+        -------
+        files : list
+            Totals filepath of each run, to track the simulation progress.
+        """
+        return [os.path.join(self.outputPath, "output_files", "Totals{}run{}.txt".format(self.setLabel, run)) for run in self.runs]
+
+    def modelInput(self, paramFile):
+        """
+        Creates the model program's command-line input for the simulation.
+
+        Parameters
+        ----------
+        paramFile : Path
+            Path to the params.txt file for the model program.
+
+        Returns
+        -------
+        inputString : string
+            Newline-separated menu choices to send to the model program's stdin.
+        """
+        inputString = "100" + "\n" + str(paramFile.resolve()) + "\n" + "y" +"\n" + "y" + "\n"
+
+        if self.boundaryType == "Toroid":
+            inputString += "1" + "\n" + "t" + "\n"
+        elif self.boundaryType == "Edge":
+            inputString += "1" + "\n" + "e" + "\n"
+        if self.dispType == "Distance kernel":
+            inputString += "2" + "\n" + "d" + "\n"
+        elif self.dispType == "Radial":
+            inputString += "2" + "\n" + "r" + "\n"
+        if self.rainfallFile != None:
+            inputString += "3" + "\n" + self.rainfallFile + "\n"
+        if self.coordsFile != None:
+            inputString += "4" + "\n" + self.coordsFile + "\n"
+        if self.relTimesFile != None:
+            inputString += "5" + "\n" + self.relTimesFile + "\n"
+
+        inputString += "0" + "\n"
+        return inputString
+
+    def startProcess(self, cwd, cpus=None):
+        """
+        Starts a model program subprocess with the runner's scheduling settings.
+
+        Parameters
+        ----------
+        cwd : Path
+            Working directory of the subprocess (the model writes its output files here).
+        cpus : list:int, optional
+            CPU cores to pin the subprocess to. The default is None (the runner's CPU affinity).
+
+        Returns
+        -------
+        subprocess.Popen
+        """
+        env = os.environ.copy()
+        # Ensure process runs without creating a console window
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            creationflags = subprocess.CREATE_NO_WINDOW
+            if self.niceness != None and self.niceness >= 15:
+                creationflags |= subprocess.IDLE_PRIORITY_CLASS
+            elif self.niceness != None and self.niceness > 0:
+                creationflags |= subprocess.BELOW_NORMAL_PRIORITY_CLASS
+            return subprocess.Popen(
+                [self.exeFilepath],
+                stdin = subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                startupinfo=startupinfo,
+                creationflags=creationflags,
+                text=True,
+                cwd=cwd,
+                env=env
+            )
+        else:
+            process = subprocess.Popen(
+                [self.exeFilepath],
+                stdin = subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+                text=True,
+                cwd=cwd,
+                env=env
+            )
+            self.applyScheduling(process, cpus if cpus != None else self.cpuAffinity)
+            return process
+            
+    def applyScheduling(self, process, cpus):
+        """
+        Sets the niceness and CPU affinity of a POSIX subprocess. 
+        This is done from the parent (rather than with preexec_fn, which is unsafe with threads) before the 
+        model has been sent its input, so it is still waiting and the settings apply to all of its run.
+        """
+        if self.niceness:
+            try:
+                os.setpriority(os.PRIO_PROCESS, process.pid, min(19, os.getpriority(os.PRIO_PROCESS, 0) + self.niceness))
+            except OSError: # e.g. not permitted to raise the priority
+                pass
+        if cpus and hasattr(os, "sched_setaffinity"): # not available on macOS
+            try:
+                os.sched_setaffinity(process.pid, cpus)
+            except OSError: # e.g. core not available
+                pass
+
+    def communicate(self, process, inputString, logPath):
+        """
+        Sends the input to a model subprocess and streams its output until it exits.
+        Stdout lines are appended to a rotating log file rather than kept in memory. 
+        Any stderr output is treated as a fatal model error (cerrs, not subprocess errs) and stops the process straight away.
+        A process still running after the runner's timeout is killed by a watchdog timer.
+
+        Parameters
+        ----------
+        process : subprocess.Popen
+        inputString : string
+            Input to send to the process's stdin.
+        logPath : Path
+            Log file for the process's stdout.
+
+        Returns
+        -------
+        errs : string
+            Error messages from the model program (empty if none).
+        """
+        errLines = []
+        handler = logging.handlers.RotatingFileHandler(logPath, maxBytes=self.logMaxBytes, backupCount=self.logBackupCount)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        
+        def readStdout():
+            for line in process.stdout:
+                handler.emit(logging.makeLogRecord({"msg": line.rstrip("\n")}))
+                
+        def readStderr():
+            for line in process.stderr:
+                if line.strip() == "":
+                    continue
+                if not errLines:
+                    # give the rest of a multi-line error message a moment to arrive before stopping the model
+                    threading.Timer(0.2, process.terminate).start()
+                errLines.append(line)
+        
+        timedOut = threading.Event()
+        def killTimedOut():
+            timedOut.set()
+            process.kill()
+        
+        readers = [threading.Thread(target=readStdout, daemon=True), threading.Thread(target=readStderr, daemon=True)]
+        for reader in readers:
+            reader.start()
+        watchdog = None
+        if self.timeout:
+            watchdog = threading.Timer(self.timeout, killTimedOut)
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            process.stdin.write(inputString)
+            process.stdin.close()
+        except (BrokenPipeError, OSError): # model exited (or was aborted) before reading its input
+            pass
+        process.wait()
+        if watchdog != None:
+            watchdog.cancel()
+        for reader in readers:
+            reader.join()
+        handler.close()
+        if timedOut.is_set():
+            errLines.insert(0, "Model run stopped after exceeding the time limit of {:g} s.\n".format(self.timeout))
+        return "".join(errLines)
+
+    def run(self):
+        """
+        Runs the simulation.
+
+        Returns
+        -------
+        errs : string
+            Error messages from the model program (empty if none).
+        """
+        self.saveCheckpoint()
+        self.process = self.startProcess(self.outputPath)
+        errs = self.communicate(self.process, self.modelInput(self.outputPath / "params.txt"), self.outputPath / "model_output.log")
+        self.saveCheckpoint()
+        return errs
+    
+    def progressCounter(self, maxT):
+        """ Returns a ProgressCounter for the runs of this runner. """
+        return ProgressCounter(self.progressFiles(), maxT, self.runs, self.stopsFile)
+
+    def runningProcesses(self):
+        """
+        Returns
+        -------
+        dict
+            Running model subprocesses by label (the single process runs all the replicates).
+        """
+        if self.process != None and self.process.poll() == None:
+            return {"runs {}-{}".format(self.runs[0], self.runs[-1]) : self.process}
+        return {}
+    
+    def duplicateRuns(self):
+        """ Returns the (run, earlier run) pairs with identical output. None here, as all the replicates share one random stream. """
+        return []
+    
+    def saveCheckpoint(self):
+        """ Updates the simulation's checkpoint file, if it has one. """
+        if self.checkpoint != None:
+            self.checkpoint.save()
+
+    def abort(self):
+        """ Aborts the simulation. """
+        self.aborted = True
+        if self.process:
+            self.process.terminate()
+
+
+class ParallelModelRunner(ModelRunner):
+    """
+    Runs the simulation replicates as separate model subprocesses, several at a time.
+    Each replicate runs in its own subdirectory with num_runs = 1 and its output files are
+    moved into the usual output_files directory (as run i) when it completes.
+    The model program has no seed or run index input: each process seeds its Mersenne Twister generator from
+    std::random_device, so replicates started at the same time still differ. As some C++ runtimes (e.g. older MinGW
+    builds) implement random_device deterministically, merged runs with identical Totals files are reported
+    (see duplicateRuns).
+    """
+    def __init__(self, exeFilepath, outputPath, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile, numRuns, setLabel, numWorkers, runs=None):
+        """
+        Parameters
+        ----------
+        exeFilepath : Path
+            Filepath of the model program.
+        outputPath : Path
+            Output directory path (containing the params.txt file).
+        dispType : string
+            Dispersal type for simulation. Options: "Distance kernel", "Radial".
+        boundaryType : string
+            Boundary type for simulation. Options: "Toroid", "Edge".
+        rainfallFile : string
+            Absolute filepath of the rainfall file. Can be None.
+        coordsFile : string
+            Absolute filepath of the coordinates file. Can be None.
+        relTimesFile : string
+            Absolute filepath of the release times file. Can be None.
+        numRuns : int
+            Number of simulation replicates to run.
+        setLabel : int
+            'Set of repetitions' index label for output files.
+        numWorkers : int
+            Maximum number of model subprocesses to run at once.
+        runs : list:int, optional
+            Run indices to run (e.g. the missing runs of an interrupted simulation). The default is None (all runs).
+        """
+        super().__init__(exeFilepath, outputPath, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile, numRuns, setLabel)
+        if runs != None:
+            self.runs = list(runs)
+        self.numWorkers = max(1, numWorkers)
+        self.processes = {} # running subprocesses by run index
+        self.freeCores = [] # cores not used by a running replicate, if replicates are pinned to distinct cores
+        self.lock = threading.Lock()
+        self.totalsHashes = {} # hash of the Totals file of each merged run, to check that replicates differ
+
+    def replicateDir(self, run):
+        """ Returns the working directory of the given replicate. """
+        return self.outputPath / "replicates" / "run{}".format(run)
+
+    def progressFiles(self):
+        """
+        Returns
+        -------
+        files : list
+            For each run, the Totals filepaths it can be found at whilst running and once merged.
+        """
+        files = []
+        for run in self.runs:
+            files.append([os.path.join(self.replicateDir(run), "output_files", "Totals{}run1.txt".format(self.setLabel)),
+                          os.path.join(self.outputPath, "output_files", "Totals{}run{}.txt".format(self.setLabel, run))])
+        return files
+
+    def createReplicateDirs(self):
+        """ Creates a working directory and a single-run params.txt file for each replicate. """
+        with open(self.outputPath / "params.txt", "r") as f:
+            lines = f.readlines()
+        lines[0] = "1\n" # num_runs
+        for run in self.runs:
+            shutil.rmtree(self.replicateDir(run), ignore_errors=True) # left over from an interrupted run
+            os.makedirs(self.replicateDir(run))
+            for ext in [""] + compaction.compressedExts: # incomplete (or compacted) files of an interrupted run
+                for f in self.outputPath.glob("output_files/*run{}.txt{}".format(run, ext)):
+                    os.remove(f)
+            with open(self.replicateDir(run) / "params.txt", "w") as f:
+                f.writelines(lines)
+
+    def mergeReplicate(self, run):
+        """ Moves the output files of a completed replicate into the simulation's output_files directory as run i. """
+        srcDir = self.replicateDir(run) / "output_files"
+        destDir = self.outputPath / "output_files"
+        os.makedirs(destDir, exist_ok=True)
+        if srcDir.exists():
+            for f in os.listdir(srcDir):
+                # e.g. Totals1run1.txt -> Totals1run7.txt
+                os.replace(srcDir / f, destDir / re.sub(r"run1(?=\.\w+$)", "run{}".format(run), f))
+        shutil.rmtree(self.replicateDir(run), ignore_errors=True)
+        totalsFile = destDir / "Totals{}run{}.txt".format(self.setLabel, run)
+        if totalsFile.exists():
+            with open(totalsFile, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        with self.lock:
+            if totalsFile.exists():
+                self.totalsHashes[run] = digest
+            if self.checkpoint != None:
+                self.checkpoint.addCompleted(run)
+            self.saveCheckpoint()
+        
+    def duplicateRuns(self):
+        """
+        Returns
+        -------
+        list
+            (run, earlier run) pairs of merged runs with identical Totals files, i.e. replicates that were most likely 
+            given the same random seed by the model program.
+        """
+        firstRuns = {}
+        duplicates = []
+        with self.lock:
+            for run, digest in sorted(self.totalsHashes.items()):
+                if digest in firstRuns:
+                    duplicates.append((run, firstRuns[digest]))
+                else:
+                    firstRuns[digest] = run
+        return duplicates
+
+    def runReplicate(self, run):
+        """
+        Runs a single replicate subprocess to completion.
+
+        Parameters
+        ----------
+        run : int
+            Run index of the replicate.
+
+        Returns
+        -------
+        errs : string
+            Error messages from the model program (empty if none).
+        """
+        if self.aborted:
+            return ""
+        with self.lock:
+            cpus = [self.freeCores.pop(0)] if self.freeCores else None
+        process = self.startProcess(self.replicateDir(run), cpus)
+        with self.lock:
+            self.processes[run] = process
+        if self.aborted: # abort may have happened before the process was registered
+            process.terminate()
+        monitor = None
+        if self.stopConditions != None and self.stopConditions.isEnabled():
+            monitor = stopconditions.StopMonitor(self.replicateDir(run) / "output_files" / "Totals{}run1.txt".format(self.setLabel), 
+                                                 self.stopConditions, lambda day, reason: process.terminate())
+            monitor.start()
+        errs = self.communicate(process, self.modelInput(self.replicateDir(run) / "params.txt"), 
+                                self.outputPath / "model_output_run{}.log".format(run))
+        if monitor != None:
+            monitor.stop()
+        with self.lock:
+            del self.processes[run]
+            if cpus != None:
+                self.freeCores.append(cpus[0])
+        if errs:
+            return errs
+        if not self.aborted:
+            if monitor != None and monitor.reason != None:
+                for f in (self.replicateDir(run) / "output_files").glob("*.txt"): # terminated mid-write
+                    truncatePartialLine(f)
+                with self.lock:
+                    stopconditions.recordStop(self.stopsFile, run, monitor.stopDay, monitor.reason)
+            self.mergeReplicate(run)
+        return ""
+
+    def run(self):
+        """
+        Runs all the simulation replicates.
+
+        Returns
+        -------
+        errs : string
+            Error messages from the model program, by run (empty if none).
+        """
+        self.saveCheckpoint()
+        self.createReplicateDirs()
+        if self.cpuAffinity and len(self.cpuAffinity) >= min(self.numWorkers, len(self.runs)):
+            self.freeCores = list(self.cpuAffinity) # pin each running replicate to its own core
+        errMsgs = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.numWorkers) as pool:
+            futures = {pool.submit(self.runReplicate, run) : run for run in self.runs}
+            for future in concurrent.futures.as_completed(futures):
+                errs = future.result()
+                if errs and not self.aborted:
+                    errMsgs.append("Run {}: {}".format(futures[future], errs))
+                    self.abort() # stop the other replicates
+
+        if not errMsgs and not self.aborted:
+            shutil.rmtree(self.outputPath / "replicates", ignore_errors=True)
+        return "\n".join(errMsgs)
+
+    def runningProcesses(self):
+        """
+        Returns
+        -------
+        dict
+            Running model subprocesses by label (one per replicate).
+        """
+        with self.lock:
+            return {"run {}".format(run) : process for run, process in self.processes.items()}
+
+    def abort(self):
+        """ Stops all running replicates and prevents new ones from starting. """
+        self.aborted = True
+        with self.lock:
+            for process in self.processes.values():
+                process.terminate()
+
+
+class SequentialModelRunner(ParallelModelRunner):
+    """
+    Runs replicates in batches (as ParallelModelRunner) until the confidence interval of a summary outcome 
+    is narrower than a tolerance, or numRuns replicates have been run. The number of runs in params.txt
+    (and the checkpoint) is then set to the number of replicates actually run.
+    """
+    def __init__(self, exeFilepath, outputPath, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile, numRuns, setLabel, numWorkers, 
+                 seqStopping):
+        """
+        Parameters
+        ----------
+        See ParallelModelRunner. numRuns is the maximum number of replicates to run.
+        seqStopping : SequentialStopping
+            Outcome, tolerance and batch size settings.
+        """
+        super().__init__(exeFilepath, outputPath, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile, numRuns, setLabel, numWorkers)
+        self.seqStopping = seqStopping
+        self.maxRuns = numRuns
+        self.batches = [] # (number of runs, estimate, low, high, number of runs left out) after each batch
+
+    def run(self):
+        """
+        Runs batches of replicates until the outcome is precise enough.
+
+        Returns
+        -------
+        errs : string
+            Error messages from the model program, by run (empty if none).
+        """
+        allRuns = self.runs
+        numDone = 0
+        errs = ""
+        stoppedBy = "maxRuns"
+        self.batches = []
+        while numDone < len(allRuns) and not self.aborted:
+            self.runs = allRuns[numDone:numDone + self.seqStopping.batchSize]
+            errs = ParallelModelRunner.run(self)
+            if errs or self.aborted:
+                break
+            numDone += len(self.runs)
+            interval, numExcluded = outcomes.outcomeInterval(self.outputPath, self.setLabel, allRuns[:numDone], self.seqStopping.outcome, 
+                                                             self.seqStopping.confidence)
+            self.batches.append((numDone,) + (interval if interval != None else (None, None, None)) + (numExcluded,))
+            self.writeSummary(None)
+            if interval != None and (interval[2] - interval[1]) <= self.seqStopping.tolerance:
+                stoppedBy = "tolerance"
+                break
+        self.runs = allRuns
+        if not errs and not self.aborted:
+            self.writeSummary(stoppedBy)
+            if numDone < len(allRuns):
+                self.setNumRuns(numDone)
+        return errs
+
+    def writeSummary(self, stoppedBy):
+        """ Writes the outcome estimate after each batch to outcome_summary.json in the simulation directory. """
+        summary = {"outcome": self.seqStopping.outcome,
+                   "confidence": self.seqStopping.confidence,
+                   "tolerance": self.seqStopping.tolerance,
+                   "batchSize": self.seqStopping.batchSize,
+                   "maxRuns": self.maxRuns,
+                   "stoppedBy": stoppedBy, # "tolerance", "maxRuns" or None while running
+                   "batches": [{"numRuns": n, "estimate": est, "low": low, "high": high, "numExcluded": excl} 
+                               for n, est, low, high, excl in self.batches]}
+        with open(self.outputPath / "outcome_summary.json", "w") as f:
+            json.dump(summary, f, indent=1)
+
+    def setNumRuns(self, numRuns):
+        """ Sets the number of runs in the params files and checkpoint to the number of replicates run. """
+        with open(self.outputPath / "params.txt", "r") as f:
+            lines = f.readlines()
+        lines[0] = "{}\n".format(numRuns) # num_runs
+        with open(self.outputPath / "params.txt", "w") as f:
+            f.writelines(lines)
+        if self.checkpoint != None:
+            self.checkpoint.paramSet = copy.copy(self.checkpoint.paramSet)
+            self.checkpoint.paramSet.numRuns = numRuns
+            params.createUserParamsFile(self.outputPath, self.checkpoint.paramSet, params.paramsInfo())
+            self.checkpoint.save()
+
+
+def createRunner(exeFilepath, outputPath, paramSet, numWorkers=1, runs=None, niceness=None, cpuAffinity=None, timeout=None, 
+                 stopConditions=None, seqStopping=None):
+    """
+    Creates the model runner for a parameter set, with a checkpoint of its completed runs.
+    Replicates are run in parallel if there is more than one of them and more than one worker,
+    or if only some of the runs are to be run, or if they can be stopped early.
+
+    Parameters
+    ----------
+    exeFilepath : Path
+        Filepath of the model program.
+    outputPath : Path
+        Output directory path (containing the params.txt file).
+    paramSet : InputParams
+        Parameter set of the simulation.
+    numWorkers : int, optional
+        Maximum number of model subprocesses to run at once. The default is 1.
+    runs : list:int, optional
+        Run indices to run. The default is None (all runs).
+    niceness, cpuAffinity, timeout : optional
+        Scheduling settings of the model subprocesses, see ModelRunner.setScheduling. The defaults are None.
+    stopConditions : StopConditions, optional
+        Conditions for ending replicates before maxT. The default is None.
+    seqStopping : SequentialStopping, optional
+        Settings to run replicates in batches until the outcome is precise enough, with paramSet.numRuns 
+        as the maximum number of replicates (not used with runs). The default is None (run all numRuns replicates).
+
+    Returns
+    -------
+    ModelRunner
+    """
+    earlyStop = stopConditions != None and stopConditions.isEnabled() # needs one subprocess per replicate
+    if seqStopping != None and runs == None:
+        runner = SequentialModelRunner(exeFilepath, outputPath, paramSet.dispType, paramSet.boundaryType, paramSet.rainfallFile,
+                                       paramSet.coordsFile, paramSet.relTimesFile, paramSet.numRuns, paramSet.setLabel, numWorkers, seqStopping)
+    elif (numWorkers > 1 and paramSet.numRuns > 1) or runs != None or earlyStop:
+        runner = ParallelModelRunner(exeFilepath, outputPath, paramSet.dispType, paramSet.boundaryType, paramSet.rainfallFile,
+                                     paramSet.coordsFile, paramSet.relTimesFile, paramSet.numRuns, paramSet.setLabel, numWorkers, runs)
+    else:
+        runner = ModelRunner(exeFilepath, outputPath, paramSet.dispType, paramSet.boundaryType, paramSet.rainfallFile,
+                             paramSet.coordsFile, paramSet.relTimesFile, paramSet.numRuns, paramSet.setLabel)
+    runner.setScheduling(niceness, cpuAffinity, timeout)
+    runner.stopConditions = stopConditions
+    runner.checkpoint = Checkpoint(outputPath, paramSet)
+    return runner
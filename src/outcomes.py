@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:02:09 2026
+
+@author: biol0117
+"""
+
+# Summary outcomes of a simulation's replicates (from their Totals files) and their confidence intervals,
+# used to decide when enough replicates have been run. Has no Qt dependency.
+
+from statistics import NormalDist
+import json
+import math
+import os
+import stopconditions
+import compaction
+
+outcomeNames = {"elimination": "Probability of elimination", "driveFreq": "Mean final drive allele frequency"}
+
+class SequentialStopping():
+    """ Settings for running replicates in batches until the outcome's confidence interval is narrow enough. """
+    def __init__(self, outcome="elimination", tolerance=0.1, batchSize=10, confidence=0.95):
+        """
+        Parameters
+        ----------
+        outcome : string, optional
+            Outcome to estimate. Options: "elimination" (probability of elimination), "driveFreq"
+            (mean final drive allele frequency of the runs not eliminated). The default is "elimination".
+        tolerance : float, optional
+            Confidence interval width to stop at. The default is 0.1.
+        batchSize : int, optional
+            Number of replicates to run between checks. The default is 10.
+        confidence : float, optional
+            Confidence level of the interval. The default is 0.95.
+        """
+        self.outcome = outcome
+        self.tolerance = tolerance
+        self.batchSize = max(1, batchSize)
+        self.confidence = confidence
+
+
+def finalRow(totalsFile):
+    """ Returns the last data row (day, WW, WD, DD, WR, RR, DR) of a Totals file, or None if it has none. """
+    if not os.path.exists(compaction.sourcePath(totalsFile)):
+        return None
+    with compaction.openOutput(totalsFile, "r") as f:
+        lines = f.readlines()[2:] # skip two header lines
+    for line in reversed(lines):
+        try:
+            return [float(v) for v in line.split()]
+        except ValueError: # incomplete last line
+            continue
+    return None
+
+def runOutcomes(outputPath, setLabel, runs):
+    """
+    Reads the outcome of each run from its Totals file. Runs stopped early at population elimination count as 
+    eliminated. Runs stopped at drive fixation or at a frequency threshold are left out, as their last row is not 
+    their state at maxT (e.g. the population can still be eliminated after the drive reaches fixation).
+
+    Parameters
+    ----------
+    outputPath : Path
+        Simulation directory.
+    setLabel : int
+        'Set of repetitions' index label of the output files.
+    runs : list:int
+        Run indices.
+
+    Returns
+    -------
+    eliminated : list:bool
+        Whether each run ended with the whole population eliminated.
+    driveFreqs : list:float
+        Final drive allele frequency of each run not eliminated.
+    numExcluded : int
+        Number of runs left out because they were stopped before their final state.
+    """
+    stops = stopconditions.readStops(os.path.join(outputPath, stopconditions.stopsFileName))
+    eliminated = []
+    driveFreqs = []
+    numExcluded = 0
+    for run in runs:
+        if run in stops:
+            if stops[run][1] == "elimination":
+                eliminated.append(True)
+            else:
+                numExcluded += 1
+            continue
+        row = finalRow(os.path.join(outputPath, "output_files", "Totals{}run{}.txt".format(setLabel, run)))
+        if row == None:
+            continue
+        freq = stopconditions.driveFrequency(row)
+        eliminated.append(freq == None)
+        if freq != None:
+            driveFreqs.append(freq)
+    return eliminated, driveFreqs, numExcluded
+
+def zScore(confidence):
+    """ Returns the two-sided standard normal quantile for a confidence level. """
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def wilsonInterval(successes, n, confidence=0.95):
+    """
+    Wilson score interval of a proportion.
+
+    Returns
+    -------
+    (estimate, low, high) : (float, float, float)
+        None if n is 0.
+    """
+    if n == 0:
+        return None
+    z = zScore(confidence)
+    p = successes / n
+    centre = (p + z**2 / (2*n)) / (1 + z**2 / n)
+    halfWidth = (z / (1 + z**2 / n)) * math.sqrt(p*(1 - p)/n + z**2 / (4 * n**2))
+    return (p, max(0, centre - halfWidth), min(1, centre + halfWidth))
+
+def meanInterval(values, confidence=0.95):
+    """
+    Normal-approximation confidence interval of a mean.
+
+    Returns
+    -------
+    (estimate, low, high) : (float, float, float)
+        None if there are fewer than two values.
+    """
+    n = len(values)
+    if n < 2:
+        return None
+    mean = sum(values) / n
+    sd = math.sqrt(sum((v - mean)**2 for v in values) / (n - 1))
+    halfWidth = zScore(confidence) * sd / math.sqrt(n)
+    return (mean, mean - halfWidth, mean + halfWidth)
+
+def outcomeInterval(outputPath, setLabel, runs, outcome, confidence=0.95):
+    """
+    Returns
+    -------
+    interval : (float, float, float)
+        Estimate, low and high of the confidence interval of an outcome over the given runs (see SequentialStopping),
+        None if there aren't enough runs to compute it.
+    numExcluded : int
+        Number of runs left out as they were stopped at fixation or a frequency threshold (see runOutcomes).
+    """
+    eliminated, driveFreqs, numExcluded = runOutcomes(outputPath, setLabel, runs)
+    if outcome == "elimination":
+        return wilsonInterval(sum(eliminated), len(eliminated), confidence), numExcluded
+    return meanInterval(driveFreqs, confidence), numExcluded
+
+def summaryText(outputPath):
+    """ Returns a one-line description of a simulation's outcome_summary.json, or None if it has none. """
+    summaryFile = os.path.join(outputPath, "outcome_summary.json")
+    if not os.path.exists(summaryFile):
+        return None
+    with open(summaryFile, "r") as f:
+        summary = json.load(f)
+    if len(summary["batches"]) == 0:
+        return None
+    last = summary["batches"][-1]
+    excluded = ""
+    if last.get("numExcluded", 0) > 0:
+        excluded = " {} run(s) stopped early at fixation or a frequency threshold were left out.".format(last["numExcluded"])
+    if last["estimate"] == None:
+        return "{}: not enough runs to estimate ({} runs).{}".format(outcomeNames[summary["outcome"]], last["numRuns"], excluded)
+    return "{}: {:.3f} ({:.0f}% CI {:.3f}-{:.3f}) from {} runs.{}".format(outcomeNames[summary["outcome"]], last["estimate"], 
+                                                                         100 * summary["confidence"], last["low"], last["high"], 
+                                                                         last["numRuns"], excluded)
@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:41:12 2026
+
+@author: biol0117
+"""
+
+# Reading of the model output files (Totals, LocalData and CoordinateList) for plotting. Each text file is
+# converted once into a binary .npy array (with a small JSON header describing its source), which is then
+# memory-mapped by later reads. Frames (e.g. one recorded day of a LocalData file) can also be read directly
+# through an index of their byte offsets (from the restore point before them in compressed files), or streamed
+# a block of rows at a time. Has no Qt dependency.
+
+from collections import OrderedDict
+import numpy as np
+import outputparser
+import compaction
+import metrics
+import threading
+import json
+import os
+
+cacheDirName = ".npy_cache" # hidden directory next to the output files holding their binary copies
+headerLines = 2 # number of header lines of the model output files
+chunkBytes = 16 * 1024 * 1024 # size of the blocks read when scanning a whole file
+
+def cachePaths(filePath, suffix=""):
+    """
+    Parameters
+    ----------
+    filePath : string
+        Filepath of the output text file.
+    suffix : string, optional
+        Name suffix of the cached item (e.g. for its frame index). The default is "" (binary copy of the data).
+
+    Returns
+    -------
+    (string, string)
+        Filepaths of the binary array and JSON header of an output file.
+    """
+    cacheDir = os.path.join(os.path.dirname(os.path.abspath(filePath)), cacheDirName)
+    name = os.path.basename(filePath) + suffix
+    return os.path.join(cacheDir, name + ".npy"), os.path.join(cacheDir, name + ".json")
+
+def tmpPath(filePath, extension=""):
+    """ Returns a temporary filepath to write a cached item to before it replaces filePath, unique to the process and thread. """
+    return filePath + ".tmp{}-{}{}".format(os.getpid(), threading.get_ident(), extension)
+
+def parseFile(filePath):
+    """ Returns the data rows of an output text file as a 2D array (see outputparser.parseFile). """
+    return outputparser.parseFile(filePath, headerLines)
+
+def parseRows(data, dtype=np.float64):
+    """ Returns the rows of a block of output file data lines (bytes, without header lines) as a 2D array. """
+    return outputparser.parseBytes(data, dtype)
+
+def writeHeader(filePath, stat, shape, dtype, suffix="", **info):
+    """ Writes the header of a cached array: source size and modification time, array shape and dtype, and any extra info. """
+    arrayFile, headerFile = cachePaths(filePath, suffix)
+    header = {"source": os.path.basename(filePath), "size": stat.st_size, "mtime": stat.st_mtime_ns,
+              "shape": list(shape), "dtype": str(dtype)}
+    header.update(info)
+    tmpFile = tmpPath(headerFile)
+    with open(tmpFile, "w") as f:
+        json.dump(header, f)
+    os.replace(tmpFile, headerFile)
+
+def writeCache(filePath, array, stat, suffix="", **info):
+    """ Writes an array and its header to the cache directory. """
+    arrayFile, headerFile = cachePaths(filePath, suffix)
+    try:
+        os.makedirs(os.path.dirname(arrayFile), exist_ok=True)
+        tmpFile = tmpPath(arrayFile, ".npy")
+        np.save(tmpFile, array)
+        os.replace(tmpFile, arrayFile)
+        writeHeader(filePath, stat, array.shape, array.dtype, suffix, **info)
+    except OSError: # e.g. read-only output directory, use the array without a copy
+        pass
+
+def isCacheValid(filePath, suffix=""):
+    """ Returns whether the binary copy of an output file exists and is up to date (same source size and modification time). """
+    arrayFile, headerFile = cachePaths(filePath, suffix)
+    if not (os.path.exists(arrayFile) and os.path.exists(headerFile)):
+        return False
+    try:
+        with open(headerFile, "r") as f:
+            header = json.load(f)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(compaction.sourcePath(filePath))
+    return header.get("size") == stat.st_size and header.get("mtime") == stat.st_mtime_ns
+
+def buildCache(filePath):
+    """
+    Converts an output text file into its binary copy and header. The file is streamed in blocks of rows (see iterRows)
+    into the memory-mapped copy, so files larger than the available memory can be converted.
+
+    Returns
+    -------
+    numpy.ndarray
+        Data rows of the file if the copy couldn't be written (e.g. read-only output directory), otherwise None.
+    """
+    stat = os.stat(compaction.sourcePath(filePath))
+    numRows, numCols = countRows(filePath)
+    arrayFile, headerFile = cachePaths(filePath)
+    tmpFile = tmpPath(arrayFile, ".npy")
+    try:
+        os.makedirs(os.path.dirname(arrayFile), exist_ok=True)
+        dtype = outputparser.columnDtype(filePath)
+        if numRows == 0:
+            np.save(tmpFile, np.empty((0, numCols), dtype=dtype))
+        else:
+            unstored = writeArray(filePath, tmpFile, (numRows, numCols), dtype)
+            while unstored != None: # values too large for the dtype, or that aren't integers after all
+                dtype = np.promote_types(dtype, unstored)
+                unstored = writeArray(filePath, tmpFile, (numRows, numCols), dtype)
+        os.replace(tmpFile, arrayFile)
+        writeHeader(filePath, stat, (numRows, numCols), dtype)
+    except OSError:
+        return parseFile(filePath)
+    return None
+
+def writeArray(filePath, arrayFile, shape, dtype):
+    """
+    Streams the rows of an output text file into a new .npy file.
+
+    Returns
+    -------
+    numpy dtype
+        dtype of the first rows that couldn't be stored with the dtype, or None if all the rows were stored.
+    """
+    array = np.lib.format.open_memmap(arrayFile, mode="w+", dtype=dtype, shape=shape)
+    row = 0
+    unstored = None
+    for rows in iterRows(filePath):
+        if not np.can_cast(rows.dtype, dtype):
+            unstored = rows.dtype
+            break
+        rows = rows[:shape[0] - row] # rows appended since counting are left for the next conversion
+        array[row:row + len(rows)] = rows
+        row += len(rows)
+    array.flush()
+    del array
+    return unstored
+
+def readArray(filePath):
+    """
+    Reads the data rows of an output file (without its header lines), from its binary copy if it is up to date,
+    otherwise converting the text file first.
+
+    Parameters
+    ----------
+    filePath : string
+        Filepath of the Totals, LocalData or CoordinateList text file.
+
+    Returns
+    -------
+    numpy.ndarray
+        2D array of the data rows (read-only memory map of the binary copy where possible).
+    """
+    if compaction.isCompressed(compaction.sourcePath(filePath)): # no binary copy, to keep compacted directories small
+        return parseFile(filePath)
+    if not isCacheValid(filePath):
+        data = buildCache(filePath)
+        if not isCacheValid(filePath): # not written, or the file changed while it was converted
+            return data if data is not None else parseFile(filePath)
+    arrayFile, headerFile = cachePaths(filePath)
+    try:
+        return np.load(arrayFile, mmap_mode="r")
+    except ValueError: # empty arrays can't be memory-mapped
+        return np.load(arrayFile)
+
+def loadArray(filePath):
+    """ Returns the data rows of an output file (see readArray), reusing the array if the file was read before and hasn't changed since. """
+    return dataCache.get(filePath, "data", lambda: readArray(filePath))
+
+
+class FrameIndex():
+    """
+    Byte offsets of the blocks of rows (frames) of an output text file, e.g. the rows of all the recorded patches
+    on one day of a LocalData file, or one day's row of a Totals file. Built in a single pass over the file (and kept
+    in the cache directory), so that a single frame or range of frames can then be read without reading the rest of the file.
+    """
+    def __init__(self, filePath, blockRows=1):
+        """
+        Parameters
+        ----------
+        filePath : string
+            Filepath of the output text file.
+        blockRows : int, optional
+            Number of rows per frame. The default is 1.
+        """
+        self.filePath = filePath
+        self.blockRows = max(1, blockRows)
+        self.suffix = ".frames{}".format(self.blockRows)
+        self.isCompressed = compaction.isCompressed(compaction.sourcePath(filePath))
+        self.restorePoints = np.zeros((1, 2), dtype=np.int64) # where a compressed file can be read from (see compaction.MemberReader)
+        if isCacheValid(filePath, self.suffix) and (not self.isCompressed or isCacheValid(filePath, self.suffix + ".points")):
+            self.offsets = np.load(cachePaths(filePath, self.suffix)[0])
+            if self.isCompressed:
+                self.restorePoints = np.load(cachePaths(filePath, self.suffix + ".points")[0])
+        else:
+            stat = os.stat(compaction.sourcePath(filePath))
+            self.offsets = self.build()
+            writeCache(filePath, self.offsets, stat, self.suffix, blockRows=self.blockRows)
+            if self.isCompressed:
+                writeCache(filePath, self.restorePoints, stat, self.suffix + ".points")
+
+    def build(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            Byte offset of the start of each complete frame, followed by the end of the last one.
+        """
+        starts = [np.zeros(1, dtype=np.int64)] # start of line 0
+        numLines = 0 # complete lines so far
+        pos = 0
+        with self.openAt(0) as f:
+            for chunk in iter(lambda: f.read(chunkBytes), b""):
+                newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+                lineNums = numLines + 1 + np.arange(len(newlines)) # lines starting after each newline
+                dataLines = lineNums - headerLines
+                isStart = (dataLines >= 0) & (dataLines % self.blockRows == 0)
+                starts.append((pos + newlines[isStart] + 1).astype(np.int64))
+                numLines += len(newlines)
+                pos += len(chunk)
+            if self.isCompressed: # found while reading through the file
+                self.restorePoints = np.array(f.restorePoints, dtype=np.int64).reshape(-1, 2)
+        if headerLines != 0:
+            starts = starts[1:]
+        numFrames = max(numLines - headerLines, 0) // self.blockRows
+        return np.concatenate(starts)[:numFrames + 1] if len(starts) != 0 else np.zeros(0, dtype=np.int64)
+
+    def numFrames(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def openAt(self, offset):
+        """
+        Opens the file at a byte offset (of its uncompressed data). A compressed file is only decompressed from
+        the restore point before the offset, so that reading a frame doesn't decompress the whole file.
+        """
+        if self.isCompressed:
+            return compaction.openAt(compaction.sourcePath(self.filePath), offset, self.restorePoints)
+        f = open(compaction.sourcePath(self.filePath), "rb")
+        f.seek(offset)
+        return f
+
+    def readBytes(self, first, last):
+        """ Returns the data lines of frames first to last - 1. """
+        with self.openAt(self.offsets[first]) as f:
+            return f.read(self.offsets[last] - self.offsets[first])
+
+    def readFrames(self, first, last):
+        """
+        Parameters
+        ----------
+        first : int
+            Index of the first frame (from 0).
+        last : int
+            Index after the last frame (exclusive).
+
+        Returns
+        -------
+        numpy.ndarray
+            2D array of the rows of the frames (from the binary copy of the file if it is up to date).
+        """
+        first = min(max(first, 0), self.numFrames())
+        last = min(max(last, first), self.numFrames())
+        if isCacheValid(self.filePath):
+            return loadArray(self.filePath)[first * self.blockRows:last * self.blockRows]
+        if last == first:
+            return np.empty((0, 0))
+        return parseRows(self.readBytes(first, last), outputparser.columnDtype(self.filePath))
+
+    def readFrame(self, t):
+        """ Returns the rows of frame t (from 0) as a 2D array. """
+        return self.readFrames(t, t + 1)
+
+    def frameStart(self, t):
+        """ Returns the first value of frame t (e.g. its day), reading only its first line. """
+        with self.openAt(self.offsets[t]) as f:
+            return float(f.readline().split()[0])
+
+
+def countRows(filePath):
+    """
+    Returns
+    -------
+    (int, int)
+        Number of complete data rows of an output text file and number of columns of its first row.
+    """
+    numLines = 0
+    numCols = 0
+    with compaction.openOutput(filePath) as f:
+        for i in range(0, headerLines):
+            numLines += f.readline().endswith(b"\n")
+        firstRow = f.readline()
+        numCols = len(firstRow.split())
+        numLines += firstRow.endswith(b"\n")
+        for chunk in iter(lambda: f.read(chunkBytes), b""):
+            numLines += chunk.count(b"\n")
+    return max(numLines - headerLines, 0), numCols
+
+def iterRows(filePath, blockRows=65536, partial=True):
+    """
+    Reads an output text file in blocks of rows, holding at most one block and one read chunk in memory.
+
+    Parameters
+    ----------
+    filePath : string
+        Filepath of the output text file.
+    blockRows : int, optional
+        Number of rows per block, e.g. the number of recorded patches to read one day of a LocalData file at a time.
+        The default is 65536.
+    partial : bool, optional
+        Whether to yield the last block if it has fewer rows. The default is True.
+
+    Yields
+    ------
+    numpy.ndarray
+        2D array of the rows of each block (the incomplete last line of a file being written is left out).
+    """
+    with compaction.openOutput(filePath) as f:
+        for i in range(0, headerLines):
+            f.readline()
+        dtype = outputparser.columnDtype(filePath)
+        pending = b""
+        for chunk in iter(lambda: f.read(min(chunkBytes, 1024 * 1024)), b""):
+            pending += chunk
+            newlines = np.flatnonzero(np.frombuffer(pending, dtype=np.uint8) == ord("\n"))
+            start = 0
+            for i in range(blockRows - 1, len(newlines), blockRows):
+                end = newlines[i] + 1
+                yield parseRows(pending[start:end], dtype)
+                start = end
+            pending = pending[start:]
+        end = pending.rfind(b"\n") + 1
+        if partial and end > 0:
+            yield parseRows(pending[:end], dtype)
+
+def iterFrames(localFile, numRecPats):
+    """ Yields the rows of each complete recorded day of a LocalData file in turn (see iterRows). """
+    return iterRows(localFile, numRecPats, partial=False)
+
+def summariseLocal(localFile, numRecPats):
+    """
+    Summarises a LocalData file day by day, reading one recorded day at a time.
+
+    Parameters
+    ----------
+    localFile : string
+        Filepath of the LocalData file.
+    numRecPats : int
+        Number of recorded patches.
+
+    Returns
+    -------
+    numpy.ndarray
+        One row per recorded day: day, number of patches with a population, total number of individuals
+        and drive allele frequency over all the recorded patches (0 if there is no population).
+    """
+    summary = []
+    for rows in iterFrames(localFile, numRecPats):
+        patchTotals = metrics.genotypeTotals(rows[:, 2:8])
+        total = np.sum(patchTotals, dtype=np.int64)
+        driveFreq = max(metrics.driveFrequency(np.sum(rows[:, 2:8], axis=0, dtype=np.int64)), 0) # no drive classes (negative) count as 0
+        summary.append([rows[0, 0], np.count_nonzero(patchTotals), total, driveFreq])
+    return np.array(summary).reshape(-1, 4)
+
+def classCube(localFile, numRecPats, progress=None, cancelled=None):
+    """
+    Computes the drive allele frequency colour class (see metrics.binIndices) of every patch on every recorded day
+    of a LocalData file, reading one recorded day at a time.
+
+    Parameters
+    ----------
+    localFile : string
+        Filepath of the LocalData file.
+    numRecPats : int
+        Number of recorded patches.
+    progress : function, optional
+        Called with (frames done, number of frames) after each recorded day. The default is None.
+    cancelled : function, optional
+        Returns whether to stop, checked before each recorded day. The default is None.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Day of each recorded day (numFrames,), and classes (numFrames, numRecPats). None if cancelled.
+    """
+    numFrames = frameIndex(localFile, numRecPats).numFrames()
+    days = np.zeros(numFrames, dtype=np.int64)
+    cube = np.zeros((numFrames, numRecPats), dtype=np.min_scalar_type(len(metrics.driveFreqBounds) - 2))
+    for t, rows in enumerate(iterFrames(localFile, numRecPats)):
+        if t >= numFrames: # day written since the index was built
+            break
+        if cancelled != None and cancelled():
+            return None
+        days[t] = rows[0, 0]
+        cube[t] = metrics.binIndices(metrics.driveFrequency(rows[:, 2:8]))
+        if progress != None:
+            progress(t + 1, numFrames)
+    return days, cube
+
+def readDays(totalsFile, firstDay, lastDay):
+    """
+    Reads the rows of a range of days from a Totals file (or any output file with one row per recorded day).
+
+    Parameters
+    ----------
+    totalsFile : string
+        Filepath of the Totals file.
+    firstDay : int
+        First day to read.
+    lastDay : int
+        Last day to read (inclusive).
+
+    Returns
+    -------
+    numpy.ndarray
+        2D array of the rows of the days recorded in the range.
+    """
+    index = frameIndex(totalsFile)
+    if index.numFrames() == 0:
+        return np.empty((0, 0))
+    start = index.frameStart(0)
+    interval = index.frameStart(1) - start if index.numFrames() > 1 else 1
+    interval = interval if interval > 0 else 1
+    first = int(np.ceil((firstDay - start) / interval))
+    last = int(np.floor((lastDay - start) / interval)) + 1
+    return index.readFrames(first, last)
+
+def frameIndex(filePath, blockRows=1):
+    """ Returns the FrameIndex of an output file, reusing it if the file hasn't changed since it was built. """
+    return dataCache.get(filePath, "frames{}".format(blockRows), lambda: FrameIndex(filePath, blockRows))
+
+def readFrame(filePath, blockRows, t):
+    """ Returns the rows of frame t (from 0) of an output file (see FrameIndex), reusing them if read before. """
+    return dataCache.get(filePath, "frame{}:{}".format(blockRows, t), lambda: frameIndex(filePath, blockRows).readFrame(t))
+
+
+class DataCache():
+    """
+    Process-wide cache of the arrays read from the output files, shared by all the plots. Entries are keyed by the file's
+    path, size and modification time (so a changed file is read again), and evicted least-recently-used first
+    once their total size is over a memory budget, or once there are too many memory-mapped arrays.
+    """
+    def __init__(self, maxBytes=512 * 1024**2, maxMaps=64):
+        """
+        Parameters
+        ----------
+        maxBytes : int, optional
+            Memory budget of the cached arrays (in bytes). The default is 512 MiB.
+        maxMaps : int, optional
+            Maximum number of cached memory-mapped arrays. These aren't charged to the memory budget, as their pages 
+            are only read in when used and can be dropped by the OS, but each one keeps a mapping of its file open. 
+            The default is 64.
+        """
+        self.maxBytes = maxBytes
+        self.maxMaps = maxMaps
+        self.entries = OrderedDict() # key -> (item, size), least recently used first
+        self.numBytes = 0
+        self.numMaps = 0
+        self.lock = threading.Lock() # plots can be prepared in background threads
+
+    def itemSize(self, item):
+        """ Returns the memory size of a cached item (array, or FrameIndex) in bytes (0 for a memory-mapped array). """
+        if isinstance(item, FrameIndex):
+            return item.offsets.nbytes
+        if isinstance(item, np.memmap):
+            return 0
+        return getattr(item, "nbytes", 0)
+
+    def get(self, filePath, kind, loader):
+        """
+        Parameters
+        ----------
+        filePath : string
+            Filepath of the output file.
+        kind : string
+            What is read from the file (e.g. "data", or a frame).
+        loader : function
+            Reads the item from the file if it isn't cached.
+
+        Returns
+        -------
+        Cached or newly read item.
+        """
+        filePath = compaction.sourcePath(filePath)
+        stat = os.stat(filePath)
+        key = (os.path.abspath(filePath), stat.st_size, stat.st_mtime_ns, kind)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key][0]
+        item = loader()
+        size = self.itemSize(item)
+        with self.lock:
+            if key not in self.entries and size <= self.maxBytes:
+                self.entries[key] = (item, size)
+                self.numBytes += size
+                self.numMaps += isinstance(item, np.memmap)
+                self.evict()
+        return item
+
+    def evict(self):
+        """ Removes the least recently used entries until the cache is within its memory budget and number of memory maps. """
+        while (self.numBytes > self.maxBytes or self.numMaps > self.maxMaps) and self.entries:
+            key, (item, size) = self.entries.popitem(last=False)
+            self.numBytes -= size
+            self.numMaps -= isinstance(item, np.memmap)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.numBytes = 0
+            self.numMaps = 0
+
+
+dataCache = DataCache()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:26:05 2026
+
+@author: biol0117
+"""
+
+# Fast parsing of the model's whitespace-separated numeric output files (Totals, LocalData and CoordinateList).
+# The whole body is read as bytes and converted in one vectorised pass, with integer dtypes for the count
+# columns, falling back to np.loadtxt for anything irregular. Has no Qt dependency.
+
+import numpy as np
+import compaction
+import io
+import os
+
+# dtype of the values of each output file format (by filename prefix): Totals and LocalData rows are all integers
+# (day, [patch,] genotype counts), CoordinateList rows have float coordinates. The per-patch counts of LocalData files
+# (the largest files) fit in int32, which halves their binary copies; whole-population Totals counts are kept as int64.
+formatDtypes = {"Totals": np.int64, "LocalData": np.int32, "CoordinateList": np.float64}
+
+def columnDtype(filePath):
+    """ Returns the dtype to parse an output file with, from its filename (float64 if not a known format). """
+    name = os.path.basename(filePath)
+    for prefix, dtype in formatDtypes.items():
+        if name.startswith(prefix):
+            return dtype
+    return np.float64
+
+def convert(data, numRows, numCols, dtype):
+    """ Converts whitespace-separated values (bytes) to a (numRows, numCols) array, or returns None if they don't fit that layout or dtype. """
+    try:
+        values = np.fromstring(data, dtype=dtype, sep=" ") # any whitespace separates values
+    except ValueError:
+        return None
+    if values.size != numRows * numCols: # parsing stops at the first value that isn't of the dtype
+        return None
+    return values.reshape(numRows, numCols)
+
+def narrow(rows, dtype):
+    """ Returns integer rows with a narrower integer dtype if all their values fit in it, otherwise unchanged. """
+    if rows.size != 0 and (rows.min() < np.iinfo(dtype).min or rows.max() > np.iinfo(dtype).max):
+        return rows
+    return rows.astype(dtype)
+
+def parseBytes(data, dtype=np.float64):
+    """
+    Parses the data lines of an output file. A last line with fewer values than the first (e.g. one the model
+    was still writing) is left out.
+
+    Parameters
+    ----------
+    data : bytes
+        Data lines (without header lines).
+    dtype : numpy dtype, optional
+        dtype of the values. Integer data that doesn't parse as integers is parsed as float64, and integers too large
+        for a narrower integer dtype as int64. The default is np.float64.
+
+    Returns
+    -------
+    numpy.ndarray
+        2D array of the rows.
+    """
+    firstLine = data[:data.find(b"\n")] if b"\n" in data else data
+    numCols = len(firstLine.split())
+    lastNewline = data.rfind(b"\n")
+    if lastNewline != -1 and len(data[lastNewline + 1:].split()) < numCols: # incomplete last line (e.g. still being written)
+        data = data[:lastNewline + 1]
+    numRows = data.count(b"\n") + (0 if data.endswith(b"\n") or len(data) == 0 else 1)
+    if numRows == 0 or numCols == 0:
+        return np.empty((0, numCols), dtype=dtype)
+    isNarrowInt = np.issubdtype(dtype, np.integer) and np.dtype(dtype).itemsize < 8
+    rows = convert(data, numRows, numCols, np.int64 if isNarrowInt else dtype) # narrower types would wrap around
+    if rows is not None and isNarrowInt:
+        rows = narrow(rows, dtype)
+    if rows is None and dtype != np.float64:
+        rows = convert(data, numRows, numCols, np.float64)
+    if rows is None: # irregular layout (e.g. blank lines), parse line by line
+        rows = np.loadtxt(io.BytesIO(data), ndmin=2)
+    return rows
+
+def parseFile(filePath, headerLines=2):
+    """
+    Parses a whole output file.
+
+    Parameters
+    ----------
+    filePath : string
+        Filepath of the Totals, LocalData or CoordinateList text file (or its compressed version).
+    headerLines : int, optional
+        Number of header lines to skip. The default is 2.
+
+    Returns
+    -------
+    numpy.ndarray
+        2D array of the data rows, with the dtype of the file format (see columnDtype).
+    """
+    with compaction.openOutput(filePath) as f: # decompressed while read if compressed
+        for i in range(0, headerLines):
+            f.readline()
+        data = f.read()
+    return parseBytes(data, columnDtype(filePath))
@@ -5,6 +5,8 @@ Created on Mon Jan  6 15:08:05 2025
 @author: biol0117
 """
 
+import csv
+
 class InputParams():
     """ Input parameters for the simulation, including the boundary and dispersal types and the advanced parameter filepaths."""
     def __init__(self, numRuns, maxT, numPat, muJ, muA, beta, theta, compPower, minDev, gamma, xi, e, driverStart, numDriverM,
@@ -132,4 +134,453 @@ class InputParams():
         self.boundaryType = boundaryType
         self.rainfallFile = rainfallFile
         self.coordsFile = coordsFile
-        self.relTimesFile = relTimesFile
\ No newline at end of file
+        self.relTimesFile = relTimesFile
+
+def paramSets():
+    """ 
+    Returns
+    -------
+    list:InputParams
+        The pre-defined parameter sets (set 1 is at index 0).
+    """
+    # set 1 - default
+    set1 = InputParams(
+            numRuns = 1, 
+            maxT = 1500,
+            numPat = 100,
+            muJ = 0.05,
+            muA = 0.125,
+            beta = 100.0,
+            theta = 9.0,
+            compPower = 0.066666667,
+            minDev = 10,
+            gamma = 0.025,
+            xi = 0.5,
+            e = 0.95,
+            driverStart = 200,
+            numDriverM = 1000,
+            numDriverSites = 1,
+            dispRate = 0.01,
+            maxDisp = 0.2,
+            psi = 0.0,
+            muAes = 0.0,
+            tHide1 = 0,
+            tHide2 = 0,
+            tWake1 = 0,
+            tWake2 = 0,
+            alpha0Mean = 100000.0,
+            alpha0Variance = 0.0,
+            alpha1 = 0.0,
+            amp = 0.0,
+            resp = 0.0,
+            recStart = 200,
+            recEnd = 1500,
+            recIntervalGlobal = 1,
+            recIntervalLocal = 365,
+            recSitesFreq = 1,
+            setLabel = 1,
+            dispType = "Radial",
+            boundaryType = "Toroid",
+            rainfallFile = None,
+            coordsFile = None,
+            relTimesFile = None
+            )
+    # set 2 - low fitness cost
+    set2 = InputParams(
+            numRuns = 1, 
+            maxT = 1500,
+            numPat = 100,
+            muJ = 0.05,
+            muA = 0.125,
+            beta = 100.0,
+            theta = 9.0,
+            compPower = 0.066666667,
+            minDev = 10,
+            gamma = 0.025,
+            xi = 0.3,
+            e = 0.95,
+            driverStart = 200,
+            numDriverM = 1000,
+            numDriverSites = 1,
+            dispRate = 0.01,
+            maxDisp = 0.2,
+            psi = 0.0,
+            muAes = 0.0,
+            tHide1 = 0,
+            tHide2 = 0,
+            tWake1 = 0,
+            tWake2 = 0,
+            alpha0Mean = 100000.0,
+            alpha0Variance = 0.0,
+            alpha1 = 0.0,
+            amp = 0.0,
+            resp = 0.0,
+            recStart = 200,
+            recEnd = 1500,
+            recIntervalGlobal = 1,
+            recIntervalLocal = 365,
+            recSitesFreq = 1,
+            setLabel = 2,
+            dispType = "Radial",
+            boundaryType = "Toroid",
+            rainfallFile = None,
+            coordsFile = None,
+            relTimesFile = None
+            )
+    # set 3 - high fitness cost
+    set3 = InputParams(
+            numRuns = 1, 
+            maxT = 1500,
+            numPat = 100,
+            muJ = 0.05,
+            muA = 0.125,
+            beta = 100.0,
+            theta = 9.0,
+            compPower = 0.066666667,
+            minDev = 10,
+            gamma = 0.025,
+            xi = 0.7,
+            e = 0.95,
+            driverStart = 200,
+            numDriverM = 1000,
+            numDriverSites = 1,
+            dispRate = 0.01,
+            maxDisp = 0.2,
+            psi = 0.0,
+            muAes = 0.0,
+            tHide1 = 0,
+            tHide2 = 0,
+            tWake1 = 0,
+            tWake2 = 0,
+            alpha0Mean = 100000.0,
+            alpha0Variance = 0.0,
+            alpha1 = 0.0,
+            amp = 0.0,
+            resp = 0.0,
+            recStart = 200,
+            recEnd = 1500,
+            recIntervalGlobal = 1,
+            recIntervalLocal = 365,
+            recSitesFreq = 1,
+            setLabel = 3,
+            dispType = "Radial",
+            boundaryType = "Toroid",
+            rainfallFile = None,
+            coordsFile = None,
+            relTimesFile = None
+            )
+    # set 4 - high number of release sites
+    set4 = InputParams(
+            numRuns = 1, 
+            maxT = 1500,
+            numPat = 100,
+            muJ = 0.05,
+            muA = 0.125,
+            beta = 100.0,
+            theta = 9.0,
+            compPower = 0.066666667,
+            minDev = 10,
+            gamma = 0.025,
+            xi = 0.5,
+            e = 0.95,
+            driverStart = 200,
+            numDriverM = 1000,
+            numDriverSites = 10,
+            dispRate = 0.01,
+            maxDisp = 0.2,
+            psi = 0.0,
+            muAes = 0.0,
+            tHide1 = 0,
+            tHide2 = 0,
+            tWake1 = 0,
+            tWake2 = 0,
+            alpha0Mean = 100000.0,
+            alpha0Variance = 0.0,
+            alpha1 = 0.0,
+            amp = 0.0,
+            resp = 0.0,
+            recStart = 200,
+            recEnd = 1500,
+            recIntervalGlobal = 1,
+            recIntervalLocal = 365,
+            recSitesFreq = 1,
+            setLabel = 4,
+            dispType = "Radial",
+            boundaryType = "Toroid",
+            rainfallFile = None,
+            coordsFile = None,
+            relTimesFile = None
+            )
+    # set 5 - low dispersal rate
+    set5 = InputParams(
+            numRuns = 1, 
+            maxT = 1500,
+            numPat = 100,
+            muJ = 0.05,
+            muA = 0.125,
+            beta = 100.0,
+            theta = 9.0,
+            compPower = 0.066666667,
+            minDev = 10,
+            gamma = 0.025,
+            xi = 0.5,
+            e = 0.95,
+            driverStart = 200,
+            numDriverM = 1000,
+            numDriverSites = 1,
+            dispRate = 0.002,
+            maxDisp = 0.2,
+            psi = 0.0,
+            muAes = 0.0,
+            tHide1 = 0,
+            tHide2 = 0,
+            tWake1 = 0,
+            tWake2 = 0,
+            alpha0Mean = 100000.0,
+            alpha0Variance = 0.0,
+            alpha1 = 0.0,
+            amp = 0.0,
+            resp = 0.0,
+            recStart = 200,
+            recEnd = 1500,
+            recIntervalGlobal = 1,
+            recIntervalLocal = 365,
+            recSitesFreq = 1,
+            setLabel = 5,
+            dispType = "Radial",
+            boundaryType = "Toroid",
+            rainfallFile = None,
+            coordsFile = None,
+            relTimesFile = None
+            )
+    # set 6 - high dispersal rate
+    set6 = InputParams(
+            numRuns = 1, 
+            maxT = 1500,
+            numPat = 100,
+            muJ = 0.05,
+            muA = 0.125,
+            beta = 100.0,
+            theta = 9.0,
+            compPower = 0.066666667,
+            minDev = 10,
+            gamma = 0.025,
+            xi = 0.5,
+            e = 0.95,
+            driverStart = 200,
+            numDriverM = 1000,
+            numDriverSites = 1,
+            dispRate = 0.05,
+            maxDisp = 0.2,
+            psi = 0.0,
+            muAes = 0.0,
+            tHide1 = 0,
+            tHide2 = 0,
+            tWake1 = 0,
+            tWake2 = 0,
+            alpha0Mean = 100000.0,
+            alpha0Variance = 0.0,
+            alpha1 = 0.0,
+            amp = 0.0,
+            resp = 0.0,
+            recStart = 200,
+            recEnd = 1500,
+            recIntervalGlobal = 1,
+            recIntervalLocal = 365,
+            recSitesFreq = 1,
+            setLabel = 6,
+            dispType = "Radial",
+            boundaryType = "Toroid",
+            rainfallFile = None,
+            coordsFile = None,
+            relTimesFile = None
+            )
+     
+    return [set1, set2, set3, set4, set5, set6]
+
+def paramsInfo():
+    """
+    Returns
+    -------
+    InputParams
+        (name, description) tuple of each parameter, as shown in the GUI.
+    """
+    return InputParams(
+            numRuns = ("no. of replicates", "Number of simulation replicates to run."), 
+            maxT = ("simulation time", "Maximum simulated time (in days)."),
+            numPat = ("no. of patches", "Number of population sites chosen for the simulation."),
+            muJ = ("juvenile mortality rate", "Juvenile density independent mortality rate per day."),
+            muA = ("adult mortality rate", "Adult mortality rate per day."),
+            beta = ("mating rate factor", "Number of males in a patch when local females mate with probability ½ per day."),
+            theta = ("egg laying rate", "Average egg laying rate of wildtype females (eggs per day)."),
+            compPower = ("juvenile survival factor", "Parameter that controls the juvenile survival probability."),
+            minDev = ("juvenile min. development time", "Minimum development time for a juvenile (in days)."),
+            gamma = ("resistance formation rate", "Rate of r2 allele formation from W/D meiosis."),
+            xi = ("fitness cost", "Somatic Cas9 expression fitness cost."),
+            e = ("homing rate", "Homing rate in females."),
+            driverStart = ("release time", "Time to start releasing drive alleles into the mosquito population."),
+            numDriverM = ("release size", "Number of drive heterozygous (WD) male mosquitoes per release."),
+            numDriverSites = ("no. of release patches", "Number of gene drive release sites per year."),
+            dispRate = ("dispersal rate", "Adult dispersal rate."),
+            maxDisp = ("max. dispersal distance", "Maximum dispersal distance at which two sites are connected."),
+            psi = ("aestivation rate", "Aestivation rate."),
+            muAes = ("aestivation mortality", "Aestivation mortality rate."),
+            tHide1 = ("start hiding date", "Start day of aestivation-hiding period (exclusive)."),
+            tHide2 = ("end hiding date", "End day of aestivation-hiding period (inclusive)."),
+            tWake1 = ("start waking date", "Start day of aestivation-waking period (exclusive)."),
+            tWake2 = ("end waking date", "End day of aestivation-waking period (inclusive)."),
+            alpha0Mean = ("population size factor", "Mean of the baseline contribution to the carrying capacity."),
+            alpha0Variance = ("population size variance", "Variance of the baseline contribution to the carrying capacity."),
+            alpha1 = ("rainfall contribution\nto population size", "Rainfall contribution factor to carrying capacity."),
+            amp = ("rainfall seasonality", "Amplitude of rainfall fluctuations."),
+            resp = ("responsiveness to rainfall", "Carrying capacity's responsiveness to rainfall contribution."),
+            recStart = ("output start (full data)", "Start time for the full data recording window. Has been set equal to the release time."),
+            recEnd = ("output end (full data)", "End time for the full data recording window. Has been set equal to the simulation time."),
+            recIntervalGlobal = ("output frequency (summary data)", "Time interval for summary data recording. Has been set to 1."),
+            recIntervalLocal = ("output frequency (full data)", "Time interval at which to collect/record local data (in days). A low value produces higher temporal resolution data though will result in larger output file sizes."),
+            recSitesFreq = ("local site freq.", "Fraction of sites to collect local data for (1 is all sites. 10 is 1 in 10 etc). Has been set to 1."),
+            setLabel = ("simulation label", "'Set of repetitions' index label for output files."),
+            dispType = ("dispersal type", ""),
+            boundaryType = ("boundary type", ""),
+            rainfallFile = ("rainfall file", ""),
+            coordsFile = ("patch coordinates file", ""),
+            relTimesFile = ("release times file", "")
+            )
+
+def readProgramParamsFile(filePath, dispType="Radial", boundaryType="Toroid", rainfallFile=None, coordsFile=None, relTimesFile=None):
+    """
+    Reads a model program parameter file ("params.txt") into a parameter set.
+    The dispersal and boundary types and the advanced parameter files are not part of the file so are given separately.
+
+    Parameters
+    ----------
+    filePath : Path
+        Path to the params.txt file.
+    dispType : string, optional
+        Dispersal type. Options: "Distance kernel", "Radial". The default is "Radial".
+    boundaryType : string, optional
+        Boundary type. Options: "Toroid", "Edge". The default is "Toroid".
+    rainfallFile : string, optional
+        Absolute filepath of the rainfall file. The default is None.
+    coordsFile : string, optional
+        Absolute filepath of the coordinates file. The default is None.
+    relTimesFile : string, optional
+        Absolute filepath of the release times file. The default is None.
+
+    Returns
+    -------
+    InputParams
+    """
+    with open(filePath, "r") as file:
+        values = [line.strip() for line in file if line.strip() != ""]
+    if len(values) != 34:
+        raise ValueError("{} should have 34 parameter values, found {}.".format(filePath, len(values)))
+    
+    ints = [0, 1, 2, 8, 12, 13, 14, 19, 20, 21, 22, 28, 29, 30, 31, 32, 33] # integer parameters by line
+    values = [int(float(v)) if i in ints else float(v) for i, v in enumerate(values)]
+    return InputParams(*values, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile)
+
+def createProgramParamsFile(outputDir, paramSet):
+    """
+    Creates the model program's parameter file ("params.txt") in the given directory.
+
+    Parameters
+    ----------
+    outputDir : Path
+        Absolute path to the simulation output directory.
+    paramSet : InputParams
+        Parameter set to write.
+    """
+    filePath = outputDir / "params.txt"
+    with open(filePath, "w") as file:
+        file.write(str(paramSet.numRuns) + "\n")
+        file.write(str(paramSet.maxT) + "\n")
+        file.write(str(paramSet.numPat) + "\n")
+        file.write(str(paramSet.muJ) + "\n")
+        file.write(str(paramSet.muA) + "\n")
+        file.write(str(paramSet.beta) + "\n")
+        file.write(str(paramSet.theta) + "\n")
+        file.write(str(paramSet.compPower) + "\n")
+        file.write(str(paramSet.minDev) + "\n")
+        file.write(str(paramSet.gamma) + "\n")
+        file.write(str(paramSet.xi) + "\n")
+        file.write(str(paramSet.e) + "\n")
+        file.write(str(paramSet.driverStart) + "\n")
+        file.write(str(paramSet.numDriverM) + "\n")
+        file.write(str(paramSet.numDriverSites) + "\n")
+        file.write(str(paramSet.dispRate) + "\n")
+        file.write(str(paramSet.maxDisp) + "\n")
+        file.write(str(paramSet.psi) + "\n")
+        file.write(str(paramSet.muAes) + "\n")
+        file.write(str(paramSet.tHide1) + "\n")
+        file.write(str(paramSet.tHide2) + "\n")
+        file.write(str(paramSet.tWake1) + "\n")
+        file.write(str(paramSet.tWake2) + "\n")
+        file.write(str(paramSet.alpha0Mean) + "\n")
+        file.write(str(paramSet.alpha0Variance) + "\n")
+        file.write(str(paramSet.alpha1) + "\n")
+        file.write(str(paramSet.amp) + "\n")
+        file.write(str(paramSet.resp) + "\n")
+        file.write(str(paramSet.recStart) + "\n")
+        file.write(str(paramSet.recEnd) + "\n")
+        file.write(str(paramSet.recIntervalGlobal) + "\n")
+        file.write(str(paramSet.recIntervalLocal) + "\n")
+        file.write(str(paramSet.recSitesFreq) + "\n")
+        file.write(str(paramSet.setLabel) + "\n")
+        
+def createUserParamsFile(outputDir, paramSet, info):
+    """
+    Creates the descriptive parameter spreadsheet ("paramsInfo.csv") in the given directory.
+
+    Parameters
+    ----------
+    outputDir : Path
+        Absolute path to the simulation output directory.
+    paramSet : InputParams
+        Parameter set to write.
+    info : InputParams
+        (name, description) tuple of each parameter.
+    """
+    filePath = outputDir / "paramsInfo.csv"
+    with open(filePath, 'w', newline='') as csvfile:
+        fw = csv.writer(csvfile, delimiter=',', quotechar='|', quoting=csv.QUOTE_MINIMAL)
+        fw.writerow(["Parameter name", "Program equivalent", "Value", "Description"])
+        fw.writerow([info.numRuns[0], "num_runs", str(paramSet.numRuns), info.numRuns[1]])
+        fw.writerow([info.maxT[0], "max_t", str(paramSet.maxT), info.maxT[1]])
+        fw.writerow([info.numPat[0], "num_pat", str(paramSet.numPat), info.numPat[1]])
+        fw.writerow([info.muJ[0], "mu_j", str(paramSet.muJ), info.muJ[1]])
+        fw.writerow([info.muA[0], "mu_a", str(paramSet.muA), info.muA[1]])
+        fw.writerow([info.beta[0], "beta", str(paramSet.beta), info.beta[1]])
+        fw.writerow([info.theta[0], "theta", str(paramSet.theta), info.theta[1]])
+        fw.writerow([info.compPower[0], "comp_power", str(paramSet.compPower), info.compPower[1]])
+        fw.writerow([info.minDev[0], "min_dev", str(paramSet.minDev), info.minDev[1]])
+        fw.writerow([info.gamma[0], "gamma", str(paramSet.gamma), info.gamma[1]])
+        fw.writerow([info.xi[0], "xi", str(paramSet.xi), info.xi[1]])
+        fw.writerow([info.e[0], "e", str(paramSet.e), info.e[1]])
+        fw.writerow([info.driverStart[0], "driver_start", str(paramSet.driverStart), info.driverStart[1]])
+        fw.writerow([info.numDriverM[0], "num_driver_M", str(paramSet.numDriverM), info.numDriverM[1]])
+        fw.writerow([info.numDriverSites[0], "num_driver_sites", str(paramSet.numDriverSites), info.numDriverSites[1]])
+        fw.writerow([info.dispRate[0], "disp_rate", str(paramSet.dispRate), info.dispRate[1]])
+        fw.writerow([info.maxDisp[0], "max_disp", str(paramSet.maxDisp), info.maxDisp[1]])
+        fw.writerow([info.psi[0], "psi", str(paramSet.psi), info.psi[1]])
+        fw.writerow([info.muAes[0], "mu_aes", str(paramSet.muAes), info.muAes[1]])
+        fw.writerow([info.tHide1[0], "t_hide1", str(paramSet.tHide1), info.tHide1[1]])
+        fw.writerow([info.tHide2[0], "t_hide2", str(paramSet.tHide2), info.tHide2[1]])
+        fw.writerow([info.tWake1[0], "t_wake1", str(paramSet.tWake1), info.tWake1[1]])
+        fw.writerow([info.tWake2[0], "t_wake2", str(paramSet.tWake2), info.tWake2[1]])
+        fw.writerow([info.alpha0Mean[0], "alpha0_mean", str(paramSet.alpha0Mean), info.alpha0Mean[1]])
+        fw.writerow([info.alpha0Variance[0], "alpha0_variance", str(paramSet.alpha0Variance), info.alpha0Variance[1]])
+        fw.writerow([info.alpha1[0], "alpha1", str(paramSet.alpha1), info.alpha1[1]])
+        fw.writerow([info.amp[0], "amp", str(paramSet.amp), info.amp[1]])
+        fw.writerow([info.resp[0], "resp", str(paramSet.resp), info.resp[1]])
+        fw.writerow([info.recStart[0], "rec_start", str(paramSet.recStart), info.recStart[1]])
+        fw.writerow([info.recEnd[0], "rec_end", str(paramSet.recEnd), info.recEnd[1]])
+        fw.writerow([info.recIntervalGlobal[0], "rec_interval_global", str(paramSet.recIntervalGlobal), info.recIntervalGlobal[1]])
+        fw.writerow([info.recIntervalLocal[0], "rec_interval_local", str(paramSet.recIntervalLocal), info.recIntervalLocal[1]])
+        fw.writerow([info.recSitesFreq[0], "rec_sites_freq", str(paramSet.recSitesFreq), info.recSitesFreq[1]])
+        fw.writerow([info.setLabel[0], "set_label", str(paramSet.setLabel), info.setLabel[1]])
+        fw.writerow([info.dispType[0], "", str(paramSet.dispType), info.dispType[1]])
+        fw.writerow([info.boundaryType[0], "", str(paramSet.boundaryType), info.boundaryType[1]])
+        fw.writerow([info.rainfallFile[0], "", "None" if paramSet.rainfallFile==None else str(paramSet.rainfallFile), info.rainfallFile[1]])
+        fw.writerow([info.coordsFile[0], "", "None" if paramSet.coordsFile==None else str(paramSet.coordsFile), info.coordsFile[1]])
+        fw.writerow([info.relTimesFile[0], "", "None" if paramSet.relTimesFile==None else str(paramSet.relTimesFile), info.relTimesFile[1]])
@@ -11,6 +11,51 @@ import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 from PyQt5.QtWidgets import QSizePolicy
 import numpy as np
+import outputdata
+import metrics
+
+# axes and colorbar positions of animations, fixed so that the frames line up
+animAxesPosition = [0.1, 0.1, 0.65, 0.85]
+animColorbarPosition = [0.80, 0.1, 0.04, 0.85]
+
+def addDriveFreqColorbar(fig, axes):
+    """
+    Adds the drive allele frequency colorbar of the local plots to a figure.
+
+    Returns
+    -------
+    (matplotlib.colors.ListedColormap, matplotlib.colors.BoundaryNorm, matplotlib.colorbar.Colorbar)
+        Colour map and norm to colour the patches with, and the colorbar.
+    """
+    mainCmap = ['aquamarine', 'mediumturquoise', 'darkcyan','steelblue', 'royalblue', 'mediumblue', 'slateblue', 'darkviolet', 'indigo', 'black']
+    allColours = ['darkgray', 'lightsalmon'] + mainCmap # add colours for no-population patch and wild-population patch
+    cmap = mcolors.ListedColormap(allColours)
+    cnorm = mcolors.BoundaryNorm(metrics.driveFreqBounds, cmap.N)
+    sm = plt.cm.ScalarMappable(cmap=cmap, norm=cnorm) # dummy scalar mappable for the colorbar
+    sm.set_array([])  # set to an empty array to avoid plotting data
+    colorbar = fig.colorbar(sm, ax=axes)
+    colorbar.set_label('Drive allele frequency', labelpad=-10) # reduce distance to colorbar label
+    colorbar.ax.set_yticks([-2, -1, 0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
+        labels=['no pop', 'wild', '0.0', '0.1', '0.2', '0.3', '0.4', '0.5', '0.6', '0.7', '0.8', '0.9', '1.0'])
+    labels = colorbar.ax.get_yticklabels()
+    labels[0].set_verticalalignment('bottom') # align first label text above the tick 
+    labels[1].set_verticalalignment('bottom')
+    return cmap, cnorm, colorbar
+
+def addAnnotation(fig):
+    """ Adds the timestamp annotation of the local plots to a figure. """
+    return fig.text(x=0.1, y=0.97, s='t = ')
+
+def setScatterLimits(axes, x, y):
+    """ Fits the axes limits to scatter points (with a margin for a single point). """
+    if len(x) == 1:
+        axes.set_xlim(x - x/2, x + x/2)
+    else:
+        axes.set_xlim(np.amin(x), np.amax(x))
+    if len(y) == 1:
+        axes.set_ylim(y - y/2, y + y/2)
+    else:
+        axes.set_ylim(np.amin(y), np.amax(y))
 
 class PlotCanvas(FigureCanvas):
     """Creates a plot figure. """
@@ -39,22 +84,9 @@ class PlotCanvas(FigureCanvas):
         
         # for local - drive allele freq plots
         if colorbar:
-            mainCmap = ['aquamarine', 'mediumturquoise', 'darkcyan','steelblue', 'royalblue', 'mediumblue', 'slateblue', 'darkviolet', 'indigo', 'black']
-            allColours = ['darkgray', 'lightsalmon'] + mainCmap # add colours for no-population patch and wild-population patch
-            self.cmap = mcolors.ListedColormap(allColours)
-            bounds = [-2, -1, 0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
-            self.cnorm = mcolors.BoundaryNorm(bounds, self.cmap.N)
-            self.sm = plt.cm.ScalarMappable(cmap=self.cmap, norm=self.cnorm) # dummy scalar mappable for the colorbar
-            self.sm.set_array([])  # set to an empty array to avoid plotting data
-            self.colorbar = self.fig.colorbar(self.sm, ax=self.axes)
-            self.colorbar.set_label('Drive allele frequency', labelpad=-10) # reduce distance to colorbar label
-            self.colorbar.ax.set_yticks([-2, -1, 0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
-                labels=['no pop', 'wild', '0.0', '0.1', '0.2', '0.3', '0.4', '0.5', '0.6', '0.7', '0.8', '0.9', '1.0'])
-            labels = self.colorbar.ax.get_yticklabels()
-            labels[0].set_verticalalignment('bottom') # align first label text above the tick 
-            labels[1].set_verticalalignment('bottom')
+            self.cmap, self.cnorm, self.colorbar = addDriveFreqColorbar(self.fig, self.axes)
         if annot:
-            self.annotation = self.fig.text(x=0.1, y=0.97, s='t = ')
+            self.annotation = addAnnotation(self.fig)
         
         FigureCanvas.__init__(self, self.fig)
         self.setParent(parent)
@@ -74,9 +106,9 @@ class PlotCanvas(FigureCanvas):
             self.fig.set_tight_layout(True)
         else:
             self.fig.set_tight_layout(False)
-            self.axes.set_position([0.1, 0.1, 0.65, 0.85]) # fix axes position for animations
+            self.axes.set_position(animAxesPosition) # fix axes position for animations
             if self.colorbar != None:
-                self.colorbar.ax.set_position([0.80, 0.1, 0.04, 0.85])
+                self.colorbar.ax.set_position(animColorbarPosition)
 
     def setMode(self, mode):
         """  
@@ -120,8 +152,11 @@ class PlotCanvas(FigureCanvas):
         self.axes.legend() # creates a legend for each curve
         self.draw() # draws the curve(s) on the canvas
         
-class TotalsGenPlotCanvas(PlotCanvas):
-    """ Creates a plot figure of total males across the simulation area, classed by genotype. """
+class TotalsPlotCanvas(PlotCanvas):
+    """ 
+    Base for the plot figures of totals across the simulation area. Besides the static plot of a Totals file, 
+    has a live mode that follows the Totals file of a running simulation, updating its lines in place as rows are appended.
+    """
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         """
         Parameters
@@ -136,7 +171,31 @@ class TotalsGenPlotCanvas(PlotCanvas):
             Figure dpi (resolution in dots-per-inch). The default is 100.
         """
         super().__init__(parent, width, height, dpi)
-         
+        self.ylabel = ""
+        self.liveLines = None # line artists by line index while in live mode
+        self.liveRows = np.empty((0, 7)) # buffer of the rows received in live mode
+        self.numLiveRows = 0
+
+    def lineStyle(self, line):
+        """ Returns the (label, colour) of a line index. """
+        return ("", "mediumturquoise")
+
+    def lineValues(self, totals, line):
+        """
+        Parameters
+        ----------
+        totals : numpy.ndarray
+            Totals file rows (day, WW, WD, DD, WR, RR, DR).
+        line : int
+            Line index.
+
+        Returns
+        -------
+        numpy.ndarray
+            y values of the line for each row.
+        """
+        return totals[:, 1]
+
     def plot(self, file, lines:list): # sets variables of function (have to be lists)
         """
         Plots the selected lines on the canvas from the data file.
@@ -150,56 +209,87 @@ class TotalsGenPlotCanvas(PlotCanvas):
         -------
         None.
         """
-    
+        self.liveLines = None
         self.axes.clear() # clears plot on the plot canvas before plotting the new curve(s)
-        totals = np.loadtxt(file, skiprows=2, ndmin=2)
+        totals = outputdata.loadArray(file)
         times = totals[0:, 0] 
-        total_males = totals[0:, 1:]
         for line in lines:  # keep same colours for same type of line
-            lbl = ""
-            col = "mediumturquoise"
-            
-            if line == 0:
-                lbl = "$M_{WW}$"
-                col = "mediumturquoise"
-            elif line == 1:
-                lbl = "$M_{WD}$"
-                col = "darkcyan"
-            elif line == 2:
-                lbl = "$M_{DD}$"
-                col = "royalblue"
-            elif line == 3:
-                lbl = "$M_{WR}$"
-                col = "slategray"
-            elif line == 4:
-                lbl = "$M_{RR}$"
-                col = "rebeccapurple"
-            elif line == 5:
-                lbl = "$M_{DR}$"
-                col = "darkviolet"
-            elif line == 6:
-                lbl = "$M_{WW}$+$M_{WD}$+\n$M_{DD}$+$M_{WR}$+\n$M_{RR}$+$M_{DR}$"
-                col = "black"
-            elif line == 7:
-                lbl = "$M_{WW}$+$M_{WD}$+\n$M_{WR}$"
-                col = "hotpink"
-            
-            y = []
-            if line == 6:
-                y = np.sum(total_males, axis=1).tolist()
-            if line == 7:
-                y = np.sum(total_males[:, (0, 1, 3)], axis=1).tolist()
-            if line >= 0 and line < 6:
-                y = total_males[:, line]
-            self.axes.plot(times, y, label=lbl, color=col) 
+            lbl, col = self.lineStyle(line)
+            self.axes.plot(times, self.lineValues(totals, line), label=lbl, color=col) 
      
         self.axes.set_xlabel("Day")
-        self.axes.set_ylabel("Total number of individuals")
+        self.axes.set_ylabel(self.ylabel)
         self.axes.legend() 
         self.draw() # draws the curve(s) on the canvas
+
+    def startLive(self, lines:list):
+        """
+        Starts live mode with no rows: clears the canvas and creates empty artists for the selected lines.
+
+        Parameters
+        ----------
+        lines : list of the selected lines
+        """
+        self.numLiveRows = 0
+        self.setLiveLines(lines)
+
+    def setLiveLines(self, lines:list):
+        """
+        Replaces the live artists with the selected lines, keeping the rows received so far.
+
+        Parameters
+        ----------
+        lines : list of the selected lines
+        """
+        self.axes.clear()
+        self.liveLines = {}
+        for line in lines:
+            lbl, col = self.lineStyle(line)
+            self.liveLines[line] = self.axes.plot([], [], label=lbl, color=col)[0]
+        self.axes.set_xlabel("Day")
+        self.axes.set_ylabel(self.ylabel)
+        if len(lines) != 0:
+            self.axes.legend()
+        self.updateLive()
+
+    def appendRows(self, rows):
+        """
+        Adds rows received in live mode and updates the lines in place.
+
+        Parameters
+        ----------
+        rows : numpy.ndarray
+            New Totals file rows (day, WW, WD, DD, WR, RR, DR).
+        """
+        if self.liveLines == None or len(rows) == 0:
+            return
+        numRows = self.numLiveRows + len(rows)
+        if numRows > len(self.liveRows): # grow the buffer geometrically, so appending stays cheap for long runs
+            buffer = np.empty((max(numRows, 2 * len(self.liveRows)), self.liveRows.shape[1]))
+            buffer[:self.numLiveRows] = self.liveRows[:self.numLiveRows]
+            self.liveRows = buffer
+        self.liveRows[self.numLiveRows:numRows] = rows[:, :self.liveRows.shape[1]]
+        self.numLiveRows = numRows
+        self.updateLive()
+
+    def updateLive(self):
+        """ Sets the data of the live artists from the rows received and schedules a redraw. """
+        totals = self.liveRows[:self.numLiveRows]
+        for line, artist in self.liveLines.items():
+            artist.set_data(totals[:, 0], self.lineValues(totals, line))
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.draw_idle() # redrawn once control returns to the event loop
+
+    def stopLive(self):
+        """ Leaves live mode, keeping the lines drawn so far. """
+        self.liveLines = None
+
+    def isLive(self):
+        return self.liveLines != None
+
         
-        
-class TotalsAllelePlotCanvas(PlotCanvas):
+class TotalsGenPlotCanvas(TotalsPlotCanvas):
     """ Creates a plot figure of total males across the simulation area, classed by genotype. """
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         """
@@ -215,77 +305,89 @@ class TotalsAllelePlotCanvas(PlotCanvas):
             Figure dpi (resolution in dots-per-inch). The default is 100.
         """
         super().__init__(parent, width, height, dpi)
-         
-    def plot(self, file, lines:list): # sets variables of function (have to be lists)
-        """
-        Plots the selected lines on the canvas from the data file.
+        self.ylabel = "Total number of individuals"
 
+    def lineStyle(self, line):
+        """ Returns the (label, colour) of a line index. """
+        lbl = ""
+        col = "mediumturquoise"
+        
+        if line == 0:
+            lbl = "$M_{WW}$"
+            col = "mediumturquoise"
+        elif line == 1:
+            lbl = "$M_{WD}$"
+            col = "darkcyan"
+        elif line == 2:
+            lbl = "$M_{DD}$"
+            col = "royalblue"
+        elif line == 3:
+            lbl = "$M_{WR}$"
+            col = "slategray"
+        elif line == 4:
+            lbl = "$M_{RR}$"
+            col = "rebeccapurple"
+        elif line == 5:
+            lbl = "$M_{DR}$"
+            col = "darkviolet"
+        elif line == 6:
+            lbl = "$M_{WW}$+$M_{WD}$+\n$M_{DD}$+$M_{WR}$+\n$M_{RR}$+$M_{DR}$"
+            col = "black"
+        elif line == 7:
+            lbl = "$M_{WW}$+$M_{WD}$+\n$M_{WR}$"
+            col = "hotpink"
+        return (lbl, col)
+
+    def lineValues(self, totals, line):
+        """ Returns the y values of a line index for each row (see TotalsPlotCanvas.lineValues). """
+        total_males = totals[:, 1:7]
+        if line == 6:
+            return metrics.genotypeTotals(total_males)
+        if line == 7:
+            return metrics.transmissionTotals(total_males)
+        return total_males[:, line]
+        
+        
+class TotalsAllelePlotCanvas(TotalsPlotCanvas):
+    """ Creates a plot figure of total males across the simulation area, classed by genotype. """
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        """
         Parameters
         ----------
-        file : os.path for totals data file
-        lines : list of the selected lines
-
-        Returns
-        -------
-        None.
+        parent : TYPE, optional
+            DESCRIPTION. The default is None.
+        width : float, optional
+            Figure width (inches). The default is 5.
+        height : float, optional
+            Figure height (inches). The default is 4.
+        dpi : float, optional
+            Figure dpi (resolution in dots-per-inch). The default is 100.
         """
-    
-        self.axes.clear() # clears plot on the plot canvas before plotting the new curve(s)
-        totals = np.loadtxt(file, skiprows=2, ndmin=2)
-        times = totals[0:, 0]
-        total_males = totals[0:, 1:]
-        WW = total_males[:, 0]
-        WD = total_males[:, 1]
-        DD = total_males[:, 2]
-        WR = total_males[:, 3]
-        RR = total_males[:, 4]
-        DR = total_males[:, 5]
+        super().__init__(parent, width, height, dpi)
+        self.ylabel = "Allele frequency"
+
+    def lineStyle(self, line):
+        """ Returns the (label, colour) of a line index. """
+        lbl = ""
+        col = "mediumturquoise"
         
-        for line in lines:  # keep same colours for same type of line
-            lbl = ""
-            col = "mediumturquoise"
-            
-            if line == 0:
-                lbl = "wild"
-                col = "hotpink"
-            elif line == 1:
-                lbl = "drive"
-                col = "royalblue"
-            elif line == 2:
-                lbl = "r2 (non-functional) resistance"
-                col = "rebeccapurple"
-            
-            y = []
-            for i in range(0, len(WW)):
-                bottom = WW[i] + WD[i] + DD[i] + WR[i] + RR[i] + DR[i]
-                if line == 0:
-                    top = WW[i] + WD[i] + WR[i]
-                    if bottom == 0:
-                        result = 0
-                    else:
-                        result = top / bottom
-                    y.append(result)
-                if line == 1:
-                    top = WD[i] + DD[i] + DR[i]
-                    if bottom == 0:
-                        result = 0
-                    else:
-                        result = top / bottom
-                    y.append(result)
-                if line == 2:
-                    top = WR[i] + RR[i] + DR[i]
-                    if bottom == 0:
-                        result = 0
-                    else:
-                        result = top / bottom
-                    y.append(result)
-            self.axes.plot(times, y, label=lbl, color=col) 
-     
-        self.axes.set_xlabel("Day")
-        self.axes.set_ylabel("Allele frequency")
-        self.axes.legend() 
-        self.draw() # draws the curve(s) on the canvas        
+        if line == 0:
+            lbl = "wild"
+            col = "hotpink"
+        elif line == 1:
+            lbl = "drive"
+            col = "royalblue"
+        elif line == 2:
+            lbl = "r2 (non-functional) resistance"
+            col = "rebeccapurple"
+        return (lbl, col)
+
+    def lineValues(self, totals, line):
+        """ Returns the y values of a line index for each row (see TotalsPlotCanvas.lineValues). """
+        # wild, drive and resistance frequencies (0 where there is no population)
+        return metrics.alleleFrequencies(totals[:, 1:7])[:, line]
         
+
 class CoordsPlotCanvas(PlotCanvas):
     """ Creates a plot figure of coordinate points. """
     def __init__(self, parent=None, width=5, height=4, dpi=100):
@@ -316,18 +418,11 @@ class CoordsPlotCanvas(PlotCanvas):
         None.
         """
         self.axes.clear() 
-        data = np.loadtxt(file, skiprows=2, ndmin=2)
+        data = outputdata.loadArray(file)
         x = data[:, 1]
         y = data[:, 2]
         self.axes.scatter(x, y, marker='.', color="peru")
-        if len(x) == 1:
-            self.axes.set_xlim(x - x/2, x + x/2)
-        else:
-            self.axes.set_xlim(np.amin(x), np.amax(x))
-        if len(y) == 1:
-            self.axes.set_ylim(y - y/2, y + y/2)
-        else:
-            self.axes.set_ylim(np.amin(y), np.amax(y))
+        setScatterLimits(self.axes, x, y)
         self.axes.set_xlabel("x")
         self.axes.set_ylabel("y")
         self.draw()
@@ -351,6 +446,12 @@ class LocalPlotCanvas(PlotCanvas):
         # have booleans so can still reuse PlotCanvas class for different cases
         super().__init__(parent, width, height, dpi, colorbar=True, annot=True) 
         self.scat = None
+        self.numFrames = 0
+        self.recStart = 0
+        self.recIntervalLocal = 0
+        self.animating = False
+        self.background = None # canvas without the animated artists, restored before each animation frame is drawn
+        self.mpl_connect('draw_event', self.onDraw)
         
     def getFig(self):
         """
@@ -361,68 +462,153 @@ class LocalPlotCanvas(PlotCanvas):
 
         """
         return self.fig
-        
-    def plot(self, t, coordsFile, localFile, recStart): 
+    
+    def setupPlot(self, coordsFile, localFile, recStart):
         """
-        Scatter plots the points from the coords data file with a color map of the drive allele frequency.
+        Creates the scatter of the patches (with no colours yet) and reads the recorded days of the local data file.
 
         Parameters
         ----------
-        t : int, timestep (starting from 0, index of data row on local file)
         coordsFile : os.path for coords data file
         localFile : os.path for local data file
         recStart: int, start time for recording local data
-
+        
         Returns
         -------
-        scat : matplotlib.collections.PathCollection (scatter points)
+        int
+            Number of recorded days (frames) in the local data file.
         """
         self.axes.clear() 
-        ind, x, y = np.loadtxt(coordsFile, skiprows=2, ndmin=2, unpack=True)
-        numRecPats = len(x) 
-        localData = np.loadtxt(localFile, skiprows=2, ndmin=2) # get populations 
+        ind, x, y = outputdata.loadArray(coordsFile)[:, 0:3].T
+        self.numRecPats = len(x) 
+        self.localFile = localFile
+        self.recStart = recStart
+        self.frames = outputdata.frameIndex(localFile, self.numRecPats) # one frame per recorded day, read on its own
         
-        if len(localData) > numRecPats:
-            recIntervalLocal = int(localData[numRecPats, 0]) - int(localData[0, 0])
+        # runs stopped early have fewer recorded days than the slider range
+        self.numFrames = self.frames.numFrames()
+        if self.numFrames > 1:
+            self.recIntervalLocal = int(self.frames.frameStart(1)) - int(self.frames.frameStart(0))
         else:
-            recIntervalLocal = 0
-        self.simDay = int(localData[t*numRecPats, 0]) # get populations on one day, t+1 because always ignore initialisation day
-        localDataDay = localData[t*numRecPats:((t+1)*numRecPats), 2:8]
-
-        WW = localDataDay[:, 0]
-        WD = localDataDay[:, 1]
-        DD = localDataDay[:, 2]
-        WR = localDataDay[:, 3]
-        RR = localDataDay[:, 4]
-        DR = localDataDay[:, 5]
-
-        # calculate drive allele frequency for each patch
-        driveFreq = np.zeros(numRecPats)
-        for pat in range(0, numRecPats):
-            tot = WW[pat] + WD[pat] + DD[pat] + WR[pat] + RR[pat] + DR[pat]
-            if tot == 0:
-                driveFreq[pat] = -2 # assign different distinguishable value for no-population patches
-            elif tot == WW[pat]:
-                driveFreq[pat] = -0.5
-            else:
-                driveFreq[pat] = (WD[pat] + (2*DD[pat]) + DR[pat]) / (2*tot)
-
-        # make a scatter plot with drive frequency colour map
-        self.scat = self.axes.scatter(x, y, c=driveFreq, cmap=self.cmap, norm=self.cnorm, marker='.')
-        self.annotation.set_text("t = {}".format((t * recIntervalLocal) + recStart))
+            self.recIntervalLocal = 0
+        
+        # make a scatter plot with drive frequency colour map, coloured by each frame
+        self.scat = self.axes.scatter(x, y, c=np.full(self.numRecPats, float(metrics.noPopulation)), cmap=self.cmap, 
+                                      norm=self.cnorm, marker='.')
         self.axes.set_xlabel("x")
         self.axes.set_ylabel("y")
-        if len(x) == 1:
-            self.axes.set_xlim(x - x/2, x + x/2)
-        else:
-            self.axes.set_xlim(np.amin(x), np.amax(x))
-        if len(y) == 1:
-            self.axes.set_ylim(y - y/2, y + y/2)
-        else:
-            self.axes.set_ylim(np.amin(y), np.amax(y))
+        setScatterLimits(self.axes, x, y)
         self.axes.minorticks_on() # need it for animation saving to work
+        if self.numFrames == 0:
+            self.annotation.set_text("No local data recorded (run stopped early)")
+        return self.numFrames
+    
+    def setFrame(self, t, frameRows=None, frameClasses=None):
+        """
+        Colours the patches by their drive allele frequency on a recorded day and updates the timestamp.
+
+        Parameters
+        ----------
+        t : int, timestep (starting from 0, index of the recorded day in the local file)
+        frameRows : numpy.ndarray, optional, local data rows of timestep t if already read (e.g. streamed by outputdata.iterFrames)
+        frameClasses : numpy.ndarray, optional, colour classes of the patches on timestep t if already computed (see outputdata.classCube)
+        """
+        t = min(t, self.numFrames - 1)
+        if frameClasses is not None:
+            # the lower bound of each class is coloured as that class
+            self.scat.set_array(np.take(metrics.driveFreqBounds, frameClasses))
+        else:
+            if frameRows is None:
+                frameRows = outputdata.readFrame(self.localFile, self.numRecPats, t) # get populations on one day
+            # drive allele frequency of each patch, with distinguishable values for no-population and wild-only patches
+            self.scat.set_array(metrics.driveFrequency(frameRows[:, 2:8]))
+        self.annotation.set_text("t = {}".format((t * self.recIntervalLocal) + self.recStart))
+        
+    def plot(self, t, coordsFile, localFile, recStart, frameRows=None, frameClasses=None): 
+        """
+        Scatter plots the points from the coords data file with a color map of the drive allele frequency.
+
+        Parameters
+        ----------
+        t : int, timestep (starting from 0, index of data row on local file)
+        coordsFile : os.path for coords data file
+        localFile : os.path for local data file
+        recStart: int, start time for recording local data
+        frameRows : numpy.ndarray, optional, local data rows of timestep t if already read (e.g. streamed by outputdata.iterFrames)
+        frameClasses : numpy.ndarray, optional, colour classes of the patches on timestep t if already computed (see outputdata.classCube)
+
+        Returns
+        -------
+        matplotlib.Figure
+        """
+        self.stopAnim()
+        if self.setupPlot(coordsFile, localFile, recStart) != 0:
+            self.setFrame(t, frameRows, frameClasses)
         self.draw()      
         
         return self.fig
     
-    
\ No newline at end of file
+    def startAnim(self, coordsFile, localFile, recStart):
+        """
+        Starts an animation: the patches are plotted once, then each frame (see animFrame) only recolours them and 
+        updates the timestamp, redrawing just those artists over a saved background (blitting).
+
+        Parameters
+        ----------
+        coordsFile : os.path for coords data file
+        localFile : os.path for local data file
+        recStart: int, start time for recording local data
+
+        Returns
+        -------
+        int
+            Number of frames (recorded days) of the animation.
+        """
+        self.stopAnim()
+        if self.setupPlot(coordsFile, localFile, recStart) == 0:
+            self.draw()
+            return 0
+        self.animating = True
+        self.scat.set_animated(True)
+        self.annotation.set_animated(True)
+        self.draw() # full draw of the static artists, saving the background (see onDraw)
+        return self.numFrames
+    
+    def animFrame(self, t, frameRows=None, frameClasses=None):
+        """
+        Draws an animation frame.
+
+        Parameters
+        ----------
+        t : int, timestep (starting from 0, index of the recorded day in the local file)
+        frameRows : numpy.ndarray, optional, local data rows of timestep t if already read (e.g. streamed by outputdata.iterFrames)
+        frameClasses : numpy.ndarray, optional, colour classes of the patches on timestep t if already computed (see outputdata.classCube)
+        """
+        self.setFrame(t, frameRows, frameClasses)
+        if self.background == None:
+            self.draw()
+            return
+        self.restore_region(self.background)
+        self.drawAnimated()
+        self.blit(self.fig.bbox)
+        
+    def stopAnim(self):
+        """ Ends an animation, leaving its last frame as a normal plot. """
+        if not self.animating:
+            return
+        self.animating = False
+        self.background = None
+        self.scat.set_animated(False)
+        self.annotation.set_animated(False)
+        self.draw_idle()
+        
+    def drawAnimated(self):
+        """ Draws the animated artists on the canvas renderer. """
+        self.axes.draw_artist(self.scat)
+        self.fig.draw_artist(self.annotation)
+        
+    def onDraw(self, event):
+        """ Saves the background for blitting after each full draw of an animation (e.g. when the canvas is resized). """
+        if self.animating:
+            self.background = self.copy_from_bbox(self.fig.bbox)
+            self.drawAnimated()
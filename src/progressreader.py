@@ -5,39 +5,98 @@ Created on Fri Jan 31 16:57:59 2025
 @author: biol0117
 """
 
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
-import os
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, QTimer, QMetaObject, Qt
+from modelrunner import ProgressCounter
+from throughput import ThroughputMeter
 
 
 class ProgressReader(QObject):
-    """ Monitors file progress in a separate thread. """
+    """ 
+    Monitors file progress in a separate thread. The files are checked on a timer in the thread's event loop,
+    so the thread is idle between checks, and each check only reads the newly written data.
+    """
     progress = pyqtSignal(int)  # progress step value
+    throughput = pyqtSignal(object) # days/s and time left (see ThroughputMeter.update)
     finished = pyqtSignal()  # Signal when tracking is done
 
-    def __init__(self, files, maxT, numRuns):
+    def __init__(self, files, maxT, numRuns, runs=None, stopsFile=None, interval=500, timingFile=None, model=None):
+        """
+        Parameters
+        ----------
+        files : list
+            Totals filepath to track for each run. An entry can also be a list of alternative 
+            filepaths for the same run (e.g. a replicate's working file and its merged file).
+        maxT : int
+            Maximum simulated time (in days).
+        numRuns : int
+            Number of simulation replicates.
+        runs : list:int, optional
+            Run index of each entry of files. The default is None (1 to numRuns).
+        stopsFile : Path, optional
+            Early stops file of the simulation; runs stopped early count as complete. The default is None.
+        interval : int, optional
+            Time between checks (in ms). The default is 500.
+        timingFile : Path, optional
+            Filepath to write the timing log to when the reader finishes. The default is None (no log).
+        model : Path, optional
+            Filepath of the model program, for the timing log. The default is None.
+        """
         super().__init__()
         self.files = files
         self.maxT = maxT
         self.numRuns = numRuns
-        self.totalSteps = numRuns * maxT
+        self.runs = runs
+        self.stopsFile = stopsFile
+        self.interval = interval
         self.running = True
-        self.timer = QTimer(self)
+        self.timingFile = timingFile
+        self.model = model
+        self.counter = None
+        self.meter = None
+        self.timer = None
+        self.done = False
+
+    def stop(self):
+        """ Stops tracking the progress at the next check (e.g. when the simulation has finished). """
+        self.running = False
+
+    def finish(self):
+        """
+        Stops tracking the progress straight away (e.g. when the simulation is aborted), making the final check in the
+        reader's thread and waiting for it, so that the timing log is written before the thread is quit.
+        Called from another thread.
+        """
+        self.running = False
+        if not self.done: # the thread's event loop only quits after the reader has finished
+            QMetaObject.invokeMethod(self, "check", Qt.BlockingQueuedConnection)
 
     def run(self):
-        for i in range(0, len(self.files)):
-            self.running = True
-            while self.running:
-                if os.path.exists(self.files[i]):
-                    with open(self.files[i], "r") as f:
-                        lines = f.readlines()
-                        if len(lines) <= 2:
-                            progress = (i * (self.maxT+1)) # include initialisation day
-                        else: 
-                            progress = (i * (self.maxT+1)) + (len(lines) - 2) # subtract two header lines (but include initialisation day)
-                        self.progress.emit(progress)
-    
-                        if (len(lines) - 3) >= self.maxT: # without two header lines and initialisation day
-                            self.running = False
-                            break
-                self.timer.start(500)  # prevent excessive CPU usage
-        self.finished.emit()
\ No newline at end of file
+        # progress is combined across all runs, so concurrently running replicates are tracked together
+        self.counter = ProgressCounter(self.files, self.maxT, self.runs, self.stopsFile)
+        self.meter = ThroughputMeter(self.maxT, len(self.files))
+        self.timer = QTimer() # created here so it belongs to the reader's thread
+        self.timer.timeout.connect(self.check)
+        self.timer.start(self.interval)
+        self.check()
+
+    @pyqtSlot()
+    def check(self):
+        """ Emits the current progress, and finishes once all runs are complete or the reader has been stopped. """
+        if self.done:
+            return
+        if self.running:
+            progValue = self.counter.count()
+            self.throughput.emit(self.meter.update(self.counter.runDays, self.counter.skippedDays))
+            self.progress.emit(progValue)
+            if self.counter.isComplete():
+                self.running = False
+        if not self.running:
+            self.timer.stop()
+            self.done = True
+            if self.timingFile != None:
+                try:
+                    self.meter.writeLog(self.timingFile, self.counter.runs, self.model, 
+                                        "complete" if self.counter.isComplete() else "stopped")
+                except OSError:
+                    pass
+            self.finished.emit()
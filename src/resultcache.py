@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:31:44 2026
+
+@author: biol0117
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import shutil
+import time
+import os
+import modelrunner
+
+class ResultCache():
+    """
+    Local cache of simulation output files, keyed by a hash of everything that determines a simulation:
+    the parameter set, the contents of the advanced parameter files and the model program itself.
+    Entries are evicted least-recently-used first once the cache grows over its size cap.
+    The cache is best-effort: if its directory can't be written (e.g. a read-only install or a full disk),
+    simulations are simply run and not stored.
+    """
+    def __init__(self, cacheDir, maxBytes=5 * 1024**3):
+        """
+        Parameters
+        ----------
+        cacheDir : Path
+            Directory to store the cache entries in.
+        maxBytes : int, optional
+            Maximum total size of the cached files (in bytes). The default is 5 GiB.
+        """
+        self.cacheDir = Path(cacheDir)
+        self.maxBytes = maxBytes
+        self.fileHashes = {} # (path, size, mtime) -> hash, so the model program isn't re-hashed for every run
+
+    def fileHash(self, filePath):
+        """ Returns the SHA-256 hash of a file's contents, or of its path if the file doesn't exist. """
+        if filePath == None:
+            return "None"
+        if not os.path.isfile(filePath):
+            return "missing:" + str(filePath)
+        stat = os.stat(filePath)
+        statKey = (str(filePath), stat.st_size, stat.st_mtime_ns)
+        if statKey not in self.fileHashes:
+            h = hashlib.sha256()
+            with open(filePath, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            self.fileHashes[statKey] = h.hexdigest()
+        return self.fileHashes[statKey]
+
+    def key(self, paramSet, exeFilepath):
+        """
+        Parameters
+        ----------
+        paramSet : InputParams
+            Parameter set of the simulation.
+        exeFilepath : Path
+            Filepath of the model program.
+
+        Returns
+        -------
+        string
+            Cache key of the simulation.
+        """
+        values = dict(vars(paramSet))
+        for name in ("rainfallFile", "coordsFile", "relTimesFile"): # hash the file contents rather than where they are
+            values[name] = self.fileHash(values[name])
+        values["model"] = self.fileHash(exeFilepath)
+        return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+    def entryDir(self, key):
+        return self.cacheDir / key
+
+    def contains(self, key):
+        """ Returns whether the cache has an entry for the given key. """
+        return (self.entryDir(key) / "entry.json").exists()
+
+    def restore(self, key, outputPath):
+        """
+        Copies the cached output files of a simulation into a simulation directory (as hard links where possible).
+
+        Parameters
+        ----------
+        key : string
+            Cache key of the simulation.
+        outputPath : Path
+            Simulation directory to put the output_files directory in.
+
+        Returns
+        -------
+        bool
+            Whether the key was found in the cache.
+        """
+        if not self.contains(key):
+            return False
+        srcDir = self.entryDir(key) / "output_files"
+        destDir = Path(outputPath) / "output_files"
+        restored = []
+        try:
+            os.makedirs(destDir, exist_ok=True)
+            for f in os.listdir(srcDir):
+                if os.path.isfile(srcDir / f):
+                    linkOrCopy(srcDir / f, destDir / f)
+                    restored.append(destDir / f)
+        except OSError: # unreadable entry or full disk, the simulation is run instead
+            for f in restored: # hard links, which the model would otherwise write through into the cache
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+            return False
+        self.touch(key)
+        return True
+
+    def store(self, key, outputPath):
+        """
+        Adds the output files of a completed simulation to the cache (as hard links where possible) and evicts old entries if over the size cap.
+
+        Parameters
+        ----------
+        key : string
+            Cache key of the simulation.
+        outputPath : Path
+            Simulation directory containing the output_files directory.
+        """
+        srcDir = Path(outputPath) / "output_files"
+        if self.contains(key) or not srcDir.exists():
+            return
+        if (Path(outputPath) / modelrunner.stopsFileName).exists(): # runs stopped early aren't the full simulation
+            return
+        if (Path(outputPath) / "outcome_summary.json").exists(): # nor are replicates run until an outcome was precise enough
+            return
+        tmpDir = self.cacheDir / (key + ".tmp{}".format(os.getpid()))
+        try:
+            os.makedirs(tmpDir / "output_files", exist_ok=True)
+            size = 0
+            for f in os.listdir(srcDir):
+                if not os.path.isfile(srcDir / f): # e.g. the binary copies of the output files (see outputdata)
+                    continue
+                linkOrCopy(srcDir / f, tmpDir / "output_files" / f)
+                size += os.path.getsize(srcDir / f)
+            with open(tmpDir / "entry.json", "w") as f:
+                json.dump({"size": size, "lastUsed": time.time(), "source": str(outputPath)}, f)
+            os.replace(tmpDir, self.entryDir(key))
+        except OSError: # cache not writable (or full), or stored by another simulation in the meantime
+            shutil.rmtree(tmpDir, ignore_errors=True)
+            return
+        self.evict()
+
+    def touch(self, key):
+        """ Marks a cache entry as just used. """
+        entryFile = self.entryDir(key) / "entry.json"
+        try:
+            with open(entryFile, "r") as f:
+                entry = json.load(f)
+            entry["lastUsed"] = time.time()
+            with open(entryFile, "w") as f:
+                json.dump(entry, f)
+        except (OSError, ValueError): # read-only cache, the entry just isn't marked
+            pass
+
+    def evict(self):
+        """ Removes the least recently used entries until the cache is within its size cap. """
+        entries = []
+        for key in os.listdir(self.cacheDir):
+            entryFile = self.entryDir(key) / "entry.json"
+            try:
+                with open(entryFile, "r") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError): # not an entry, or unreadable
+                continue
+            entries.append((entry["lastUsed"], entry["size"], key))
+        entries.sort()
+        total = sum(entry[1] for entry in entries)
+        while total > self.maxBytes and entries:
+            lastUsed, size, key = entries.pop(0)
+            shutil.rmtree(self.entryDir(key), ignore_errors=True)
+            total -= size
+
+def linkOrCopy(src, dest):
+    """ Hard-links a file, or copies it if the filesystem doesn't allow it. """
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
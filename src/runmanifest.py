@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:52:19 2026
+
+@author: biol0117
+"""
+
+# Index of the output files of each run of a simulation directory, built in a single scan of its output_files
+# directory and kept in run_manifest.json, so that the plots can look up the files of a run directly.
+# Has no Qt dependency.
+
+import json
+import os
+import re
+import params
+
+manifestFileName = "run_manifest.json"
+fileKinds = {"Totals": "totals", "LocalData": "local", "CoordinateList": "coords"} # output filename prefix -> file kind
+fileNamePattern = re.compile(r"^(Totals|LocalData|CoordinateList)(\d+)run(\d+)\.txt(\.gz|\.xz)?$")
+
+def paramsStat(outputPath):
+    """ Returns the size and modification time (ns) of the params.txt file of a simulation directory, or None if it has none. """
+    try:
+        stat = os.stat(os.path.join(outputPath, "params.txt"))
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+class RunManifest():
+    """ Output filenames of each run of a simulation directory (by run index and file kind), with its set label and parameters. """
+    def __init__(self, outputPath, runFiles, setLabel=None, paramValues=None, dirMtime=None, paramsStat=None):
+        """
+        Parameters
+        ----------
+        outputPath : Path
+            Simulation directory.
+        runFiles : dict
+            Filenames in output_files of each run, as {run: {"totals": name, "local": name, "coords": name}}.
+        setLabel : int, optional
+            'Set of repetitions' index label of the output files. The default is None.
+        paramValues : dict, optional
+            Parameters of the simulation (InputParams attributes), if it has a params.txt file. The default is None.
+        dirMtime : int, optional
+            Modification time (ns) of output_files when it was scanned. The default is None.
+        paramsStat : list, optional
+            Size and modification time (ns) of params.txt when it was read (see paramsStat). The default is None.
+        """
+        self.outputPath = outputPath
+        self.runFiles = runFiles
+        self.setLabel = setLabel
+        self.params = paramValues
+        self.dirMtime = dirMtime
+        self.paramsStat = paramsStat
+
+    @classmethod
+    def scan(cls, outputPath):
+        """ Builds the manifest of a simulation directory from a single listing of its output_files directory. """
+        outputDir = os.path.join(outputPath, "output_files")
+        runFiles = {}
+        setLabel = None
+        dirMtime = None
+        if os.path.isdir(outputDir):
+            dirMtime = os.stat(outputDir).st_mtime_ns
+            with os.scandir(outputDir) as entries:
+                for entry in entries:
+                    match = fileNamePattern.match(entry.name)
+                    if match == None or not entry.is_file():
+                        continue
+                    prefix, label, run = match.group(1), int(match.group(2)), int(match.group(3))
+                    runFiles.setdefault(run, {})[fileKinds[prefix]] = entry.name
+                    setLabel = label if setLabel == None else setLabel
+        paramValues = None
+        fileStat = paramsStat(outputPath) # before reading, so a rewrite while reading invalidates the manifest
+        paramsFile = os.path.join(outputPath, "params.txt")
+        if os.path.exists(paramsFile):
+            try:
+                paramSet = params.readProgramParamsFile(paramsFile)
+                paramValues = {name : value for name, value in vars(paramSet).items()
+                               if isinstance(value, (int, float, str)) or value == None}
+                setLabel = paramSet.setLabel
+            except ValueError:
+                pass
+        return cls(outputPath, runFiles, setLabel, paramValues, dirMtime, fileStat)
+
+    @classmethod
+    def load(cls, outputPath):
+        """
+        Reads the saved manifest of a simulation directory, or scans the directory (and saves the manifest)
+        if there is none, the output files have been added, removed or renamed since, or params.txt has been rewritten
+        (e.g. by SequentialModelRunner.setNumRuns).
+
+        Parameters
+        ----------
+        outputPath : Path
+            Simulation directory.
+
+        Returns
+        -------
+        RunManifest
+        """
+        manifestFile = os.path.join(outputPath, manifestFileName)
+        outputDir = os.path.join(outputPath, "output_files")
+        if os.path.exists(manifestFile) and os.path.isdir(outputDir):
+            try:
+                with open(manifestFile, "r") as f:
+                    manifest = json.load(f)
+                if manifest["dirMtime"] == os.stat(outputDir).st_mtime_ns and manifest["paramsStat"] == paramsStat(outputPath):
+                    runFiles = {int(run) : files for run, files in manifest["runs"].items()}
+                    return cls(outputPath, runFiles, manifest["setLabel"], manifest["params"], manifest["dirMtime"], 
+                               manifest["paramsStat"])
+            except (OSError, ValueError, KeyError):
+                pass
+        manifest = cls.scan(outputPath)
+        manifest.save()
+        return manifest
+
+    def save(self):
+        """ Writes the manifest to run_manifest.json in the simulation directory. """
+        tmpFile = os.path.join(self.outputPath, manifestFileName + ".tmp")
+        try:
+            with open(tmpFile, "w") as f:
+                json.dump({"setLabel": self.setLabel, "dirMtime": self.dirMtime, "paramsStat": self.paramsStat,
+                           "params": self.params,
+                           "runs": {str(run) : files for run, files in sorted(self.runFiles.items())}}, f, indent=1)
+            os.replace(tmpFile, os.path.join(self.outputPath, manifestFileName))
+        except OSError: # e.g. read-only simulation directory
+            pass
+
+    def runs(self, kind=None):
+        """ Returns the sorted run indices (that have an output file of the given kind, if given). """
+        return sorted(run for run, files in self.runFiles.items() if kind == None or kind in files)
+
+    def file(self, run, kind):
+        """
+        Parameters
+        ----------
+        run : int
+            Run index.
+        kind : string
+            File kind: "totals", "local" or "coords".
+
+        Returns
+        -------
+        string
+            Filepath of the run's output file of that kind, or None if it has none.
+        """
+        name = self.runFiles.get(run, {}).get(kind)
+        if name == None:
+            return None
+        return os.path.join(self.outputPath, "output_files", name)
@@ -6,16 +6,15 @@ Created on Mon Jan  6 14:14:15 2025
 """
 
 from PyQt5.QtCore import QObject, pyqtSignal
-import subprocess
-import sys
-import os
+import modelrunner
+import compaction
 import gdsimsgui
 
 class Simulation(QObject):
     """ Runs a simulation subprocess for secondary-thread execution. """
     finished = pyqtSignal()
     error = pyqtSignal(str)
-    def __init__(self, outputPath, simName, dispType, boundaryType, rainfallFile, coordsFile, relTimesFile):
+    def __init__(self, outputPath, simName, runner):
         """
         Parameters
         ----------
@@ -23,96 +22,90 @@ class Simulation(QObject):
             Output directory path.
         simName : string.
             Simulation run name for output subdirectory.
-        dispType : string
-            Dispersal type for simulation. Options: "Distance kernel", "Radial".
-        boundaryType : string
-            Boundary type for simulation. Options: "Toroid", "Edge".
-        rainfallFile : string
-            Absolute filepath of the rainfall file. Can be None. 
-        coordsFile : string
-            Absolute filepath of the coordinates file. Can be None.
-        relTimesFile : string
-            Absolute filepath of the release times file. Can be None.
+        runner : ModelRunner
+            Runner of the model program (see modelrunner.createRunner).
         """
         super().__init__()
         
-        self.exeFilepath = gdsimsgui.appname
         self.outputPath = outputPath
         self.simName = simName
-        
-        self.rainfallFile = rainfallFile
-        self.coordsFile = coordsFile
-        self.relTimesFile = relTimesFile
-        self.dispType = dispType
-        self.boundaryType = boundaryType
-        
-        self.process = None
+        self.runner = runner
+        self.compression = None # compaction setting of the output files once the simulation has finished (see compaction.codecs)
+        self.compactedSizes = None # (before, after) sizes of the output files if compacted
+    
+    def progressFiles(self):
+        """
+        Returns
+        -------
+        files : list
+            Totals filepath(s) of each run, to track the simulation progress.
+        """
+        return self.runner.progressFiles()
     
     def run(self):
         """ Runs the simulation. """
-        
-        os.chdir(self.outputPath) # directory for output files
-        paramFile = self.outputPath / "params.txt"
-        inputString = "100" + "\n" + str(paramFile.resolve()) + "\n" + "y" +"\n" + "y" + "\n"
-        
-        if self.boundaryType == "Toroid":
-            inputString += "1" + "\n" + "t" + "\n"
-        elif self.boundaryType == "Edge":
-            inputString += "1" + "\n" + "e" + "\n"
-        if self.dispType == "Distance kernel":
-            inputString += "2" + "\n" + "d" + "\n" 
-        elif self.dispType == "Radial":
-            inputString += "2" + "\n" + "r" + "\n" 
-        if self.rainfallFile != None:
-            inputString += "3" + "\n" + self.rainfallFile + "\n"
-        if self.coordsFile != None:
-            inputString += "4" + "\n" + self.coordsFile + "\n"
-        if self.relTimesFile != None:
-            inputString += "5" + "\n" + self.relTimesFile + "\n"
-        
-        inputString += "0" + "\n"
-       
-        # Run C++ model with input data
-        os.chdir(self.outputPath) # directory for output files
-        env = os.environ.copy()
-        # Ensure process runs without creating a console window
-        if sys.platform == "win32":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            self.process = subprocess.Popen(
-                [self.exeFilepath],
-                stdin = subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                text=True,
-                env=env
-            )
-        else:
-            self.process = subprocess.Popen(
-                [self.exeFilepath],
-                stdin = subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                start_new_session=True,
-                text=True,
-                env=env
-            )
-        outs, errs = self.process.communicate(input=inputString)
+        errs = self.runner.run() # the model subprocess runs in the output directory, the GUI's working directory is left alone
         # check for errors whilst process is running and emit error signal
-        # (can't use except because cerrs, not subprocess errs)
         if errs: 
             self.error.emit(errs)
-            self.process.terminate()
-            os.chdir(gdsimsgui.basedir)
         else: # don't let finished signal emit if have errors
-            self.process.wait()
+            if self.compression != None and not self.runner.aborted:
+                self.compactedSizes = compaction.compactDir(self.outputPath / "output_files", self.compression)
             self.finished.emit()
-            os.chdir(gdsimsgui.basedir)
             
     def abort(self):
         """ Aborts the simulation. """
-        if self.process:
-            self.process.terminate()
-            os.chdir(gdsimsgui.basedir)
+        self.runner.abort()
+
+
+class ParallelSimulation(Simulation):
+    """ 
+    Runs the simulation replicates as separate model subprocesses, several at a time, for secondary-thread execution.
+    See modelrunner.ParallelModelRunner.
+    """
+
+
+class SequentialSimulation(ParallelSimulation):
+    """
+    Runs the simulation replicates in batches until the outcome's confidence interval is narrow enough, for secondary-thread execution.
+    See modelrunner.SequentialModelRunner.
+    """
+
+
+def createSimulation(outputPath, simName, paramSet, numWorkers=1, runs=None, niceness=None, cpuAffinity=None, timeout=None, 
+                     stopConditions=None, seqStopping=None):
+    """
+    Creates the simulation for a parameter set, with the model runner chosen by modelrunner.createRunner 
+    (and a checkpoint of its completed runs).
+
+    Parameters
+    ----------
+    outputPath : Path
+        Output directory path (containing the params.txt file).
+    simName : string
+        Simulation run name.
+    paramSet : InputParams
+        Parameter set of the simulation.
+    numWorkers : int, optional
+        Maximum number of model subprocesses to run at once. The default is 1.
+    runs : list:int, optional
+        Run indices to run (e.g. the missing runs of an interrupted simulation). The default is None (all runs).
+    niceness, cpuAffinity, timeout : optional
+        Scheduling settings of the model subprocesses, see ModelRunner.setScheduling. The defaults are None.
+    stopConditions : StopConditions, optional
+        Conditions for ending replicates before maxT. The default is None.
+    seqStopping : SequentialStopping, optional
+        Settings to run replicates in batches until the outcome is precise enough, with paramSet.numRuns 
+        as the maximum number of replicates (not used with runs). The default is None (run all numRuns replicates).
+
+    Returns
+    -------
+    Simulation
+    """
+    runner = modelrunner.createRunner(gdsimsgui.appname, outputPath, paramSet, numWorkers, runs, niceness, cpuAffinity, timeout,
+                                      stopConditions, seqStopping)
+    if isinstance(runner, modelrunner.SequentialModelRunner):
+        return SequentialSimulation(outputPath, simName, runner)
+    if isinstance(runner, modelrunner.ParallelModelRunner):
+        return ParallelSimulation(outputPath, simName, runner)
+    return Simulation(outputPath, simName, runner)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:37 2026
+
+@author: biol0117
+"""
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+import sim
+import gdsimsgui
+from progressreader import ProgressReader
+
+class SimJob():
+    """ A queued simulation: a parameter set snapshot and its own output directory. """
+    def __init__(self, paramSet, outputPath, simName, numWorkers=1, scheduling=None, stopConditions=None, seqStopping=None, 
+                 compression=None, useCache=True):
+        """
+        Parameters
+        ----------
+        paramSet : InputParams
+            Parameter set of the simulation (params files already created in outputPath).
+        outputPath : Path
+            Output directory path of the simulation.
+        simName : string
+            Simulation run name.
+        numWorkers : int, optional
+            Maximum number of model subprocesses the job can run at once. The default is 1.
+        scheduling : dict, optional
+            Scheduling settings of the model subprocesses (niceness, cpuAffinity, timeout), see sim.Simulation. The default is None.
+        stopConditions : StopConditions, optional
+            Conditions for ending replicates early. The default is None.
+        seqStopping : SequentialStopping, optional
+            Settings to run replicates until the outcome is precise enough (numRuns is the maximum). The default is None.
+        compression : string, optional
+            Compaction setting of the output files once the simulation has finished (see compaction.codecs). 
+            The default is None (not compressed).
+        useCache : bool, optional
+            Whether to reuse an identical simulation from the result cache, and store this one in it. The default is True.
+        """
+        self.paramSet = paramSet
+        self.outputPath = outputPath
+        self.simName = simName
+        self.numWorkers = numWorkers
+        self.scheduling = scheduling if scheduling != None else {}
+        self.stopConditions = stopConditions
+        self.seqStopping = seqStopping
+        self.compression = compression
+        self.useCache = useCache
+        self.status = "Queued" # options: "Queued", "Running", "Finished", "Aborted", "Error"
+        self.progress = 0
+        self.maxProgress = paramSet.numRuns * (paramSet.maxT + 1)
+        self.abortCode = 0
+
+        self.simulation = None
+        self.simThread = None
+        self.progReader = None
+        self.progThread = None
+
+    def isDone(self):
+        """ Returns whether the job is no longer queued or running. """
+        return self.status in ("Finished", "Aborted", "Error")
+
+
+class SimQueue(QObject):
+    """ Runs queued simulation jobs, up to a maximum number of jobs at once. """
+    jobChanged = pyqtSignal(int) # job index, when its status or progress changes
+    jobFinished = pyqtSignal(int) # job index, when a job has completed successfully
+
+    def __init__(self, resultCache=None, maxJobs=1):
+        """
+        Parameters
+        ----------
+        resultCache : ResultCache, optional
+            Cache to reuse identical simulations from and store completed ones in. The default is None (no cache).
+        maxJobs : int, optional
+            Maximum number of jobs to run at the same time. The default is 1.
+        """
+        super().__init__()
+        self.jobs = []
+        self.maxJobs = maxJobs
+        self.resultCache = resultCache
+
+    def setMaxJobs(self, maxJobs):
+        """ Sets the maximum number of jobs to run at once and starts waiting jobs if there is room. """
+        self.maxJobs = maxJobs
+        self.startJobs()
+
+    def addJob(self, job):
+        """
+        Adds a job to the queue and starts it if there is room.
+
+        Parameters
+        ----------
+        job : SimJob
+
+        Returns
+        -------
+        int
+            Index of the job in the queue.
+        """
+        self.jobs.append(job)
+        self.jobChanged.emit(len(self.jobs) - 1)
+        self.startJobs()
+        return len(self.jobs) - 1
+
+    def numRunning(self):
+        """ Returns the number of jobs currently running. """
+        return len([job for job in self.jobs if job.status == "Running"])
+
+    def isRunning(self):
+        """ Returns whether any job is queued or running. """
+        return any(not job.isDone() for job in self.jobs)
+
+    def startJobs(self):
+        """ Starts waiting jobs, in queue order, while there is room in the concurrency budget. """
+        for job in self.jobs:
+            if self.numRunning() >= self.maxJobs:
+                break
+            if job.status == "Queued":
+                if self.restoreJob(job):
+                    continue
+                self.startJob(job)
+
+    def restoreJob(self, job):
+        """ Completes a job straight away if an identical simulation is in the result cache. """
+        if self.resultCache == None or not job.useCache:
+            return False
+        job.cacheKey = self.resultCache.key(job.paramSet, gdsimsgui.appname)
+        if not self.resultCache.restore(job.cacheKey, job.outputPath):
+            return False
+        index = self.jobs.index(job)
+        job.status = "Finished"
+        job.progress = job.maxProgress
+        self.jobChanged.emit(index)
+        self.jobFinished.emit(index)
+        return True
+
+    def startJob(self, job):
+        """ Sets up the simulation and progress reader threads of a job and starts them. """
+        index = self.jobs.index(job)
+        job.status = "Running"
+        job.simThread = QThread()
+        job.simulation = sim.createSimulation(job.outputPath, job.simName, job.paramSet, job.numWorkers, 
+                                              stopConditions=job.stopConditions, seqStopping=job.seqStopping, **job.scheduling)
+        job.simulation.compression = job.compression
+        job.simulation.moveToThread(job.simThread)
+
+        job.progThread = QThread()
+        job.progReader = ProgressReader(job.simulation.progressFiles(), job.paramSet.maxT, job.paramSet.numRuns, 
+                                        job.simulation.runner.runs, job.simulation.runner.stopsFile,
+                                        timingFile=job.outputPath / "timing_log.json", model=gdsimsgui.appname)
+        job.progReader.moveToThread(job.progThread)
+
+        job.simThread.started.connect(job.simulation.run)
+        job.simulation.finished.connect(job.simThread.quit)
+        job.simulation.finished.connect(job.simulation.deleteLater)
+        # runs ended early or not run never complete, so the reader is told to finish at its next timed check
+        job.simThread.finished.connect(lambda reader=job.progReader: reader.stop())
+        job.simThread.finished.connect(lambda job=job: self.jobDone(job)) # before the thread is deleted
+        job.simThread.finished.connect(job.simThread.deleteLater)
+        job.simulation.error.connect(lambda errorMsg, job=job: self.jobError(job, errorMsg))
+
+        job.progThread.started.connect(job.progReader.run)
+        job.progReader.finished.connect(job.progThread.quit)
+        job.progReader.finished.connect(job.progReader.deleteLater)
+        job.progThread.finished.connect(lambda job=job: self.readerDone(job)) # before the thread is deleted
+        job.progThread.finished.connect(job.progThread.deleteLater)
+        job.progReader.progress.connect(lambda v, job=job: self.jobProgress(job, v))
+
+        job.simThread.start()
+        job.progThread.start()
+        self.jobChanged.emit(index)
+
+    def jobProgress(self, job, progValue):
+        job.progress = progValue
+        self.jobChanged.emit(self.jobs.index(job))
+
+    def jobError(self, job, errorMsg):
+        """ Records the error message of a job and stops it. """
+        job.errorMsg = errorMsg
+        self.abortJob(self.jobs.index(job), "Error")
+
+    def abortJob(self, index, status="Aborted"):
+        """
+        Aborts a running job or removes a queued one from the waiting list.
+
+        Parameters
+        ----------
+        index : int
+            Index of the job in the queue.
+        status : string, optional
+            Status to give the job. The default is "Aborted".
+        """
+        job = self.jobs[index]
+        if job.status == "Queued":
+            job.status = status
+            self.jobChanged.emit(index)
+        elif job.status == "Running":
+            job.abortCode = 1
+            job.status = status
+            if job.progThread != None: # None once the reader has finished (e.g. while the output files are compacted)
+                job.progReader.finish()
+                job.progThread.quit()
+                job.progThread.wait()
+            if job.simThread != None:
+                job.simulation.abort()
+                job.simThread.quit()
+                job.simThread.wait()
+
+    def abortAll(self):
+        """ Aborts all queued and running jobs. """
+        for i in range(0, len(self.jobs)):
+            self.abortJob(i)
+
+    def readerDone(self, job):
+        """ Releases the progress reader of a job once its thread has finished (they are then deleted). """
+        job.progReader = None
+        job.progThread = None
+
+    def jobDone(self, job):
+        """ Updates a job once its simulation thread has finished and starts the next waiting jobs. """
+        index = self.jobs.index(job)
+        job.simThread = None
+        if job.abortCode == 0:
+            job.status = "Finished"
+            job.progress = job.maxProgress
+            if self.resultCache != None and job.useCache:
+                self.resultCache.store(job.cacheKey, job.outputPath)
+        job.simulation = None
+        self.jobChanged.emit(index)
+        if job.status == "Finished":
+            self.jobFinished.emit(index)
+        self.startJobs()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:20:41 2026
+
+@author: biol0117
+"""
+
+# Early termination of replicates that have reached an absorbing state, detected from their Totals files
+# while the model is running. Has no Qt dependency (shared by the GUI and the command-line runner).
+
+import threading
+import json
+import os
+from tailreader import FileTail
+
+class StopConditions():
+    """ Conditions for ending a replicate before maxT. """
+    def __init__(self, elimination=False, fixation=False, freqThreshold=None, thresholdDays=1):
+        """
+        Parameters
+        ----------
+        elimination : bool, optional
+            Stop when the whole population has been eliminated (all genotype totals are zero). The default is False.
+        fixation : bool, optional
+            Stop when the drive allele has reached fixation (drive allele frequency of 1). The default is False.
+        freqThreshold : float, optional
+            Stop when the drive allele frequency has stayed at or above this value for thresholdDays days.
+            The default is None (no threshold).
+        thresholdDays : int, optional
+            Number of consecutive recorded days the threshold must hold for. The default is 1.
+        """
+        self.elimination = elimination
+        self.fixation = fixation
+        self.freqThreshold = freqThreshold
+        self.thresholdDays = max(1, thresholdDays)
+
+    def isEnabled(self):
+        """ Returns whether any stop condition is set. """
+        return self.elimination or self.fixation or self.freqThreshold != None
+
+
+def driveFrequency(row):
+    """
+    Parameters
+    ----------
+    row : list:float
+        Totals file row (day, WW, WD, DD, WR, RR, DR).
+
+    Returns
+    -------
+    float
+        Drive allele frequency of the row, or None if there is no population.
+    """
+    WW, WD, DD, WR, RR, DR = row[1:7]
+    tot = WW + WD + DD + WR + RR + DR
+    if tot == 0:
+        return None
+    return (WD + (2*DD) + DR) / (2*tot)
+
+
+class StopMonitor():
+    """
+    Follows a replicate's Totals file as the model writes it (in a separate thread) and calls back
+    as soon as one of the stop conditions is met.
+    """
+    def __init__(self, totalsFile, conditions, onStop, interval=0.5):
+        """
+        Parameters
+        ----------
+        totalsFile : Path
+            Totals file of the replicate.
+        conditions : StopConditions
+        onStop : function
+            Called with (day, reason) when a stop condition is met.
+        interval : float, optional
+            Time between file checks (in seconds). The default is 0.5.
+        """
+        self.totalsFile = totalsFile
+        self.conditions = conditions
+        self.onStop = onStop
+        self.interval = interval
+        self.tail = FileTail()
+        self.heldDays = 0
+        self.stopDay = None
+        self.reason = None
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        """ Stops following the file (when the replicate has ended). """
+        self.stopEvent.set()
+        self.thread.join()
+
+    def checkRow(self, row):
+        """
+        Parameters
+        ----------
+        row : numpy.ndarray
+            Totals file row (day, WW, WD, DD, WR, RR, DR).
+
+        Returns
+        -------
+        string
+            Stop reason ("elimination", "fixation" or "threshold"), or None if no condition is met.
+        """
+        freq = driveFrequency(row)
+        if freq == None:
+            return "elimination" if self.conditions.elimination else None
+        if self.conditions.fixation and freq >= 1:
+            return "fixation"
+        if self.conditions.freqThreshold != None:
+            self.heldDays = self.heldDays + 1 if freq >= self.conditions.freqThreshold else 0
+            if self.heldDays >= self.conditions.thresholdDays:
+                return "threshold"
+        return None
+
+    def readNewRows(self):
+        """ Checks the complete rows written since the last read. Returns whether a stop condition was met. """
+        rows, restarted = self.tail.readRows(self.totalsFile)
+        if rows is None:
+            return False
+        for row in rows:
+            reason = self.checkRow(row)
+            if reason != None:
+                self.stopDay = int(row[0])
+                self.reason = reason
+                return True
+        return False
+
+    def run(self):
+        while not self.stopEvent.is_set():
+            if self.readNewRows():
+                self.onStop(self.stopDay, self.reason)
+                return
+            self.stopEvent.wait(self.interval)
+
+
+stopsFileName = "early_stops.json" # early-stopped runs of a simulation directory
+
+def readStops(stopsFile):
+    """
+    Returns
+    -------
+    dict
+        (day, reason) of each early-stopped run, by run index. Empty if the file doesn't exist.
+    """
+    if not os.path.exists(stopsFile):
+        return {}
+    with open(stopsFile, "r") as f:
+        stops = json.load(f)
+    return {int(run) : (stop["day"], stop["reason"]) for run, stop in stops.items()}
+
+def recordStop(stopsFile, run, day, reason):
+    """ Adds the stop day and reason of an early-stopped run to the stops file. """
+    stops = {str(r) : {"day": d, "reason": rsn} for r, (d, rsn) in readStops(stopsFile).items()}
+    stops[str(run)] = {"day": day, "reason": reason}
+    tmpFile = str(stopsFile) + ".tmp"
+    with open(tmpFile, "w") as f:
+        json.dump(stops, f, indent=1)
+    os.replace(tmpFile, stopsFile)
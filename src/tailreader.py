@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:02:47 2026
+
+@author: biol0117
+"""
+
+# Incremental reading of the data rows a model run is appending to its output files (e.g. Totals files),
+# so that plots can follow a simulation while it is running. Has no Qt dependency.
+
+import numpy as np
+import outputparser
+import os
+
+class FileTail():
+    """
+    Position in a text file the model is appending to, so that each read only returns the complete lines written
+    since the previous one. The file can move to another path (e.g. a replicate's file merged into the simulation's
+    output_files) without being re-read, and is read again from the start if it is replaced or rewritten.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """ Starts reading again from the beginning of the file. """
+        self.fileId = None # inode, kept when the file is moved
+        self.offset = 0 # bytes read so far
+        self.numLines = 0 # complete lines read so far
+
+    def read(self, path, maxBytes=None):
+        """
+        Parameters
+        ----------
+        path : string
+            Filepath of the file.
+        maxBytes : int, optional
+            Number of bytes to read at most, unless a single line is longer. The default is None (all the new data).
+
+        Returns
+        -------
+        data : bytes
+            Complete lines appended since the last read (None if the file doesn't exist).
+        restarted : bool
+            Whether the file has been replaced or rewritten since the last read, so data starts from its beginning.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, False
+        size = stat.st_size
+        restarted = False
+        if stat.st_ino != self.fileId or size < self.offset: # a different file, or rewritten
+            restarted = self.fileId != None
+            self.reset()
+            self.fileId = stat.st_ino
+        if size <= self.offset:
+            return b"", restarted
+        blockSize = size - self.offset if maxBytes == None else maxBytes
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, blockSize))
+            end = data.rfind(b"\n") + 1
+            while end == 0 and self.offset + len(data) < size: # a line longer than maxBytes, read on to its end
+                block = f.read(min(size - self.offset - len(data), blockSize))
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    end = len(data) + newline + 1
+                data += block
+        data = data[:end] # leave any incomplete last line for the next read
+        self.offset += end
+        self.numLines += data.count(b"\n")
+        return data, restarted
+
+    def readRows(self, path, headerLines=2, maxBytes=None):
+        """
+        Reads the data rows appended since the last read (see read), skipping the header lines at the start of the file.
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Data rows parsed with the dtype of the file format (see outputparser.parseBytes), None if the file doesn't exist.
+        restarted : bool
+            Whether the file has been replaced or rewritten since the last read, so rows start from its beginning.
+        """
+        data, restarted = self.read(path, maxBytes)
+        if data == None:
+            return None, restarted
+        linesBefore = self.numLines - data.count(b"\n")
+        start = 0
+        for i in range(linesBefore, min(headerLines, self.numLines)):
+            start = data.index(b"\n", start) + 1
+        return outputparser.parseBytes(data[start:], outputparser.columnDtype(path)), restarted
+
+
+class TailReader():
+    """
+    Reads the complete data rows appended to a text output file since the last read, without re-reading the rest of it.
+    The file can move to another path (e.g. a replicate's file merged into the simulation's output_files) without being re-read.
+    """
+    def __init__(self, paths, headerLines=2, maxBytes=1048576):
+        """
+        Parameters
+        ----------
+        paths : list
+            Alternative filepaths of the file, checked in order (e.g. a replicate's working file and its merged file).
+        headerLines : int, optional
+            Number of header lines at the start of the file. The default is 2.
+        maxBytes : int, optional
+            Maximum number of bytes read per call (unless a single line is longer), so that catching up with a long file 
+            is spread over several reads. The default is 1048576 (1 MB).
+        """
+        self.paths = paths if isinstance(paths, (list, tuple)) else [paths]
+        self.headerLines = headerLines
+        self.maxBytes = maxBytes
+        self.tail = FileTail()
+
+    def read(self):
+        """
+        Returns
+        -------
+        rows : numpy.ndarray
+            Data rows appended since the last read (one row per line, empty if there are none).
+        restarted : bool
+            Whether the file has been replaced or rewritten since the last read, so rows start from its beginning.
+
+        Raises
+        ------
+        ValueError
+            If the new lines aren't rows of numbers.
+        """
+        for path in self.paths:
+            rows, restarted = self.tail.readRows(path, self.headerLines, self.maxBytes)
+            if rows is not None:
+                return rows, restarted
+        return np.empty((0, 0)), False
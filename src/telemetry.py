@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:05:23 2026
+
+@author: biol0117
+"""
+
+# Resource usage of the model subprocesses, read from /proc (Linux only). Has no Qt dependency,
+# so it is shared by the GUI (telemetryreader.py) and the command-line runner (gdsimscli.py).
+
+import csv
+import time
+import os
+
+def isSupported():
+    """ Returns whether process telemetry can be read on this platform. """
+    return os.path.isdir("/proc/self")
+
+def readProcStats(pid):
+    """
+    Reads the current resource usage of a process from /proc.
+
+    Parameters
+    ----------
+    pid : int
+        Process ID.
+
+    Returns
+    -------
+    dict
+        cpuTime (s), rss (bytes), peakRss (bytes) and writeBytes (bytes, None if not readable).
+        None if the process no longer exists.
+    """
+    procDir = "/proc/{}".format(pid)
+    try:
+        with open(procDir + "/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split() # the process name can contain spaces
+        cpuTime = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK") # utime + stime
+        rss = None
+        peakRss = None
+        with open(procDir + "/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    peakRss = int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    writeBytes = None
+    try:
+        with open(procDir + "/io", "r") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    writeBytes = int(line.split()[1])
+    except (OSError, ValueError): # e.g. not permitted
+        pass
+    return {"cpuTime": cpuTime, "rss": rss, "peakRss": peakRss, "writeBytes": writeBytes}
+
+
+class ProcessSampler():
+    """
+    Samples the resource usage of a model runner's subprocesses and keeps the last values of each one,
+    including the ones that have already exited.
+    """
+    def __init__(self, runner):
+        """
+        Parameters
+        ----------
+        runner : ModelRunner
+            Model runner whose running subprocesses are sampled.
+        """
+        self.runner = runner
+        self.stats = {} # process label -> stats dict of its last sample
+
+    def sample(self):
+        """
+        Reads the current resource usage of each running model subprocess.
+
+        Returns
+        -------
+        dict
+            Combined usage of all the subprocesses so far (see totals).
+        """
+        now = time.time()
+        for label, process in self.runner.runningProcesses().items():
+            stats = readProcStats(process.pid)
+            if stats == None: # exited since
+                continue
+            if label not in self.stats or self.stats[label]["pid"] != process.pid:
+                self.stats[label] = {"pid": process.pid, "startTime": now}
+            if stats["peakRss"] == None: # exiting process, keep the last memory values
+                stats["peakRss"] = self.stats[label].get("peakRss")
+                stats["rss"] = self.stats[label].get("rss")
+            self.stats[label].update(stats)
+            self.stats[label]["lastTime"] = now
+        return self.totals()
+
+    def totals(self):
+        """
+        Returns
+        -------
+        dict
+            numProcesses, cpuTime (s), rss (bytes, running processes only), peakRss (bytes, largest of any process)
+            and writeBytes (bytes) over all the sampled subprocesses.
+        """
+        running = set(self.runner.runningProcesses().keys())
+        allStats = self.stats.values()
+        return {"numProcesses": len(running),
+                "cpuTime": sum(stats["cpuTime"] for stats in allStats),
+                "rss": sum(stats["rss"] or 0 for label, stats in self.stats.items() if label in running),
+                "peakRss": max([stats["peakRss"] or 0 for stats in allStats], default=0),
+                "writeBytes": sum(stats["writeBytes"] or 0 for stats in allStats)}
+
+    def writeMetrics(self, filePath):
+        """
+        Writes the last sampled usage of each subprocess to a CSV file.
+
+        Parameters
+        ----------
+        filePath : Path
+            Filepath of the metrics file.
+        """
+        with open(filePath, "w", newline="") as csvfile:
+            fw = csv.writer(csvfile, delimiter=",", quoting=csv.QUOTE_MINIMAL)
+            fw.writerow(["process", "pid", "cpu_time_s", "wall_time_s", "peak_rss_bytes", "final_rss_bytes", "write_bytes"])
+            for label, stats in self.stats.items():
+                fw.writerow([label, stats["pid"], round(stats["cpuTime"], 2), round(stats["lastTime"] - stats["startTime"], 2),
+                             stats["peakRss"], stats["rss"], stats["writeBytes"]])
+
+
+def formatStats(totals):
+    """ Returns a short readable summary of the combined usage (see ProcessSampler.totals). """
+    mb = 1024 * 1024
+    return "CPU {:.1f} s | RSS {:.0f} MB (peak {:.0f} MB) | written {:.0f} MB".format(totals["cpuTime"], totals["rss"] / mb,
+                                                                                       totals["peakRss"] / mb, totals["writeBytes"] / mb)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:31:50 2026
+
+@author: biol0117
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+import threading
+from telemetry import ProcessSampler
+
+
+class TelemetryReader(QObject):
+    """ Samples the resource usage of the model subprocesses in a separate thread. See telemetry.ProcessSampler. """
+    sample = pyqtSignal(object) # combined usage dict (see ProcessSampler.totals)
+    finished = pyqtSignal()
+
+    def __init__(self, runner, metricsFile, interval=1.0):
+        """
+        Parameters
+        ----------
+        runner : ModelRunner
+            Model runner of the simulation.
+        metricsFile : Path
+            Filepath to write the per-process metrics to when sampling stops.
+        interval : float, optional
+            Time between samples (in seconds). The default is 1.0.
+        """
+        super().__init__()
+        self.sampler = ProcessSampler(runner)
+        self.metricsFile = metricsFile
+        self.interval = interval
+        self.stopEvent = threading.Event()
+
+    def stop(self):
+        """ Stops sampling (when the simulation has finished or been aborted). """
+        self.stopEvent.set()
+
+    def run(self):
+        while not self.stopEvent.is_set():
+            self.sample.emit(self.sampler.sample())
+            self.stopEvent.wait(self.interval)
+        if self.sampler.stats:
+            try:
+                self.sampler.writeMetrics(self.metricsFile)
+            except OSError:
+                pass
+        self.finished.emit()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:10:36 2026
+
+@author: biol0117
+"""
+
+# Simulation speed (simulated days per second) and remaining-time estimates from the progress counts.
+# Has no Qt dependency (shared by the GUI progress reader and the command-line runner).
+
+from datetime import datetime
+import platform
+import json
+import time
+import os
+
+class ThroughputMeter():
+    """
+    Smoothed simulated-days-per-second rates, per run and overall, and the estimated time left,
+    from successive counts of the days written by each run (see ProgressCounter.runDays).
+    """
+    def __init__(self, maxT, numRuns, smoothing=0.3):
+        """
+        Parameters
+        ----------
+        maxT : int
+            Maximum simulated time (in days).
+        numRuns : int
+            Number of runs tracked.
+        smoothing : float, optional
+            Weight of the newest rate in the exponential moving averages (0-1). The default is 0.3.
+        """
+        self.maxT = maxT
+        self.numRuns = numRuns
+        self.smoothing = smoothing
+        self.startTime = None
+        self.lastTime = None
+        self.lastDays = [0] * numRuns # days simulated by each run at the last update
+        self.lastSkipped = [0] * numRuns # days not simulated by each run, as it was stopped early
+        self.runRates = [None] * numRuns # smoothed days/s of each run
+        self.runStart = [None] * numRuns # time each run was first seen progressing
+        self.runEnd = [None] * numRuns # time each run was first seen complete
+        self.rate = None # smoothed overall days/s
+
+    def smooth(self, old, new):
+        return new if old == None else (self.smoothing * new) + ((1 - self.smoothing) * old)
+
+    def update(self, runDays, skippedDays=None, now=None):
+        """
+        Parameters
+        ----------
+        runDays : list:int
+            Days written by each run so far (including the initialisation day), counting runs stopped early as complete.
+        skippedDays : list:int, optional
+            Days of runDays that weren't simulated by each run, as it was stopped early (see ProgressCounter.skippedDays).
+            They don't count towards the rates. The default is None (none).
+        now : float, optional
+            Time of the count (in seconds, as time.time()). The default is None (now).
+
+        Returns
+        -------
+        dict
+            rate (overall days/s), runRates (days/s of each run still running, by position) and
+            eta (estimated seconds left), each None until known.
+        """
+        now = time.time() if now == None else now
+        skippedDays = skippedDays if skippedDays != None else [0] * self.numRuns
+        simDays = [runDays[i] - skippedDays[i] for i in range(0, self.numRuns)]
+        if self.startTime == None:
+            self.startTime = now
+        if self.lastTime != None and now > self.lastTime:
+            dt = now - self.lastTime
+            for i in range(0, self.numRuns):
+                delta = simDays[i] - self.lastDays[i]
+                if delta > 0 and self.runStart[i] == None:
+                    self.runStart[i] = self.lastTime
+                if self.runStart[i] != None and self.runEnd[i] == None:
+                    self.runRates[i] = self.smooth(self.runRates[i], delta / dt)
+                if runDays[i] >= self.maxT + 1 and self.runEnd[i] == None:
+                    self.runEnd[i] = now
+            self.rate = self.smooth(self.rate, (sum(simDays) - sum(self.lastDays)) / dt)
+        self.lastTime = now
+        self.lastDays = simDays
+        self.lastSkipped = list(skippedDays)
+        return self.info()
+
+    def info(self):
+        """ Returns the current rates and estimated time left (see update). """
+        remaining = (self.numRuns * (self.maxT + 1)) - sum(self.lastDays) - sum(self.lastSkipped)
+        eta = None
+        if remaining <= 0:
+            eta = 0
+        elif self.rate != None and self.rate > 0:
+            eta = remaining / self.rate
+        runRates = {i : self.runRates[i] for i in range(0, self.numRuns) if self.runStart[i] != None and self.runEnd[i] == None}
+        return {"rate": self.rate, "runRates": runRates, "eta": eta}
+
+    def writeLog(self, filePath, runs=None, model=None, status="complete"):
+        """
+        Writes the timing of the simulation to a JSON file: wall time, mean days/s overall and per run, and the machine,
+        so simulation speeds can be compared between model builds and hardware.
+
+        Parameters
+        ----------
+        filePath : Path
+            Filepath of the timing log.
+        runs : list:int, optional
+            Run index of each tracked run. The default is None (1 to numRuns).
+        model : Path, optional
+            Filepath of the model program. The default is None.
+        status : string, optional
+            How the tracking ended, e.g. "complete" or "stopped". The default is "complete".
+        """
+        runs = runs if runs != None else list(range(1, self.numRuns + 1))
+        end = self.lastTime if self.lastTime != None else time.time()
+        start = self.startTime if self.startTime != None else end
+        wallTime = end - start
+        runTimings = []
+        for i in range(0, self.numRuns):
+            runTime = None
+            if self.runStart[i] != None:
+                runTime = (self.runEnd[i] if self.runEnd[i] != None else end) - self.runStart[i]
+            runTimings.append({"run": runs[i], "days": self.lastDays[i], "wallTime": runTime,
+                               "daysPerSecond": self.lastDays[i] / runTime if runTime else None})
+        log = {"status": status,
+               "start": datetime.fromtimestamp(start).isoformat(timespec="seconds"),
+               "wallTime": wallTime,
+               "days": sum(self.lastDays),
+               "daysPerSecond": sum(self.lastDays) / wallTime if wallTime > 0 else None,
+               "runs": runTimings,
+               "machine": {"node": platform.node(), "platform": platform.platform(), "processor": platform.processor(),
+                           "cpuCount": os.cpu_count()}}
+        if model != None and os.path.exists(model):
+            stat = os.stat(model)
+            log["model"] = {"path": str(model), "size": stat.st_size, "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")}
+        with open(filePath, "w") as f:
+            json.dump(log, f, indent=1)
+
+
+def formatDuration(seconds):
+    """ Returns a short readable duration, e.g. "2 h 05 min", "3 min 20 s" or "45 s". """
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return "{} h {:02d} min".format(seconds // 3600, (seconds % 3600) // 60)
+    if seconds >= 60:
+        return "{} min {:02d} s".format(seconds // 60, seconds % 60)
+    return "{} s".format(seconds)
+
+def formatThroughput(info):
+    """ Returns a short readable summary of the speed and time left (see ThroughputMeter.update), or "" if not known yet. """
+    if info["rate"] == None:
+        return ""
+    text = "{:.0f} days/s".format(info["rate"])
+    if info["eta"] != None:
+        text += ", about {} left".format(formatDuration(info["eta"]))
+    return text
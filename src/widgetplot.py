@@ -5,17 +5,16 @@ Created on Mon Jan  6 14:03:49 2025
 @author: biol0117
 """
 
-from PyQt5.QtWidgets import QWidget, QComboBox, QPushButton, QCheckBox, QGridLayout, QVBoxLayout, QGroupBox, QFrame, QSlider, QLabel, QStyle, QSpinBox, QFileDialog, QMessageBox
-from PyQt5.QtCore import Qt, QTimer, QSize
+from PyQt5.QtWidgets import QWidget, QComboBox, QPushButton, QCheckBox, QGridLayout, QVBoxLayout, QGroupBox, QFrame, QSlider, QLabel, QStyle, QSpinBox, QFileDialog, QMessageBox, QProgressBar, QProgressDialog
+from PyQt5.QtCore import Qt, QTimer, QSize, QThreadPool, QThread
 from PyQt5.QtGui import QColor, QPalette
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavBar
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-from PIL import Image
-import os
-import re
-import numpy as np
 import plotcanvas
+import outputdata
 import gdsimsgui
+from tailreader import TailReader
+from cubebuilder import CubeBuilder
+from animsaver import AnimSaver
 
 class WidgetPlot(QWidget): # widget containing plotcanvas and toolbar in same place
     """Contains the plotspace and plot interaction components."""
@@ -39,6 +38,8 @@ class WidgetPlot(QWidget): # widget containing plotcanvas and toolbar in same pl
         self.plotBtn.setMinimumHeight(40)
         self.plotBtn.setEnabled(False)
         self.plotBtn.clicked.connect(self.plotClick)
+        self.manifest = None
+        self.fileKind = "totals" # kind of output file plotted (see RunManifest.file)
         
     def createGridLayout(self):
         """ Places UI components on a grid layout. """
@@ -50,46 +51,33 @@ class WidgetPlot(QWidget): # widget containing plotcanvas and toolbar in same pl
         """ Makes changes to the UI components after a simulation run has started. """
         self.plotBtn.setEnabled(False)
         
-    def runFinished(self, outputDir):
+    def runFinished(self, manifest):
         """
         Makes changes to the UI components after a simulation run has finished. 
         
         Parameters
         ----------
-        outputDir : Path for output file directory
+        manifest : RunManifest of the simulation directory
         """
         self.plotBtn.setEnabled(True)
-        self.findPlotFiles(outputDir)
-        self.updateBtns(outputDir)
-        
-    def findPlotFiles(self, outputDir):
-        """  
-        Finds relevant data files to plot in the output directory.
-        
-        Parameters
-        ----------
-        outputDir : Path for output file directory
-        """
-        self.dataFiles = []
+        self.manifest = manifest
+        self.updateBtns()
     
-    def updateBtns(self, outputDir):
-        """ 
-        Updates UI buttons in the interaction box for runs just made.
-        
-        Parameters
-        ----------
-        outputDir : Path for output file directory
-        """
+    def updateBtns(self):
+        """ Updates UI buttons in the interaction box for runs just made. """
         self.updateRuns()
     
     def updateRuns(self):
-        """ Updates the UI text for runs available from available data files. """
-        runs = []
-        for f in self.dataFiles:
-            m = re.search(r"run(\d+)", f)
-            runs.append("Run "+ m.group(1))
+        """ Updates the UI text for runs available from the run manifest (with the run index as item data). """
         self.runsCB.clear()
-        self.runsCB.addItems(runs)
+        for run in self.manifest.runs(self.fileKind):
+            self.runsCB.addItem("Run {}".format(run), run)
+        
+    def currentFile(self, kind):
+        """ Returns the filepath of the given kind of output file of the run selected, or None if there is none. """
+        if self.manifest == None or self.runsCB.currentData() == None:
+            return None
+        return self.manifest.file(self.runsCB.currentData(), kind)
 
 
 class WidgetPlotTotals(WidgetPlot):
@@ -102,10 +90,21 @@ class WidgetPlotTotals(WidgetPlot):
         canvas : PlotCanvas
         """
         super().__init__(canvas)
+        self.liveFiles = {} # Totals filepaths of each run of the running simulation, by run index
+        self.liveReader = None
+        self.liveTimer = QTimer(self)
+        self.liveTimer.setInterval(1000) # refresh rate of the live plot (ms)
+        self.liveTimer.timeout.connect(self.readLive)
+        self.runsCB.currentIndexChanged.connect(self.liveRunChanged)
         
     def totalsInitUI(self):
          """ Creates UI components specific to a totals plot."""
          
+    def connectLiveUI(self):
+        """ Updates the live plot when the line checkboxes change. """
+        for checkbox in self.findChildren(QCheckBox):
+            checkbox.stateChanged.connect(self.liveLinesChanged)
+         
     def createGridLayout(self):
         """ Places UI components on a grid layout. """
         
@@ -116,26 +115,84 @@ class WidgetPlotTotals(WidgetPlot):
     
     def plotClick(self):
         """ Plots (or re-plots) the curves on the canvas. """
-        
-        runNum = re.search(r"\d+", self.runsCB.currentText())[0]
-        rgx = r"Totals\d+run" + runNum
-        plotFile = [f for f in self.dataFiles if re.match(rgx, os.path.basename(f))][0]
-        self.canvas.plot(plotFile, self.checkboxState())
+        plotFile = self.currentFile("totals")
+        if plotFile != None:
+            self.canvas.plot(plotFile, self.checkboxState())
 
-    def findPlotFiles(self, outputDir):
-        """  
-        Finds relevant data files to plot in the output directory.
+    def runStarted(self):
+        """ Makes changes to the UI components after a simulation run has started. """
+        self.stopLive()
+        super().runStarted()
+        
+    def runFinished(self, manifest):
+        """
+        Makes changes to the UI components after a simulation run has finished. 
         
         Parameters
         ----------
-        outputDir : Path for output file directory
+        manifest : RunManifest of the simulation directory
         """
-        if os.path.exists(os.path.join(outputDir, "output_files")):
-            allFiles = [f for f in os.listdir(outputDir / "output_files") 
-                        if os.path.isfile(os.path.join(outputDir, "output_files", f))]
-            self.dataFiles = [os.path.join(outputDir, "output_files", f) for f in allFiles if re.match("Totals", os.path.basename(f))]
-
+        self.stopLive()
+        super().runFinished(manifest)
         
+    def startLive(self, files, runs):
+        """
+        Starts following the Totals files of a running simulation, plotting the selected run as its rows are written.
+
+        Parameters
+        ----------
+        files : list
+            Totals filepath (or list of alternative filepaths) of each run (see ProgressCounter).
+        runs : list:int
+            Run index of each entry of files.
+        """
+        self.liveFiles = dict(zip(runs, files))
+        self.runsCB.blockSignals(True)
+        self.runsCB.clear()
+        for run in runs:
+            self.runsCB.addItem("Run {}".format(run), run)
+        self.runsCB.blockSignals(False)
+        self.liveRunChanged()
+        self.liveTimer.start()
+        
+    def stopLive(self):
+        """ Stops following the Totals files, keeping the lines plotted so far. """
+        if self.liveTimer.isActive():
+            self.liveTimer.stop()
+            self.readLive()
+        self.liveFiles = {}
+        self.liveReader = None
+        self.canvas.stopLive()
+        
+    def liveRunChanged(self):
+        """ Restarts the live plot for the run selected. """
+        if len(self.liveFiles) == 0: # not following a running simulation
+            return
+        if self.runsCB.currentData() not in self.liveFiles:
+            return
+        self.liveReader = TailReader(self.liveFiles[self.runsCB.currentData()])
+        self.canvas.startLive(self.checkboxState())
+        self.readLive()
+        
+    def liveLinesChanged(self):
+        """ Redraws the live plot with the lines selected. """
+        if self.canvas.isLive():
+            self.canvas.setLiveLines(self.checkboxState())
+        
+    def readLive(self):
+        """ Adds the rows written since the last refresh to the live plot. """
+        if self.liveReader == None:
+            return
+        try:
+            rows, restarted = self.liveReader.read()
+        except ValueError as e: # not rows of numbers, stop following the run
+            self.liveTimer.stop()
+            self.liveReader = None
+            QMessageBox.warning(self, "Warning", "The live plot has stopped, as the Totals file could not be read: {}".format(e))
+            return
+        if restarted:
+            self.canvas.startLive(self.checkboxState())
+        self.canvas.appendRows(rows)
 
 
 class WidgetPlotTotalsGen(WidgetPlotTotals):
@@ -146,6 +203,7 @@ class WidgetPlotTotalsGen(WidgetPlotTotals):
         super().__init__(self.canvas)
         self.totalsInitUI()
         self.createGridLayout()
+        self.connectLiveUI()
     
     def totalsInitUI(self):
         """ Creates UI components specific to a totals - genotype plot."""
@@ -246,6 +304,7 @@ class WidgetPlotTotalsAllele(WidgetPlotTotals):
         super().__init__(self.canvas)
         self.totalsInitUI()
         self.createGridLayout()
+        self.connectLiveUI()
     
     def totalsInitUI(self):
         """ Creates UI components specific to a totals - allele frequency plot."""
@@ -304,6 +363,7 @@ class WidgetPlotCoords(WidgetPlot):
     def __init__(self):
         self.canvas = plotcanvas.CoordsPlotCanvas()
         super().__init__(self.canvas)
+        self.fileKind = "coords"
         self.createGridLayout()
         
     def createGridLayout(self):
@@ -326,23 +386,9 @@ class WidgetPlotCoords(WidgetPlot):
         
     def plotClick(self):
         """ Plots (or re-plots) the points on the canvas. """
-        runNum = re.search(r"\d+", self.runsCB.currentText())[0]
-        rgx = r"CoordinateList\d+run" + runNum
-        plotFile = [f for f in self.dataFiles if re.match(rgx, os.path.basename(f))][0]
-        self.canvas.plot(plotFile)
-
-    def findPlotFiles(self, outputDir):
-        """  
-        Finds relevant data files to plot in the output directory.
-        
-        Parameters
-        ----------
-        outputDir : Path for output file directory
-        """
-        if os.path.exists(os.path.join(outputDir, "output_files")):
-            allFiles = [f for f in os.listdir(outputDir / "output_files") 
-                        if os.path.isfile(os.path.join(outputDir, "output_files", f))]
-            self.dataFiles = [os.path.join(outputDir, "output_files", f) for f in allFiles if re.match("CoordinateList", os.path.basename(f))]
+        plotFile = self.currentFile("coords")
+        if plotFile != None:
+            self.canvas.plot(plotFile)
 
 class WidgetPlotLocal(WidgetPlot):
     """ Creates a widget for the plotspace and plot interaction components of the local males plot."""
@@ -356,14 +402,17 @@ class WidgetPlotLocal(WidgetPlot):
         self.parent = parent
         self.canvas = plotcanvas.LocalPlotCanvas()
         super().__init__(self.canvas)
+        self.fileKind = "coords"
         self.createGridLayout()
         self.recStart = 0
         self.recEnd = 1
         self.recIntervalLocal = 1
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.updateAnim)
-        self.shouldSaveAnim = False
-        self.snapshots = []
+        self.animSaver = None
+        self.cubeBuilder = None
+        self.cube = None # (days, classes) of the run selected once built (see outputdata.classCube)
+        self.runsCB.currentIndexChanged.connect(self.runChanged)
         
     def createGridLayout(self):
         """ Places UI components on a grid layout. """
@@ -408,6 +457,10 @@ class WidgetPlotLocal(WidgetPlot):
         self.saveBtn.setMinimumHeight(40)
         self.saveBtn.setEnabled(False)
         self.saveBtn.clicked.connect(self.saveAnimStart)
+        self.cubeBar = QProgressBar()
+        self.cubeBar.setFormat("Preparing frames %p%")
+        self.cubeBar.setToolTip("Drive allele frequencies of all the recorded days are computed before playing")
+        self.cubeBar.setVisible(False)
     
         interactLayout.addWidget(self.runsCB)
         interactLayout.addWidget(line1)
@@ -418,6 +471,7 @@ class WidgetPlotLocal(WidgetPlot):
         interactLayout.addWidget(intervalLabel)
         interactLayout.addWidget(self.intervalSB)
         interactLayout.addWidget(self.playBtn)
+        interactLayout.addWidget(self.cubeBar)
         interactLayout.addWidget(self.saveBtn)
         interactLayout.addStretch() # create a stretch of filler space between components
         interactLayout.setAlignment(self.sliderLabel, Qt.AlignmentFlag.AlignHCenter)
@@ -435,13 +489,14 @@ class WidgetPlotLocal(WidgetPlot):
          self.plotBtn.setEnabled(False)
          self.playBtn.setEnabled(False)
          self.saveBtn.setEnabled(False)
+         self.cancelCube() # the output files are about to be replaced
          
-    def runFinished(self, outputDir):
+    def runFinished(self, manifest):
         self.plotBtn.setEnabled(True)
         self.playBtn.setEnabled(True)
         self.saveBtn.setEnabled(True)
-        self.findPlotFiles(outputDir)
-        self.updateBtns(outputDir)
+        self.manifest = manifest
+        self.updateBtns()
         
     def updateSliderText(self, value):
         """ Updates the slider text value."""
@@ -450,117 +505,152 @@ class WidgetPlotLocal(WidgetPlot):
         
     def plotClick(self):
         """ Plots (or re-plots) the points on the canvas. """
+        self.timer.stop()
         coordsFile, localFile = self.findCurRunFiles()
         self.canvas.setMode('static')
-        self.canvas.plot(self.plotSlider.value(), coordsFile, localFile, self.recStart)
+        self.canvas.plot(self.plotSlider.value(), coordsFile, localFile, self.recStart, frameClasses=self.cubeFrame(self.plotSlider.value()))
     
     def findCurRunFiles(self):
         """ Find data files for the current run selected. """
-        runNum = re.search(r"\d+", self.runsCB.currentText())[0]
-        coordsRgx = r"CoordinateList\d+run" + runNum
-        coordsFile = [f for f in self.coordsDataFiles if re.match(coordsRgx, os.path.basename(f))][0]
-        localRgx = r"LocalData\d+run" + runNum
-        localFile = [f for f in self.localDataFiles if re.match(localRgx, os.path.basename(f))][0]
-        return coordsFile, localFile
-        
-    def findPlotFiles(self, outputDir):
-        """  
-        Finds relevant data files to plot in the output directory.
-        
-        Parameters
-        ----------
-        outputDir : Path for output file directory
-        """
-        if os.path.exists(os.path.join(outputDir, "output_files")):
-            allFiles = [f for f in os.listdir(outputDir / "output_files") 
-                        if os.path.isfile(os.path.join(outputDir, "output_files", f))]
-            self.coordsDataFiles = [os.path.join(outputDir, "output_files", f) for f in allFiles if re.match("CoordinateList", os.path.basename(f))]
-            self.localDataFiles = [os.path.join(outputDir, "output_files", f) for f in allFiles if re.match("LocalData", os.path.basename(f))]
+        return self.currentFile("coords"), self.currentFile("local")
     
-    def updateBtns(self, outputDir):
-        """ 
-        Updates UI buttons in the interaction box for runs just made.
-        
-        Parameters
-        ----------
-        outputDir : Path for output file directory
-        """
+    def updateBtns(self):
+        """ Updates UI buttons in the interaction box for runs just made. """
         self.updateRuns()
-        self.updateSlider(outputDir)
-
-    def updateRuns(self):
-        """ Updates the UI text for runs available from available data files. """
-        runs = []
-        for f in self.coordsDataFiles:
-            m = re.search(r"run(\d+)", f)
-            runs.append("Run "+ m.group(1))
-        self.runsCB.clear()
-        self.runsCB.addItems(runs)
+        self.updateSlider()
+        
+    def runChanged(self):
+        """ Starts computing the frames of the run selected in the background (see CubeBuilder). """
+        self.cancelCube()
+        coordsFile, localFile = self.findCurRunFiles()
+        if coordsFile == None or localFile == None:
+            return
+        self.cubeBuilder = CubeBuilder(coordsFile, localFile)
+        self.cubeBuilder.signals.progress.connect(self.cubeBar.setValue)
+        self.cubeBuilder.signals.finished.connect(self.cubeFinished)
+        self.cubeBuilder.signals.error.connect(self.cubeError)
+        self.cubeBar.setValue(0)
+        self.cubeBar.setVisible(True)
+        QThreadPool.globalInstance().start(self.cubeBuilder)
+        
+    def cancelCube(self):
+        """ Stops computing the frames and discards the frames of the previous run. """
+        if self.cubeBuilder != None:
+            self.cubeBuilder.cancel()
+            self.cubeBuilder = None
+        self.cube = None
+        self.cubeBar.setVisible(False)
+        
+    def cubeFinished(self, cube):
+        if self.cubeBuilder == None or self.sender() is not self.cubeBuilder.signals: # from a cancelled builder
+            return
+        self.cube = cube
+        self.cubeBuilder = None
+        self.cubeBar.setVisible(False)
+        
+    def cubeError(self, message):
+        # frames are read from the file as they are played instead
+        if self.cubeBuilder == None or self.sender() is not self.cubeBuilder.signals:
+            return
+        self.cubeBuilder = None
+        self.cubeBar.setVisible(False)
+        
+    def cubeFrame(self, t):
+        """ Returns the colour classes of the patches on timestep t, or None if the frames have not been computed. """
+        if self.cube == None or len(self.cube[1]) == 0:
+            return None
+        return self.cube[1][min(t, len(self.cube[1]) - 1)]
         
     def startAnim(self):
         """ Starts playing the animation. """
+        self.timer.stop()
         self.curCoordsFile, self.curLocalFile = self.findCurRunFiles()
-        self.numFrames = int((self.recEnd - self.recStart) / self.recIntervalLocal)
         self.frame = 0
         self.interval = self.intervalSB.value()
         self.canvas.setMode('animation')
-        self.snapshots = []
+        # the patches are plotted once, each frame only recolours them (runs stopped early have fewer recorded days)
+        self.numFrames = min(int((self.recEnd - self.recStart) / self.recIntervalLocal) + 1,
+                             self.canvas.startAnim(self.curCoordsFile, self.curLocalFile, self.recStart))
+        if self.numFrames == 0:
+            return
+        if self.cube == None:
+            # frames not computed yet, stream the recorded days in order rather than seeking to each one
+            self.frameIter = outputdata.iterFrames(self.curLocalFile, self.canvas.numRecPats)
         self.timer.start(self.interval)  # frame interval (ms)
         
     def updateAnim(self):
         """ Updates the animation snapshot displayed. """
-        if self.frame <= self.numFrames:
-            fig = self.canvas.plot(self.frame, self.curCoordsFile, self.curLocalFile, self.recStart)
-            if self.shouldSaveAnim:
-                aggCanvas = FigureCanvasAgg(fig)
-                aggCanvas.draw() # render
-                buf = aggCanvas.buffer_rgba()
-                w, h = aggCanvas.get_width_height()
-                arr = np.frombuffer(buf, dtype=np.uint8).reshape((h, w, 4))
-                img = Image.fromarray(arr)
-                self.snapshots.append(img.copy()) # need to copy image to freeze the current image
+        if self.frame < self.numFrames:
+            if self.cube != None:
+                self.canvas.animFrame(self.frame, frameClasses=self.cubeFrame(self.frame))
+            else:
+                self.canvas.animFrame(self.frame, next(self.frameIter, None))
             self.frame += 1
         else:
             self.timer.stop()
-            if self.shouldSaveAnim:
-                self.saveAnimProcess()
+            self.canvas.stopAnim()
             
     def saveAnimStart(self):
-        """ Saves the animation as a file on a separate thread. """
+        """ Saves the animation as a file on a separate thread (see AnimSaver). """
+        coordsFile, localFile = self.findCurRunFiles()
+        if coordsFile == None or localFile == None:
+            return
         fname, filt = QFileDialog.getSaveFileName(self, "Save animation", str(gdsimsgui.basedir), "*.gif")
         if fname and not fname.isspace(): # check dialog hasn't been cancelled (which would return a null string)  
-            self.animFilename = fname
+            numFrames = int((self.recEnd - self.recStart) / self.recIntervalLocal) + 1
+            classes = self.cube[1] if self.cube != None else None # frames already computed
+            self.animSaver = AnimSaver(fname, coordsFile, localFile, self.recStart, numFrames, self.intervalSB.value(),
+                                       tuple(self.canvas.fig.get_size_inches()), self.canvas.fig.dpi, classes)
+            self.saveError = None
+            self.saveThread = QThread()
+            self.animSaver.moveToThread(self.saveThread)
+            self.saveThread.started.connect(self.animSaver.run)
+            self.animSaver.finished.connect(self.saveThread.quit)
+            self.animSaver.finished.connect(self.animSaver.deleteLater)
+            self.saveThread.finished.connect(self.saveThread.deleteLater)
+            self.animSaver.error.connect(self.saveAnimError)
+            self.saveThread.finished.connect(self.saveAnimFinished) # once the thread has stopped, so another save can start
+            
+            self.saveDialog = QProgressDialog("Saving animation...", "Cancel", 0, numFrames, self)
+            self.saveDialog.setWindowTitle("Save animation")
+            self.saveDialog.setAutoClose(False)
+            self.saveDialog.canceled.connect(self.saveAnimCancel)
+            self.animSaver.progress.connect(self.saveDialog.setValue)
+            
             # Disable run button and start thread to save animation
             self.parent.saveAnimStarted()
-            self.shouldSaveAnim = True
             self.saveBtn.setEnabled(False)
-            self.startAnim()
+            self.saveThread.start()
+            
+    def saveAnimCancel(self):
+        # direct call, as the saver's thread is busy drawing frames
+        if self.animSaver != None:
+            self.animSaver.cancel()
             
-    def saveAnimProcess(self):  
-        self.shouldSaveAnim = False
-        self.snapshots[0].save(self.animFilename, save_all=True, append_images=self.snapshots[1:], optimize=False, duration=self.interval, loop=1)
-        self.snapshots = []
-        self.saveAnimFinished()
+    def saveAnimError(self, message):
+        self.saveError = message
         
     def saveAnimFinished(self):
         """ Makes necessary changes to UI after animation file has been saved. """
-        QMessageBox.information(self, "Info", "Animation saved.")
+        cancelled = self.animSaver.isCancelled()
+        self.animSaver = None
+        self.saveDialog.canceled.disconnect() # closing the dialog would cancel
+        self.saveDialog.close()
+        if cancelled:
+            QMessageBox.information(self, "Info", "Animation saving cancelled.")
+        elif self.saveError != None:
+            QMessageBox.warning(self, "Warning", "Animation not saved. " + self.saveError)
+        else:
+            QMessageBox.information(self, "Info", "Animation saved.")
         self.parent.saveAnimFinished()
         self.saveBtn.setEnabled(True)
         
-    def updateSlider(self, outputDir):
-        """ 
-         Updates the slider r+ange and scale factors for the most recent simulation run.  
-         
-         Parameters
-         ----------
-         outputDir : Path for output file directory
-        """
-        if os.path.exists(os.path.join(outputDir, "params.txt")):
-            params = np.loadtxt(os.path.join(outputDir, "params.txt"))
-            self.recStart = int(params[28])
-            self.recEnd = int(params[29])
-            self.recIntervalLocal = int(params[31])
+    def updateSlider(self):
+        """ Updates the slider range and scale factors for the most recent simulation run (from its manifest parameters). """
+        if self.manifest != None and self.manifest.params != None:
+            self.recStart = int(self.manifest.params["recStart"])
+            self.recEnd = int(self.manifest.params["recEnd"])
+            self.recIntervalLocal = int(self.manifest.params["recIntervalLocal"])
             self.plotSlider.setMinimum(0) 
             self.plotSlider.setMaximum(int((self.recEnd - self.recStart + 1) / self.recIntervalLocal)) # recEnd is inclusive
             self.plotSlider.setSingleStep(1)
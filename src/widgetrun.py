@@ -5,13 +5,20 @@ Created on Mon Jan  6 14:39:54 2025
 @author: biol0117
 """
 
-from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout, QLabel, QLineEdit, QPushButton, QProgressBar, QStyle, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout, QLabel, QLineEdit, QPushButton, QProgressBar, QSpinBox, QDoubleSpinBox, QCheckBox, QComboBox, QStyle, QFileDialog, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 from PyQt5.QtCore import Qt, QThread
 from pathlib import Path
 import os
-from datetime import datetime
 import sim
+import modelrunner
 from progressreader import ProgressReader
+from telemetryreader import TelemetryReader
+import telemetry
+import stopconditions
+import outcomes
+import throughput
+from simqueue import SimJob, SimQueue
+from resultcache import ResultCache
 import gdsimsgui
 
 class WidgetRun(QWidget):
@@ -26,6 +33,10 @@ class WidgetRun(QWidget):
         super().__init__()
         self.winWidget = winWidget 
         self.simulation = None
+        self.isParallel = False
+        self.resultCache = ResultCache(gdsimsgui.basedir / "result_cache")
+        self.simQueue = SimQueue(self.resultCache)
+        self.simQueue.jobChanged.connect(self.updateJob)
         self.setLayout(QGridLayout())
         self.initUI()
         
@@ -40,6 +51,79 @@ class WidgetRun(QWidget):
         simNameLabel = QLabel("Simulation name (optional)")
         simNameLabel.setToolTip("Subdirectory name for simulation run")
         self.simNameEdit = QLineEdit("")
+        workersLabel = QLabel("Parallel runs")
+        workersLabel.setToolTip("Number of replicates to run at the same time (one model process each)")
+        self.workersSB = QSpinBox()
+        self.workersSB.setMinimum(1)
+        self.workersSB.setMaximum(os.cpu_count() or 1)
+        self.workersSB.setValue(1)
+        
+        # model process scheduling
+        self.lowPriorityCheck = QCheckBox("Low priority")
+        self.lowPriorityCheck.setToolTip("Run the model processes at a lower priority so the interface and other programs stay responsive")
+        self.pinCoresCheck = QCheckBox("Pin runs to cores")
+        self.pinCoresCheck.setToolTip("Pin each parallel run to its own CPU core (Linux only)")
+        self.pinCoresCheck.setEnabled(hasattr(os, "sched_setaffinity"))
+        self.cacheCheck = QCheckBox("Reuse results")
+        self.cacheCheck.setToolTip("Load the output files of an identical earlier simulation from the result cache instead of running "
+                                   "the model, and store new simulations in it. Untick to run new replicates of the same parameters")
+        self.cacheCheck.setChecked(True)
+        timeLimitLabel = QLabel("Time limit (h)")
+        timeLimitLabel.setToolTip("Wall-clock time limit of each model process, after which it is stopped (0 for no limit)")
+        self.timeLimitSB = QDoubleSpinBox()
+        self.timeLimitSB.setMinimum(0)
+        self.timeLimitSB.setMaximum(1000)
+        self.timeLimitSB.setDecimals(1)
+        self.timeLimitSB.setValue(0)
+        self.compressCB = QComboBox()
+        self.compressCB.setToolTip("Compress the output files once the simulation has finished, to save disk space "
+                                   "(plots read compressed files directly)")
+        self.compressCB.addItem("No compression", None)
+        self.compressCB.addItem("Compress (fast)", "fast")
+        self.compressCB.addItem("Compress (small)", "small")
+        
+        # early stopping of replicates
+        stopLabel = QLabel("Stop runs early at")
+        stopLabel.setToolTip("End a run before the maximum simulated time once it reaches one of the selected states")
+        self.stopElimCheck = QCheckBox("Elimination")
+        self.stopElimCheck.setToolTip("Stop a run once the whole population has been eliminated")
+        self.stopFixCheck = QCheckBox("Drive fixation")
+        self.stopFixCheck.setToolTip("Stop a run once the drive allele frequency reaches 1")
+        stopFreqLabel = QLabel("Drive freq. ≥")
+        stopFreqLabel.setToolTip("Stop a run once the drive allele frequency has stayed at or above this value for the given number of days (0 for no threshold)")
+        self.stopFreqSB = QDoubleSpinBox()
+        self.stopFreqSB.setMinimum(0)
+        self.stopFreqSB.setMaximum(1)
+        self.stopFreqSB.setDecimals(3)
+        self.stopFreqSB.setSingleStep(0.01)
+        self.stopFreqSB.setValue(0)
+        stopDaysLabel = QLabel("for days")
+        self.stopDaysSB = QSpinBox()
+        self.stopDaysSB.setMinimum(1)
+        self.stopDaysSB.setMaximum(100000)
+        self.stopDaysSB.setValue(1)
+        
+        # sequential stopping of replicates
+        self.seqStopCheck = QCheckBox("Run until precise")
+        self.seqStopCheck.setToolTip("Run replicates in batches until the confidence interval of the outcome is narrower than the tolerance " 
+                                     "(the number of runs is the maximum)")
+        self.outcomeCB = QComboBox()
+        for outcome, name in outcomes.outcomeNames.items():
+            self.outcomeCB.addItem(name, outcome)
+        tolLabel = QLabel("95% CI width ≤")
+        tolLabel.setToolTip("Confidence interval width of the outcome to stop at")
+        self.tolSB = QDoubleSpinBox()
+        self.tolSB.setMinimum(0.001)
+        self.tolSB.setMaximum(1)
+        self.tolSB.setDecimals(3)
+        self.tolSB.setSingleStep(0.01)
+        self.tolSB.setValue(0.1)
+        batchLabel = QLabel("Batch")
+        batchLabel.setToolTip("Number of replicates to run between checks")
+        self.batchSB = QSpinBox()
+        self.batchSB.setMinimum(1)
+        self.batchSB.setMaximum(1000)
+        self.batchSB.setValue(10)
         
         self.progBar = QProgressBar()
         self.progBar.setMinimumHeight(40)
@@ -57,21 +141,77 @@ class WidgetRun(QWidget):
         self.abortBtn.clicked.connect(self.abortSim)
         self.abortBtn.setEnabled(False)
         self.abortBtn.hide()
+        self.telemLabel = QLabel("")
+        self.telemLabel.setToolTip("Resource usage of the model processes: CPU time, current and peak memory (RSS) and bytes written")
         self.msgBar = QLineEdit()
         self.msgBar.setText("Waiting for run.")
         self.msgBar.setReadOnly(True)
         self.msgBar.resize(self.msgBar.sizeHint())
         
+        # simulation queue
+        self.queueBtn = QPushButton("Queue")
+        self.queueBtn.setToolTip("Add a simulation with the current parameters to the queue")
+        self.queueBtn.clicked.connect(self.queueSim)
+        maxJobsLabel = QLabel("Jobs at once")
+        maxJobsLabel.setToolTip("Maximum number of queued simulations to run at the same time")
+        self.maxJobsSB = QSpinBox()
+        self.maxJobsSB.setMinimum(1)
+        self.maxJobsSB.setMaximum(os.cpu_count() or 1)
+        self.maxJobsSB.setValue(1)
+        self.maxJobsSB.valueChanged.connect(self.simQueue.setMaxJobs)
+        self.resumeBtn = QPushButton("Resume")
+        self.resumeBtn.setToolTip("Resume an interrupted simulation, running only its missing runs")
+        self.resumeBtn.clicked.connect(self.resumeSim)
+        self.abortJobBtn = QPushButton("Abort job")
+        self.abortJobBtn.setToolTip("Abort the selected queued simulation")
+        self.abortJobBtn.clicked.connect(self.abortJob)
+        self.jobTable = QTableWidget(0, 3)
+        self.jobTable.setHorizontalHeaderLabels(["Simulation", "Status", "Progress"])
+        self.jobTable.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.jobTable.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobTable.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.jobTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.jobTable.setToolTip("Double-click a finished simulation to load its plots")
+        self.jobTable.cellDoubleClicked.connect(self.loadJob)
+        
         self.layout().setHorizontalSpacing(5)
         self.layout().addWidget(outputDirLabel, 0, 0)
         self.layout().addWidget(simNameLabel, 0, 5)
+        self.layout().addWidget(workersLabel, 0, 7)
         self.layout().addWidget(self.outputDirNameEdit, 1, 0, 1, 4)
         self.layout().addWidget(outputDirDialogBtn, 1, 4)
-        self.layout().addWidget(self.simNameEdit, 1, 5, 1, 3)
-        self.layout().addWidget(self.progBar, 2, 0, 1, 6)
+        self.layout().addWidget(self.simNameEdit, 1, 5, 1, 2)
+        self.layout().addWidget(self.workersSB, 1, 7)
+        self.layout().addWidget(self.progBar, 2, 0, 1, 4)
+        self.layout().addWidget(self.telemLabel, 2, 4, 1, 2)
         self.layout().addWidget(self.runBtn, 2, 6, 1, 2)
         self.layout().addWidget(self.abortBtn, 2, 6, 1, 2)
         self.layout().addWidget(self.msgBar, 3, 0, 1, 8)
+        self.layout().addWidget(self.queueBtn, 4, 0, 1, 2)
+        self.layout().addWidget(maxJobsLabel, 4, 2)
+        self.layout().addWidget(self.maxJobsSB, 4, 3)
+        self.layout().addWidget(self.resumeBtn, 4, 4, 1, 2)
+        self.layout().addWidget(self.abortJobBtn, 4, 6, 1, 2)
+        self.layout().addWidget(self.lowPriorityCheck, 5, 0, 1, 2)
+        self.layout().addWidget(self.pinCoresCheck, 5, 2, 1, 2)
+        self.layout().addWidget(self.compressCB, 5, 4)
+        self.layout().addWidget(timeLimitLabel, 5, 5)
+        self.layout().addWidget(self.timeLimitSB, 5, 6)
+        self.layout().addWidget(self.cacheCheck, 5, 7)
+        self.layout().addWidget(stopLabel, 6, 0)
+        self.layout().addWidget(self.stopElimCheck, 6, 1, 1, 2)
+        self.layout().addWidget(self.stopFixCheck, 6, 3)
+        self.layout().addWidget(stopFreqLabel, 6, 4)
+        self.layout().addWidget(self.stopFreqSB, 6, 5)
+        self.layout().addWidget(stopDaysLabel, 6, 6)
+        self.layout().addWidget(self.stopDaysSB, 6, 7)
+        self.layout().addWidget(self.seqStopCheck, 7, 0)
+        self.layout().addWidget(self.outcomeCB, 7, 1, 1, 3)
+        self.layout().addWidget(tolLabel, 7, 4)
+        self.layout().addWidget(self.tolSB, 7, 5)
+        self.layout().addWidget(batchLabel, 7, 6)
+        self.layout().addWidget(self.batchSB, 7, 7)
+        self.layout().addWidget(self.jobTable, 8, 0, 1, 8)
         
         
     def openDirDialog(self, dirNameEdit):
@@ -94,80 +234,191 @@ class WidgetRun(QWidget):
                 self.winWidget.runStarted()
                 customSet = self.winWidget.createParamsFiles(self.outputPath)
                 
-                # Set up progress bar
-                self.progBar.setMinimum(0)
-                self.progBar.setMaximum(customSet.numRuns * (customSet.maxT+1))
-                self.progBar.reset()
-                
-                # Create simulation run thread
-                self.simThread = QThread()
-                self.simulation = sim.Simulation(self.outputPath,
-                                             self.simName,
-                                             customSet.dispType, 
-                                             customSet.boundaryType,
-                                             customSet.rainfallFile,
-                                             customSet.coordsFile,
-                                             customSet.relTimesFile
-                                             )
-                self.simulation.moveToThread(self.simThread)
+                # Identical simulation already run - reuse its output files
+                self.cacheKey = self.resultCache.key(customSet, gdsimsgui.appname) if self.cacheCheck.isChecked() else None
+                if self.cacheKey != None and self.resultCache.restore(self.cacheKey, self.outputPath):
+                    self.progBar.setMaximum(1)
+                    self.progBar.setValue(1)
+                    self.winWidget.runFinished(self.outputPath)
+                    QMessageBox.information(self, "Info", "An identical simulation was found in the result cache. Its output files have been loaded.")
+                    return
                 
-                # Create progress reader thread
-                self.progThread = QThread()
-                outputFiles = [] 
-                for i in range(1, customSet.numRuns + 1): # find filepaths to read for each run
-                    filePath = os.path.join(self.outputPath, "output_files", "Totals{}run{}.txt").format(customSet.setLabel, i)
-                    outputFiles.append(filePath)
-                self.progReader = ProgressReader(outputFiles, customSet.maxT, customSet.numRuns)
-                self.progReader.moveToThread(self.progThread)
+                self.startSim(customSet)
                 
-                # Connect signals and slots
-                self.simThread.started.connect(self.simulation.run)
-                self.simulation.finished.connect(self.simThread.quit)
-                self.simulation.finished.connect(self.simulation.deleteLater)
-                self.simThread.finished.connect(self.simThread.deleteLater)
-                self.simulation.error.connect(self.runError)
-                
-                self.progThread.started.connect(self.progReader.run)
-                self.progReader.finished.connect(self.progThread.quit)
-                self.progReader.finished.connect(self.progReader.deleteLater)
-                self.progThread.finished.connect(self.progThread.deleteLater)
-                self.progReader.progress.connect(lambda v: self.updateProg(v, customSet.maxT, customSet.numRuns))
-        
-                # Start threads
-                self.abortCode = 0
-                self.simThread.start()
-                self.progThread.start()
-                
-                # Disable and hide run button while subprocess is running and enable abort button in its place
-                self.runBtn.setEnabled(False)
-                self.runBtn.hide()
-                self.abortBtn.setEnabled(True)
-                self.abortBtn.show()
-                self.simThread.finished.connect(lambda: self.runFinished(self.abortCode))
-        
                 # Start the QTimer to read the output file periodically
                 # self.timer = QTimer(self)
                 # self.timer.timeout.connect(self.read_output_file)
                 # self.timer.start(1000)  # Check for new output every 1 second
         
+    def startSim(self, paramSet, runs=None):
+        """
+        Starts the simulation and progress reader threads for the current simulation directory.
+
+        Parameters
+        ----------
+        paramSet : InputParams
+            Parameter set of the simulation (params files already created in the simulation directory).
+        runs : list:int, optional
+            Run indices to run. The default is None (all runs).
+        """
+        numRuns = paramSet.numRuns if runs == None else len(runs)
+        
+        # Set up progress bar
+        self.progBar.setMinimum(0)
+        self.progBar.setMaximum(numRuns * (paramSet.maxT+1))
+        self.progBar.reset()
+        
+        # Create simulation run thread
+        self.simThread = QThread()
+        self.simulation = sim.createSimulation(self.outputPath, self.simName, paramSet, self.workersSB.value(), runs, 
+                                               stopConditions=self.stopConditions(), seqStopping=self.seqStopping(), 
+                                               **self.schedulingOptions())
+        self.simulation.compression = self.compressCB.currentData()
+        self.isParallel = isinstance(self.simulation, sim.ParallelSimulation)
+        self.simulation.moveToThread(self.simThread)
+        
+        # Create progress reader thread
+        self.progThread = QThread()
+        outputFiles = self.simulation.progressFiles()
+        self.progReader = ProgressReader(outputFiles, paramSet.maxT, numRuns, self.simulation.runner.runs, self.simulation.runner.stopsFile,
+                                         timingFile=self.outputPath / "timing_log.json", model=gdsimsgui.appname)
+        self.progReader.moveToThread(self.progThread)
+        
+        # Connect signals and slots
+        self.simThread.started.connect(self.simulation.run)
+        self.simulation.finished.connect(self.simThread.quit)
+        self.simulation.finished.connect(self.simulation.deleteLater)
+        self.simulation.error.connect(self.runError)
+        
+        self.progThread.started.connect(self.progReader.run)
+        self.progReader.finished.connect(self.progThread.quit)
+        self.progReader.finished.connect(self.progReader.deleteLater)
+        self.progThread.finished.connect(self.readerDone) # before the thread is deleted
+        self.progThread.finished.connect(self.progThread.deleteLater)
+        self.throughputText = ""
+        self.progReader.throughput.connect(self.updateThroughput)
+        self.progReader.progress.connect(lambda v: self.updateProg(v, paramSet.maxT, numRuns))
+        # runs ended early or not run never complete, so the reader is told to finish at its next timed check
+        self.simThread.finished.connect(lambda reader=self.progReader: reader.stop())
+        
+        # Create resource telemetry thread (Linux only)
+        self.telemReader = None
+        if telemetry.isSupported():
+            self.telemThread = QThread()
+            self.telemReader = TelemetryReader(self.simulation.runner, self.outputPath / "process_metrics.csv")
+            self.telemReader.moveToThread(self.telemThread)
+            self.telemThread.started.connect(self.telemReader.run)
+            self.telemReader.finished.connect(self.telemThread.quit)
+            self.telemReader.finished.connect(self.telemReader.deleteLater)
+            self.telemThread.finished.connect(self.telemThread.deleteLater)
+            self.telemReader.sample.connect(self.updateTelemetry)
+            self.simThread.finished.connect(lambda reader=self.telemReader: reader.stop())
+
+        # Start threads
+        self.abortCode = 0
+        self.simThread.start()
+        self.progThread.start()
+        if self.telemReader != None:
+            self.telemThread.start()
+        self.winWidget.liveStarted(outputFiles, self.simulation.runner.runs)
+        
+        # Disable and hide run button while subprocess is running and enable abort button in its place
+        self.workersSB.setEnabled(False)
+        self.resumeBtn.setEnabled(False)
+        self.runBtn.setEnabled(False)
+        self.runBtn.hide()
+        self.abortBtn.setEnabled(True)
+        self.abortBtn.show()
+        self.simThread.finished.connect(lambda: self.runFinished(self.abortCode))
+        self.simThread.finished.connect(self.simThread.deleteLater) # after runFinished has released the simulation
+        
+    def schedulingOptions(self):
+        """
+        Returns
+        -------
+        dict
+            Scheduling settings (niceness, cpuAffinity, timeout) of the model processes, as selected in the UI.
+        """
+        niceness = 10 if self.lowPriorityCheck.isChecked() else None
+        cpuAffinity = None
+        if self.pinCoresCheck.isChecked() and hasattr(os, "sched_getaffinity"):
+            cpuAffinity = sorted(os.sched_getaffinity(0))
+        timeout = self.timeLimitSB.value() * 3600 if self.timeLimitSB.value() > 0 else None
+        return {"niceness": niceness, "cpuAffinity": cpuAffinity, "timeout": timeout}
+        
+    def stopConditions(self):
+        """
+        Returns
+        -------
+        StopConditions
+            Conditions for ending runs early, as selected in the UI.
+        """
+        freqThreshold = self.stopFreqSB.value() if self.stopFreqSB.value() > 0 else None
+        return stopconditions.StopConditions(self.stopElimCheck.isChecked(), self.stopFixCheck.isChecked(), 
+                                             freqThreshold, self.stopDaysSB.value())
+        
+    def seqStopping(self):
+        """
+        Returns
+        -------
+        SequentialStopping
+            Settings to run replicates until the outcome is precise enough, as selected in the UI. None if not selected.
+        """
+        if not self.seqStopCheck.isChecked():
+            return None
+        return outcomes.SequentialStopping(self.outcomeCB.currentData(), self.tolSB.value(), self.batchSB.value())
+        
+    def resumeSim(self):
+        """ Resumes an interrupted simulation from its checkpoint, running only its missing replicates in the same directory. """
+        dname = QFileDialog.getExistingDirectory(self, "Select a simulation directory to resume", self.outputDirNameEdit.text() or ".")
+        if not dname:
+            return
+        outputPath = Path(dname)
+        try:
+            checkpoint = modelrunner.Checkpoint.load(outputPath)
+        except (OSError, ValueError, KeyError):
+            QMessageBox.warning(self, "Warning", "The checkpoint or params.txt file of this simulation could not be read.")
+            return
+        if checkpoint == None:
+            QMessageBox.warning(self, "Warning", "No checkpoint file was found in the selected directory. Select a simulation directory.")
+            return
+        
+        self.outputPath = outputPath
+        self.simName = outputPath.name
+        missingRuns = checkpoint.missingRuns()
+        if len(missingRuns) == 0:
+            self.winWidget.runFinished(self.outputPath)
+            QMessageBox.information(self, "Info", "All runs of this simulation are already complete. Its output files have been loaded.")
+            return
+        self.winWidget.runStarted()
+        self.cacheKey = self.resultCache.key(checkpoint.paramSet, gdsimsgui.appname) if self.cacheCheck.isChecked() else None
+        self.startSim(checkpoint.paramSet, missingRuns)
+        self.msgBar.setText("Resuming simulation {} ({} of {} runs left)".format(self.simName, len(missingRuns), checkpoint.paramSet.numRuns))
+        
+    def readerDone(self):
+        """ Releases the progress reader once its thread has finished (they are then deleted). """
+        self.progReader = None
+        self.progThread = None
+
     def abortSim(self):
        """ Aborts the simulation run. """
        if self.simulation:
            self.msgBar.setText("Aborting simulation... Please wait.")
            QApplication.processEvents()
-           self.progThread.quit()
-           self.progThread.wait()
-           self.abortCode = 1
-           self.simulation.abort()
-           self.simThread.quit()
-           self.simThread.wait()
+           if self.progThread != None: # None once the reader has finished (e.g. while the output files are compacted)
+               self.progReader.finish()
+               self.progThread.quit()
+               self.progThread.wait()
+           if self.simulation != None: # not finished while the message was shown
+               self.abortCode = 1
+               self.simulation.abort()
+               self.simThread.quit()
+               self.simThread.wait()
         
     def createOutputDir(self, dirPath, simName):
         """
-        Creates a new directory for the simulation files in the selected directory path.
-        If a simulation name is specified (not blank), the directory will have this name.
-        Otherwise, a date-time stamp will be given.
-        If the parent directory path is not given (blank), the parent directory will be taken as the base directory of the GUI file.
+        Creates a new directory for the simulation files in the selected directory path and sets it as the current simulation directory.
+        See makeOutputDir for the directory naming rules.
 
         Parameters
         ----------
@@ -182,39 +433,24 @@ class WidgetRun(QWidget):
             Whether the parent directory filepath is a valid directory.
 
         """
+        outputPath, simName, errMsgs = self.makeOutputDir(dirPath, simName)
         isValidDir = True
-        outputPath = Path()
-        errMsgs = []
-        if Path(dirPath).is_dir() or dirPath == "":
-            if dirPath == "":
-                dirPath = gdsimsgui.basedir
-            
-            if simName != "":
-                outputPath = Path(dirPath) / Path(simName)
-            else:
-                dt = datetime.now()
-                simName = str(dt.year) + "_" + str(dt.month) + "_" + "{:02d}".format(dt.day)
-                simName +=  "_" + "{:02d}".format(dt.hour) + "{:02d}".format(dt.minute) + "{:02d}".format(dt.second)
-                outputPath = Path(dirPath) / simName
-            
-            # check if the directory has already been used for simulations
-            if not Path(outputPath / "params.txt").exists():
-                self.outputPath = outputPath
-                self.simName = simName
-                if not self.outputPath.exists():
-                    os.makedirs(self.outputPath)
-            else:
-                errMsgs.append("The selected simulation directory has already been used to run a simulation. Please select a different one.")
-         
-        else:
-            errMsgs.append("The output directory path does not exist.")
-            
         if len(errMsgs) != 0:  
             isValidDir = False
             errMsgs = "\n".join(errMsgs)
             QMessageBox.warning(self, "Warning", errMsgs)
+        else:
+            self.outputPath = outputPath
+            self.simName = simName
         
         return isValidDir
+    
+    def makeOutputDir(self, dirPath, simName):
+        """
+        Creates a new directory for the simulation files in the selected directory path, defaulting to the GUI base directory.
+        See modelrunner.makeOutputDir.
+        """
+        return modelrunner.makeOutputDir(dirPath, simName, gdsimsgui.basedir)
         
     def runFinished(self, abortCode):
         """
@@ -236,15 +472,34 @@ class WidgetRun(QWidget):
         self.abortBtn.hide()
         self.runBtn.show()
         self.runBtn.setEnabled(True)
+        self.resumeBtn.setEnabled(True)
+        self.workersSB.setEnabled(True)
+        self.winWidget.liveFinished()
         if abortCode == 0:
+            self.progBar.setValue(self.progBar.maximum())
             self.msgBar.setText("Waiting for run.")
+            if self.cacheKey != None:
+                self.resultCache.store(self.cacheKey, self.outputPath)
             self.winWidget.runFinished(self.outputPath)
-            QMessageBox.information(self, "Info", "Simulation completed successfully!")
+            msg = "Simulation completed successfully!"
+            stops = stopconditions.readStops(self.outputPath / modelrunner.stopsFileName)
+            if len(stops) != 0:
+                msg += "\n{} run(s) stopped early (see {}).".format(len(stops), modelrunner.stopsFileName)
+            for run, earlierRun in self.simulation.runner.duplicateRuns():
+                msg += "\nWarning: run {} has the same output as run {} (the model program may have given them the same random seed).".format(run, earlierRun)
+            summary = outcomes.summaryText(self.outputPath)
+            if summary != None:
+                msg += "\n" + summary
+            if self.simulation.compactedSizes != None:
+                before, after = self.simulation.compactedSizes
+                msg += "\nOutput files compressed from {:.1f} MB to {:.1f} MB.".format(before / 1024**2, after / 1024**2)
+            QMessageBox.information(self, "Info", msg)
         else:
             self.progBar.reset()
             self.msgBar.setText("Waiting for run.")
             # no run finished for plots because don't want to access incomplete files
             QMessageBox.information(self, "Info", "Simulation aborted.")
+        self.msgBar.setToolTip("")
         self.simulation = None
         
     def runError(self, errorMsg):
@@ -275,23 +530,92 @@ class WidgetRun(QWidget):
             Whether the simulation is still running.
 
         """
-        if self.simulation != None:
+        if self.simulation != None or self.simQueue.isRunning():
             return True
         else:
             return False
         
     def updateProg(self, progValue, maxT, numRuns):
         self.progBar.setValue(progValue)
+        speed = " - " + self.throughputText if self.throughputText else ""
+        if self.isParallel: # runs progress concurrently so there is no single current run
+            percent = int(100 * progValue / (numRuns * (maxT + 1)))
+            self.msgBar.setText("Running simulation {} ({} runs, {} at a time) {}%{}".format(self.simName, numRuns, self.workersSB.value(), percent, speed))
+            return
         curRun = int(progValue / (maxT + 1)) + 1
         if curRun <= numRuns:
             if progValue % (maxT + 1) == 0:
                 self.msgBar.setText("Initialising simulation {} run {}/{}. Please wait.".format(self.simName, curRun, numRuns))
             else:
                 curDay = progValue - ((curRun-1) * (maxT+1))
-                self.msgBar.setText("Running simulation {} run {}/{} day {}/{}".format(self.simName, curRun, numRuns, curDay, maxT))
+                self.msgBar.setText("Running simulation {} run {}/{} day {}/{}{}".format(self.simName, curRun, numRuns, curDay, maxT, speed))
+                
+    def updateThroughput(self, info):
+        """ Updates the simulation speed and time left shown with the progress, and the per-run speeds in the message bar tooltip. """
+        self.throughputText = throughput.formatThroughput(info)
+        runs = self.simulation.runner.runs if self.simulation != None else []
+        runRates = ["Run {}: {:.0f} days/s".format(runs[i], rate) for i, rate in info["runRates"].items() if rate != None and i < len(runs)]
+        self.msgBar.setToolTip("\n".join(runRates))
+            
+    def updateTelemetry(self, totals):
+        self.telemLabel.setText(telemetry.formatStats(totals))
+        
+    def queueSim(self):
+        """ Adds a simulation with the current parameters to the queue, in its own output directory. """
+        areValidParams, errMsgs = self.winWidget.validParams()
+        if not areValidParams:
+            errMsgs = "\n".join(errMsgs)
+            QMessageBox.warning(self, "Invalid parameter(s)", errMsgs)
+            return
+        outputPath, simName, errMsgs = self.makeOutputDir(self.outputDirNameEdit.text(), self.simNameEdit.text())
+        if len(errMsgs) != 0:
+            QMessageBox.warning(self, "Warning", "\n".join(errMsgs))
+            return
+        paramSet = self.winWidget.createParamsFiles(outputPath) # snapshot of the current parameters
+        self.simQueue.addJob(SimJob(paramSet, outputPath, simName, self.workersSB.value(), self.schedulingOptions(), self.stopConditions(), 
+                                    self.seqStopping(), self.compressCB.currentData(), self.cacheCheck.isChecked()))
+        
+    def abortJob(self):
+        """ Aborts the queued simulation selected in the job table. """
+        row = self.jobTable.currentRow()
+        if row >= 0 and not self.simQueue.jobs[row].isDone():
+            self.simQueue.abortJob(row)
+            
+    def abortAllJobs(self):
+        """ Aborts all queued simulations. """
+        self.simQueue.abortAll()
+            
+    def updateJob(self, index):
+        """
+        Updates the job table row of a queued simulation.
+
+        Parameters
+        ----------
+        index : int
+            Index of the job in the queue.
+        """
+        job = self.simQueue.jobs[index]
+        if index >= self.jobTable.rowCount():
+            self.jobTable.setRowCount(index + 1)
+            self.jobTable.setItem(index, 0, QTableWidgetItem(job.simName))
+            self.jobTable.item(index, 0).setToolTip(str(job.outputPath))
+        self.jobTable.setItem(index, 1, QTableWidgetItem(job.status))
+        percent = int(100 * job.progress / job.maxProgress) if job.maxProgress > 0 else 0
+        self.jobTable.setItem(index, 2, QTableWidgetItem("{}%".format(percent)))
+        if job.status == "Error":
+            self.jobTable.item(index, 1).setToolTip(job.errorMsg)
+            
+    def loadJob(self, row, col):
+        """ Loads the plots of a finished queued simulation. """
+        job = self.simQueue.jobs[row]
+        if job.status == "Finished" and self.simulation == None:
+            self.winWidget.runFinished(job.outputPath)
+            self.msgBar.setText("Loaded simulation {}.".format(job.simName))
             
     def disableRunBtn(self):
         self.runBtn.setEnabled(False)
+        self.resumeBtn.setEnabled(False)
         
     def enableRunBtn(self):
-        self.runBtn.setEnabled(True)
\ No newline at end of file
+        self.runBtn.setEnabled(True)
+        self.resumeBtn.setEnabled(True)
\ No newline at end of file
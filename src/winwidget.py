@@ -9,6 +9,7 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QGridLayout, QTabWi
 import widgetparams
 import widgetrun
 import widgetplot
+import runmanifest
 
 class WindowWidget(QWidget):
     """ Contains all section components of the main window. Manages interactions between them. """
@@ -124,8 +125,19 @@ class WindowWidget(QWidget):
     
     def runFinished(self, outputDir):
         """ Makes changes to all plotspace components after a simulation run has finished. """
+        manifest = runmanifest.RunManifest.load(outputDir) # one scan of the output files, shared by all the plots
         for plot in self.plotSpaces:
-            plot.runFinished(outputDir)
+            plot.runFinished(manifest)
+    
+    def liveStarted(self, files, runs):
+        """ Starts the live totals plots of the running simulation (see WidgetPlotTotals.startLive). """
+        for plot in [self.totalsGenPlotSpace, self.totalsAllelePlotSpace]:
+            plot.startLive(files, runs)
+            
+    def liveFinished(self):
+        """ Stops the live totals plots when the simulation has finished or been aborted. """
+        for plot in [self.totalsGenPlotSpace, self.totalsAllelePlotSpace]:
+            plot.stopLive()
         
     def isSimRunning(self):
         """